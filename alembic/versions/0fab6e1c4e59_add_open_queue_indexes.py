@@ -0,0 +1,46 @@
+"""Add open queue indexes
+
+Revision ID: 0fab6e1c4e59
+Revises: ec155d88ca7d
+Create Date: 2026-10-18 10:12:31.482913
+
+"""
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision = '0fab6e1c4e59'
+down_revision = 'ec155d88ca7d'
+branch_labels = None
+depends_on = None
+
+
+def upgrade():
+    # The first migration created the projects table before the model
+    # got its explicit __tablename__, so bring the name in line first.
+    op.rename_table('charityproject', 'charity_project')
+    op.create_index(
+        'ix_charity_project_open_queue',
+        'charity_project',
+        ['fully_invested', 'create_date', 'id'],
+        unique=False,
+        sqlite_where=sa.text('fully_invested = 0'),
+        postgresql_where=sa.text('NOT fully_invested'),
+    )
+    op.create_index(
+        'ix_donation_open_queue',
+        'donation',
+        ['fully_invested', 'create_date', 'id'],
+        unique=False,
+        sqlite_where=sa.text('fully_invested = 0'),
+        postgresql_where=sa.text('NOT fully_invested'),
+    )
+
+
+def downgrade():
+    op.drop_index('ix_donation_open_queue', table_name='donation')
+    op.drop_index(
+        'ix_charity_project_open_queue', table_name='charity_project'
+    )
+    op.rename_table('charity_project', 'charityproject')
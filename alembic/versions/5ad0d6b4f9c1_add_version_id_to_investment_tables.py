@@ -0,0 +1,38 @@
+"""Add version_id to investment tables
+
+Revision ID: 5ad0d6b4f9c1
+Revises: 0fab6e1c4e59
+Create Date: 2026-10-18 13:40:08.215374
+
+"""
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision = '5ad0d6b4f9c1'
+down_revision = '0fab6e1c4e59'
+branch_labels = None
+depends_on = None
+
+
+def upgrade():
+    op.add_column(
+        'charity_project',
+        sa.Column(
+            'version_id', sa.Integer(), server_default='0', nullable=False
+        )
+    )
+    op.add_column(
+        'donation',
+        sa.Column(
+            'version_id', sa.Integer(), server_default='0', nullable=False
+        )
+    )
+
+
+def downgrade():
+    with op.batch_alter_table('donation') as batch_op:
+        batch_op.drop_column('version_id')
+    with op.batch_alter_table('charity_project') as batch_op:
+        batch_op.drop_column('version_id')
@@ -0,0 +1,101 @@
+import json
+from http import HTTPStatus
+from typing import Any, Type
+
+from fastapi import HTTPException, Request
+from pydantic import BaseModel, ValidationError
+
+from app.core.config import settings
+from app.schemas.bulk import BulkItemError
+
+NDJSON_MEDIA_TYPE = 'application/x-ndjson'
+INVALID_BULK_BODY_ERROR = (
+    'Тело запроса должно быть JSON-массивом или NDJSON!'
+)
+TOO_MANY_BULK_ITEMS_ERROR = 'В запросе не может быть больше {} объектов!'
+INVALID_JSON_ITEM_ERROR = 'Некорректный JSON!'
+BULK_REQUEST_BODY = {
+    'requestBody': {
+        'required': True,
+        'content': {
+            'application/json': {
+                'schema': {'type': 'array', 'items': {'type': 'object'}}
+            },
+            NDJSON_MEDIA_TYPE: {'schema': {'type': 'string'}},
+        },
+    },
+}
+
+
+def get_item_error(
+    index: int,
+    message: str,
+    field: str = '__root__',
+    error_type: str = 'value_error'
+) -> BulkItemError:
+    """Ошибка объекта index в формате ошибок проверки pydantic."""
+    return BulkItemError(index=index, errors=[
+        {'loc': [field], 'msg': message, 'type': error_type}
+    ])
+
+
+def load_bulk_items(body: bytes, media_type: str) -> list[Any]:
+    """
+    Разбирает тело запроса на объекты: JSON-массив или NDJSON,
+    по объекту JSON на каждой непустой строке. Строка NDJSON,
+    которая не разбирается как JSON, заменяется исключением
+    JSONDecodeError и становится ошибкой этого объекта.
+    """
+    if media_type == NDJSON_MEDIA_TYPE:
+        items = []
+        for line in body.splitlines():
+            if not line.strip():
+                continue
+            try:
+                items.append(json.loads(line))
+            except json.JSONDecodeError as error:
+                items.append(error)
+        return items
+    try:
+        items = json.loads(body)
+    except json.JSONDecodeError:
+        items = None
+    if not isinstance(items, list):
+        raise HTTPException(
+            status_code=HTTPStatus.UNPROCESSABLE_ENTITY,
+            detail=INVALID_BULK_BODY_ERROR
+        )
+    return items
+
+
+async def parse_bulk_items(
+    request: Request,
+    schema: Type[BaseModel],
+    max_items: int = settings.bulk_max_items
+) -> tuple[dict[int, BaseModel], list[BulkItemError]]:
+    """
+    Читает объекты массовой загрузки и проверяет каждый схемой
+    schema. Возвращает прошедшие проверку объекты по их номерам
+    в запросе и ошибки остальных, не прерывая загрузку.
+    Если объектов больше max_items, то выбрасывает исключение.
+    """
+    media_type = request.headers.get('content-type', '').split(';')[0]
+    items = load_bulk_items(await request.body(), media_type.strip())
+    if len(items) > max_items:
+        raise HTTPException(
+            status_code=HTTPStatus.REQUEST_ENTITY_TOO_LARGE,
+            detail=TOO_MANY_BULK_ITEMS_ERROR.format(max_items)
+        )
+    objs_in, errors = {}, []
+    for index, item in enumerate(items):
+        if isinstance(item, json.JSONDecodeError):
+            errors.append(get_item_error(
+                index, INVALID_JSON_ITEM_ERROR,
+                error_type='value_error.jsondecode'
+            ))
+            continue
+        try:
+            objs_in[index] = schema.parse_obj(item)
+        except ValidationError as error:
+            errors.append(BulkItemError(index=index, errors=error.errors()))
+    return objs_in, errors
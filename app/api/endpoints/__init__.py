@@ -1,3 +1,5 @@
 from .user import router as user_router # noqa
 from .charity_project import router as charity_project_router # noqa
-from .donations import router as donations_router # noqa
\ No newline at end of file
+from .donations import router as donations_router # noqa
+from .investing import router as investing_router # noqa
+from .metrics import router as metrics_router # noqa
@@ -1,24 +1,46 @@
-from fastapi import APIRouter, Depends
+from http import HTTPStatus
+from typing import Awaitable, Callable, TypeVar
+
+from fastapi import APIRouter, Depends, HTTPException, Query, Request
 
 from sqlalchemy.ext.asyncio import AsyncSession
+from sqlalchemy.orm.exc import StaleDataError
 
-from app.core.db import get_async_session
+from app.api.bulk import BULK_REQUEST_BODY, parse_bulk_items
+from app.api.etag import cached_page_response
+from app.api.pagination import Pagination, get_page
+from app.core.db import get_async_session, get_read_session
+from app.crud.allocation import allocation_crud
 from app.crud.charity_project import charity_project_crud
 from app.api.validators import (
     check_charity_project_name_duplicate,
     check_charity_project_exist,
-    check_is_closed_or_invested_project,
-    check_new_full_amount_cant_be_less_than_invested_amount
+    split_charity_projects_for_import,
+    validate_charity_project_delete,
+    validate_charity_project_update
 )
+from app.schemas.allocation import AllocationDB
 from app.schemas.charity_project import (
-    CharityProjectCreate, CharityProjectUpdate, CharityProjectDB
+    CharityProjectBulkResult, CharityProjectCreate, CharityProjectUpdate,
+    CharityProjectDB
 )
 from app.core.user import current_superuser
+from app.models.charity_project import CharityProject
+from app.services.charity_project_cache import (
+    CHARITY_PROJECT_FIELDS, CachedPage, charity_project_cache
+)
+from app.services.export import ExportFormat, export_response
+from app.services.investing_worker import launch_investing
 from app.services.money_transaction import transaction_mechanism
 
 
 CHARITY_PROJECT_PREFIX_URL = '/charity_project'
 CHARITY_PROJECT_ROUTER_TAGS = ['Charity Projects']
+CHARITY_PROJECT_CHANGE_ATTEMPTS = 3
+ChangeResult = TypeVar('ChangeResult')
+CHARITY_PROJECT_CHANGED_ERROR = (
+    'Проект был изменен параллельным запросом, повторите попытку!'
+)
 
 
 router = APIRouter(
@@ -27,6 +49,29 @@ router = APIRouter(
 )
 
 
+async def retry_on_stale_project(
+    change: Callable[[], Awaitable[ChangeResult]],
+    session: AsyncSession,
+    attempts: int = CHARITY_PROJECT_CHANGE_ATTEMPTS
+) -> ChangeResult:
+    """
+    Выполняет изменение проекта change и повторяет его, если проход
+    инвестирования изменил проект между чтением и записью (проверка
+    версии строки выбросила StaleDataError). Перед повтором транзакция
+    откатывается, поэтому проект перечитывается и заново проходит
+    проверки. Если попытки закончились, то выбрасывает исключение.
+    """
+    for _ in range(attempts):
+        try:
+            return await change()
+        except StaleDataError:
+            await session.rollback()
+    raise HTTPException(
+        status_code=HTTPStatus.CONFLICT,
+        detail=CHARITY_PROJECT_CHANGED_ERROR
+    )
+
+
 @router.post(
     '/',
     response_model=CharityProjectDB,
@@ -46,24 +91,116 @@ async def create_charity_project(
     new_charity_project = await charity_project_crud.create(
         charity_project, session
     )
-    await transaction_mechanism.launch_investing_proccess(session)
-    await session.refresh(new_charity_project)
+    await charity_project_cache.invalidate()
+    await launch_investing(session, new_charity_project)
     return new_charity_project
 
 
+@router.post(
+    '/bulk',
+    response_model=CharityProjectBulkResult,
+    dependencies=[Depends(current_superuser)],
+    openapi_extra=BULK_REQUEST_BODY
+)
+async def create_charity_projects_bulk(
+    request: Request,
+    session: AsyncSession = Depends(get_async_session)
+):
+    """
+    Эндпоинт для массового создания благотворительных проектов
+    из JSON-массива или NDJSON (Content-Type: application/x-ndjson).
+    Уникальность имен проверяется одним запросом, все проекты
+    вставляются одним запросом, а открытые пожертвования
+    распределяются по ним одним проходом инвестирования.
+    Ошибки отклоненных проектов возвращаются с их номерами в запросе.
+    Доступен только для суперпользователей!
+    """
+    charity_projects_in, errors = await parse_bulk_items(
+        request, CharityProjectCreate
+    )
+    charity_projects, name_errors = await split_charity_projects_for_import(
+        charity_projects_in, session
+    )
+    errors = sorted(errors + name_errors, key=lambda error: error.index)
+    if not charity_projects:
+        return {'created': [], 'errors': errors}
+    await charity_project_crud.create_multi(charity_projects, session)
+    await charity_project_cache.invalidate()
+    await launch_investing(session)
+    return {
+        'created': await charity_project_crud.get_multi_by_names(
+            [project.name for project in charity_projects], session
+        ),
+        'errors': errors,
+    }
+
+
 @router.get(
     '/',
     response_model=list[CharityProjectDB]
 )
 async def get_all_charity_projects(
-    session: AsyncSession = Depends(get_async_session)
+    request: Request,
+    pagination: Pagination = Depends(),
+    session: AsyncSession = Depends(get_read_session)
 ):
     """
-    Эндпоинт для получения всех благотворительных проектов.
+    Эндпоинт для получения благотворительных проектов постранично,
+    от старых к новым. Курсор следующей страницы передается
+    в заголовке X-Next-Cursor.
+    Страницы кэшируются до ближайшего изменения проектов, а по
+    заголовку If-None-Match неизменившаяся страница отдается
+    ответом 304 без обращения к базе данных.
     Доступен любому пользователю.
     """
-    charity_projects = await charity_project_crud.get_multi(session)
-    return charity_projects
+    cache_key, page = await charity_project_cache.get_list_page(
+        pagination.limit, pagination.cursor
+    )
+    if page is None:
+        page = CachedPage.render(*await get_page(
+            charity_project_crud, CHARITY_PROJECT_FIELDS, pagination, session
+        ))
+        await charity_project_cache.set_list_page(cache_key, page)
+    return cached_page_response(request, page)
+
+
+@router.get(
+    '/export',
+    dependencies=[Depends(current_superuser)]
+)
+async def export_charity_projects(
+    export_format: ExportFormat = Query(
+        ExportFormat.ndjson, alias='format'
+    ),
+    session: AsyncSession = Depends(get_async_session)
+):
+    """
+    Эндпоинт для потоковой выгрузки всех благотворительных проектов
+    в формате NDJSON или CSV.
+    Доступен только для суперпользователей!
+    """
+    return export_response(
+        session, CharityProject, CharityProjectDB, export_format
+    )
+
+
+@router.get(
+    '/{project_id}/allocations',
+    response_model=list[AllocationDB],
+    dependencies=[Depends(current_superuser)]
+)
+async def get_charity_project_allocations(
+    project_id: int,
+    session: AsyncSession = Depends(get_async_session)
+):
+    """
+    Эндпоинт для получения журнала распределения проекта:
+    из каких пожертвований и сколько денег в него вложено.
+    Доступен только для суперпользователей!
+    """
+    await check_charity_project_exist(project_id, session)
+    allocations = await allocation_crud.get_by_project(project_id, session)
+    return allocations
 
 
 @router.delete(
@@ -78,19 +215,20 @@ async def delete_charity_project(
     """
     Эндпоинт для удаления благотворительного проекта.
     Проект в который уже инвестировали деньги не может быть удален.
+    Проект загружается один раз, поэтому удаление занимает
+    два запроса к базе данных: SELECT и DELETE. Если проход
+    инвестирования успел изменить проект, удаление повторяется.
     Доступен долько для суперпользователей!
     """
-    await check_charity_project_exist(project_id, session)
-    await check_is_closed_or_invested_project(
-        project_id,
-        is_closed=True,
-        is_invested=True,
-        session=session
-    )
-    charity_project = await charity_project_crud.get(project_id, session)
-    charity_project = await charity_project_crud.remove(
-        charity_project, session
-    )
+
+    async def delete() -> CharityProject:
+        charity_project = await validate_charity_project_delete(
+            project_id, session
+        )
+        return await charity_project_crud.remove(charity_project, session)
+
+    charity_project = await retry_on_stale_project(delete, session)
+    await charity_project_cache.invalidate()
     return charity_project
 
 
@@ -107,27 +245,27 @@ async def partial_update_charity_project(
     """
     Эндпоинт для изменения благотворительного проекта.
     Закрытый проект не может быть изменен.
+    Проект загружается один раз и проходит все проверки, затем
+    изменения фиксируются одним commit. Ответ собирается до commit,
+    пока атрибуты проекта не сброшены, поэтому изменение занимает
+    два запроса к базе данных: SELECT и UPDATE. Если проход
+    инвестирования успел изменить проект, изменение повторяется.
     Доступен долько для суперпользователей!
     """
-    await check_charity_project_exist(project_id, session)
-    await check_is_closed_or_invested_project(
-        project_id,
-        is_closed=True,
-        session=session
-    )
-    if obj_in.full_amount:
-        await check_new_full_amount_cant_be_less_than_invested_amount(
-            project_id, obj_in.full_amount, session
+
+    async def update() -> CharityProjectDB:
+        charity_project = await validate_charity_project_update(
+            project_id, obj_in, session
         )
-    charity_project = await charity_project_crud.get(project_id, session)
-    await check_charity_project_name_duplicate(
-        obj_in.name, session, charity_project.id
-    )
-    charity_project = await charity_project_crud.update(
-        charity_project, obj_in, session
-    )
-    await transaction_mechanism.recalculate_project_status(
-        charity_project, session
-    )
-    await session.refresh(charity_project)
-    return charity_project
+        charity_project = await charity_project_crud.update(
+            charity_project, obj_in, session, commit=False
+        )
+        transaction_mechanism.recalculate_project_status(charity_project)
+        await session.flush()
+        updated_project = CharityProjectDB.from_orm(charity_project)
+        await session.commit()
+        return updated_project
+
+    updated_project = await retry_on_stale_project(update, session)
+    await charity_project_cache.invalidate()
+    return updated_project
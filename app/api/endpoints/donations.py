@@ -1,12 +1,23 @@
-from fastapi import APIRouter, Depends
+from fastapi import APIRouter, Depends, Query, Request
 from sqlalchemy.ext.asyncio import AsyncSession
 
-from app.schemas.donation import DonationDB, DonationCreate
-from app.core.db import get_async_session
+from app.api.bulk import BULK_REQUEST_BODY, parse_bulk_items
+from app.api.pagination import Pagination, paginate
+from app.api.read_session import get_user_read_session
+from app.api.validators import check_donation_available_for_user
+from app.schemas.allocation import AllocationDB
+from app.schemas.donation import (
+    DonationBulkResult, DonationDB, DonationCreate
+)
+from app.core.db import get_async_session, get_read_session
+from app.crud.allocation import allocation_crud
 from app.crud.donations import donation_crud
 from app.core.user import current_superuser, current_user
+from app.models.donation import Donation
 from app.models.user import User
-from app.services.money_transaction import transaction_mechanism
+from app.services.export import ExportFormat, export_response
+from app.services.investing_worker import launch_investing
+from app.services.recent_writes import recent_writes
 
 DONATIONS_PREFIX_URL = '/donation'
 DONATIONS_ROUTER_TAGS = ['donations']
@@ -27,14 +38,36 @@ router = APIRouter(
     dependencies=[Depends(current_superuser)]
 )
 async def get_all_donations(
+    pagination: Pagination = Depends(),
+    session: AsyncSession = Depends(get_read_session)
+):
+    """
+    Эндпоинт для получения пожертвований постранично,
+    от старых к новым. Курсор следующей страницы передается
+    в заголовке X-Next-Cursor.
+    Доступен только для суперпользователей!
+    """
+    return await paginate(
+        donation_crud, DonationDB, pagination, session
+    )
+
+
+@router.get(
+    '/export',
+    dependencies=[Depends(current_superuser)]
+)
+async def export_donations(
+    export_format: ExportFormat = Query(
+        ExportFormat.ndjson, alias='format'
+    ),
     session: AsyncSession = Depends(get_async_session)
 ):
     """
-    Эндпоинт для получения списка всех пожертвований.
+    Эндпоинт для потоковой выгрузки всех пожертвований
+    в формате NDJSON или CSV для сверки.
     Доступен только для суперпользователей!
     """
-    donations = await donation_crud.get_multi(session)
-    return donations
+    return export_response(session, Donation, DonationDB, export_format)
 
 
 @router.get(
@@ -43,15 +76,46 @@ async def get_all_donations(
     response_model_exclude=EXCLUDE_DONATIONS_FIELDS_FOR_REGISTER_USER
 )
 async def get_donations_by_user(
+    pagination: Pagination = Depends(),
     user: User = Depends(current_user),
-    session: AsyncSession = Depends(get_async_session)
+    session: AsyncSession = Depends(get_user_read_session)
 ):
     """
-    Эндпоинт для получения пожертвований сделанных текущим пользователем.
+    Эндпоинт для получения пожертвований сделанных текущим пользователем
+    постранично, от новых к старым. Курсор следующей страницы
+    передается в заголовке X-Next-Cursor.
+    Сразу после создания пожертвования читает из основной базы,
+    поэтому новое пожертвование видно даже при отстающей реплике.
     Доступен только для авторизованных пользователей!
     """
-    donations = await donation_crud.get_by_user(user.id, session)
-    return donations
+    return await paginate(
+        donation_crud,
+        DonationDB,
+        pagination,
+        session,
+        exclude=EXCLUDE_DONATIONS_FIELDS_FOR_REGISTER_USER,
+        descending=True,
+        user_id=user.id
+    )
+
+
+@router.get(
+    '/{donation_id}/allocations',
+    response_model=list[AllocationDB]
+)
+async def get_donation_allocations(
+    donation_id: int,
+    user: User = Depends(current_user),
+    session: AsyncSession = Depends(get_async_session)
+):
+    """
+    Эндпоинт для получения журнала распределения пожертвования:
+    в какие проекты и сколько денег из него было вложено.
+    Доступен владельцу пожертвования и суперпользователям!
+    """
+    await check_donation_available_for_user(donation_id, user, session)
+    allocations = await allocation_crud.get_by_donation(donation_id, session)
+    return allocations
 
 
 @router.post(
@@ -69,6 +133,41 @@ async def create_donation(
     Доступен только для авторизованных пользователей!
     """
     donation = await donation_crud.create(donation_data, session, user)
-    await transaction_mechanism.launch_investing_proccess(session)
-    await session.refresh(donation)
+    await recent_writes.mark(user.id)
+    await launch_investing(session, donation)
     return donation
+
+
+@router.post(
+    '/bulk',
+    response_model=DonationBulkResult,
+    response_model_exclude={
+        'created': {'__all__': EXCLUDE_DONATIONS_FIELDS_FOR_REGISTER_USER}
+    },
+    openapi_extra=BULK_REQUEST_BODY
+)
+async def create_donations_bulk(
+    request: Request,
+    user: User = Depends(current_user),
+    session: AsyncSession = Depends(get_async_session)
+):
+    """
+    Эндпоинт для массового создания пожертвований из JSON-массива
+    или NDJSON (Content-Type: application/x-ndjson).
+    Все корректные пожертвования вставляются одним запросом и
+    распределяются одним проходом инвестирования, а ошибки
+    остальных возвращаются с их номерами в запросе.
+    Доступен только для авторизованных пользователей!
+    """
+    donations_in, errors = await parse_bulk_items(request, DonationCreate)
+    if not donations_in:
+        return {'created': [], 'errors': errors}
+    batch = await donation_crud.create_multi(
+        list(donations_in.values()), session, user
+    )
+    await recent_writes.mark(user.id)
+    await launch_investing(session)
+    return {
+        'created': await donation_crud.get_multi(session, **batch),
+        'errors': errors,
+    }
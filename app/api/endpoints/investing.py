@@ -0,0 +1,36 @@
+from fastapi import APIRouter, Depends
+
+from app.core.user import current_superuser
+from app.schemas.investing import InvestingStats
+from app.services.investing_coordinator import investing_coordinator
+from app.services.investing_worker import investing_worker
+
+INVESTING_PREFIX_URL = '/investing'
+INVESTING_ROUTER_TAGS = ['investing']
+
+
+router = APIRouter(
+    prefix=INVESTING_PREFIX_URL,
+    tags=INVESTING_ROUTER_TAGS
+)
+
+
+@router.get(
+    '/stats',
+    response_model=InvestingStats,
+    dependencies=[Depends(current_superuser)]
+)
+async def get_investing_stats():
+    """
+    Эндпоинт для получения счетчиков запусков инвестирования:
+    сколько запусков было запрошено, сколько проходов выполнено
+    и сколько запросов присоединилось к уже запланированному проходу.
+    Доступен только для суперпользователей!
+    """
+    return InvestingStats(
+        requests_count=investing_coordinator.requests_count,
+        runs_count=investing_coordinator.runs_count,
+        merged_count=investing_coordinator.merged_count,
+        worker_notifications_count=investing_worker.notifications_count,
+        worker_passes_count=investing_worker.passes_count,
+    )
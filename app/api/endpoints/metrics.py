@@ -0,0 +1,19 @@
+from fastapi import APIRouter, Response
+
+from app.core.metrics import PROMETHEUS_CONTENT_TYPE, registry
+
+METRICS_URL = '/metrics'
+METRICS_ROUTER_TAGS = ['metrics']
+
+
+router = APIRouter(tags=METRICS_ROUTER_TAGS)
+
+
+@router.get(METRICS_URL, include_in_schema=False)
+async def get_metrics():
+    """
+    Эндпоинт для сбора метрик процесса в текстовом формате Prometheus.
+    Метрики SQL-запросов собираются, только если включена настройка
+    SQL_INSTRUMENTATION.
+    """
+    return Response(registry.render(), media_type=PROMETHEUS_CONTENT_TYPE)
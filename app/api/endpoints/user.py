@@ -1,5 +1,6 @@
 from fastapi import APIRouter
 
+from app.core.jwt_keys import jwt_signing_keys
 from app.core.user import auth_backend, fastapi_users
 from app.schemas.user import UserRead, UserCreate, UserUpdate
 
@@ -9,6 +10,7 @@ USER_ROUTER_PREFIX = '/users'
 AUTH_ROUTER_TAGS = ['auth']
 USER_ROUTER_TAGS = ['users']
 USER_DELETE_ENDPOINT_NAME = 'users:delete_user'
+JWKS_URL = '/.well-known/jwks.json'
 
 router = APIRouter()
 
@@ -34,3 +36,12 @@ router.include_router(
     prefix=USER_ROUTER_PREFIX,
     tags=USER_ROUTER_TAGS,
 )
+
+
+@router.get(JWKS_URL, tags=AUTH_ROUTER_TAGS)
+async def get_jwks() -> dict:
+    """
+    Открытые ключи для проверки JWT без секрета приложения.
+    При подписи HS256 список ключей пуст.
+    """
+    return jwt_signing_keys.get_jwks()
@@ -0,0 +1,40 @@
+from http import HTTPStatus
+from typing import Optional
+
+from fastapi import Request, Response
+
+from app.api.pagination import NEXT_CURSOR_HEADER
+from app.services.charity_project_cache import CachedPage
+
+WEAK_ETAG_PREFIX = 'W/'
+ANY_ETAG = '*'
+
+
+def etag_matches(if_none_match: Optional[str], etag: str) -> bool:
+    """
+    Проверяет, есть ли etag среди значений заголовка If-None-Match.
+    По RFC 9110 сравнение для If-None-Match слабое, поэтому
+    префикс W/ не учитывается.
+    """
+    if if_none_match is None:
+        return False
+    candidates = {
+        candidate.strip().removeprefix(WEAK_ETAG_PREFIX)
+        for candidate in if_none_match.split(',')
+    }
+    return ANY_ETAG in candidates or etag in candidates
+
+
+def cached_page_response(request: Request, page: CachedPage) -> Response:
+    """
+    Возвращает страницу с заголовком ETag или пустой ответ 304,
+    если клиент прислал тот же ETag в If-None-Match.
+    """
+    headers = {'ETag': page.etag}
+    if page.next_cursor is not None:
+        headers[NEXT_CURSOR_HEADER] = page.next_cursor
+    if etag_matches(request.headers.get('if-none-match'), page.etag):
+        return Response(status_code=HTTPStatus.NOT_MODIFIED, headers=headers)
+    return Response(
+        page.body, media_type='application/json', headers=headers
+    )
@@ -0,0 +1,119 @@
+import json
+from base64 import urlsafe_b64decode, urlsafe_b64encode
+from datetime import datetime
+from http import HTTPStatus
+from typing import Collection, Optional
+
+from fastapi import HTTPException, Query, Response
+from pydantic import BaseModel
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from app.core.config import settings
+from app.crud.base import BaseCRUD
+from app.services.serialization import dump_rows, schema_fields
+
+NEXT_CURSOR_HEADER = 'X-Next-Cursor'
+INVALID_CURSOR_ERROR = 'Некорректный курсор пагинации!'
+
+
+def encode_cursor(obj) -> str:
+    """
+    Кодирует ключ (create_date, id) объекта в непрозрачную
+    строку курсора.
+    """
+    key = json.dumps([obj.create_date.isoformat(), obj.id])
+    return urlsafe_b64encode(key.encode()).decode()
+
+
+def decode_cursor(cursor: str) -> tuple[datetime, int]:
+    """
+    Восстанавливает ключ (create_date, id) из курсора.
+    Если курсор поврежден, то выбрасывает исключение.
+    """
+    try:
+        create_date, obj_id = json.loads(urlsafe_b64decode(cursor.encode()))
+        return datetime.fromisoformat(create_date), int(obj_id)
+    except (ValueError, TypeError):
+        raise HTTPException(
+            status_code=HTTPStatus.BAD_REQUEST,
+            detail=INVALID_CURSOR_ERROR
+        )
+
+
+class Pagination:
+    """
+    Параметры keyset-пагинации списков: размер страницы limit
+    и курсор cursor из заголовка X-Next-Cursor предыдущего ответа.
+    """
+
+    def __init__(
+        self,
+        limit: int = Query(
+            settings.pagination_default_limit,
+            ge=1,
+            le=settings.pagination_max_limit
+        ),
+        cursor: Optional[str] = Query(None),
+    ):
+        self.limit = limit
+        self.cursor = cursor
+        self.last_key = None if cursor is None else decode_cursor(cursor)
+
+
+async def get_page(
+    crud: BaseCRUD,
+    fields: list[str],
+    pagination: Pagination,
+    session: AsyncSession,
+    **query_options
+) -> tuple[list, Optional[str]]:
+    """
+    Возвращает одну страницу строк с колонками fields и курсор
+    следующей страницы. Поля create_date и id должны входить в fields.
+    query_options (порядок descending и условия на колонки)
+    передаются в crud.get_multi_rows.
+    Запрашивается на одну строку больше размера страницы: если она
+    нашлась, то следующая страница существует.
+    """
+    rows = await crud.get_multi_rows(
+        fields,
+        session,
+        limit=pagination.limit + 1,
+        last_key=pagination.last_key,
+        **query_options
+    )
+    if len(rows) <= pagination.limit:
+        return rows, None
+    rows = rows[:pagination.limit]
+    return rows, encode_cursor(rows[-1])
+
+
+async def paginate(
+    crud: BaseCRUD,
+    schema: type[BaseModel],
+    pagination: Pagination,
+    session: AsyncSession,
+    exclude: Collection[str] = (),
+    **query_options
+) -> Response:
+    """
+    Возвращает одну страницу списка, передавая курсор следующей
+    страницы в заголовке X-Next-Cursor. Тело ответа остается
+    списком, как и без пагинации.
+    Выбираются только поля схемы schema, кроме exclude (аналог
+    response_model_exclude эндпоинта), и строки сразу кодируются
+    в JSON, минуя pydantic. Схема в response_model эндпоинта
+    остается прежней, поэтому OpenAPI-документация не меняется.
+    """
+    fields = [
+        field for field in schema_fields(schema) if field not in exclude
+    ]
+    rows, next_cursor = await get_page(
+        crud, fields, pagination, session, **query_options
+    )
+    response = Response(
+        dump_rows(fields, rows), media_type='application/json'
+    )
+    if next_cursor is not None:
+        response.headers[NEXT_CURSOR_HEADER] = next_cursor
+    return response
@@ -0,0 +1,24 @@
+from fastapi import Depends
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from app.core.db import get_async_session, get_read_session
+from app.core.user import current_user
+from app.models.user import User
+from app.services.recent_writes import recent_writes
+
+
+async def get_user_read_session(
+    user: User = Depends(current_user),
+    session: AsyncSession = Depends(get_async_session)
+):
+    """
+    Сессия для чтения собственных данных пользователя.
+    Если пользователь недавно изменял свои данные, то чтение идет
+    из основной базы, чтобы он увидел свои изменения, даже если
+    реплика от нее отстает. Иначе - как get_read_session.
+    """
+    if await recent_writes.is_recent(user.id):
+        yield session
+        return
+    async for read_session in get_read_session(session):
+        yield read_session
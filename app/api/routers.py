@@ -1,7 +1,8 @@
 from fastapi import APIRouter
 
 from app.api.endpoints import (
-    user_router, charity_project_router, donations_router
+    user_router, charity_project_router, donations_router, investing_router,
+    metrics_router
 )
 
 main_router = APIRouter()
@@ -11,3 +12,7 @@ main_router.include_router(user_router)
 main_router.include_router(charity_project_router)
 
 main_router.include_router(donations_router)
+
+main_router.include_router(investing_router)
+
+main_router.include_router(metrics_router)
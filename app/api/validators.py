@@ -4,8 +4,16 @@ from typing import Optional
 from sqlalchemy.ext.asyncio import AsyncSession
 from fastapi import HTTPException
 
+from app.api.bulk import get_item_error
 from app.models.charity_project import CharityProject
+from app.models.donation import Donation
+from app.models.user import User
 from app.crud.charity_project import charity_project_crud
+from app.crud.donations import donation_crud
+from app.schemas.bulk import BulkItemError
+from app.schemas.charity_project import (
+    CharityProjectCreate, CharityProjectUpdate
+)
 
 
 CHARITY_PROJECT_DUPLICATE_NAME_ERROR = (
@@ -18,6 +26,9 @@ INVESTED_OR_CLOSED_CHARITY_PROJECT_ERROR = (
 NEW_FULL_AMOUNT_LESS_THAN_OLD_ERROR = (
     'Новая необходимая сумма не может быть меньше вложенных денег!'
 )
+MINIMUM_MONEY_VALUE_FOR_CHARITY_PROJECT = 0
+NOT_FOUND_DONATION_ERROR = 'Пожертвование не найдено!'
+FORBIDDEN_DONATION_ERROR = 'Нельзя просматривать чужое пожертвование!'
 
 
 async def check_charity_project_name_duplicate(
@@ -28,28 +39,84 @@ async def check_charity_project_name_duplicate(
     """
     Проверяет, что при обновлении проекта, его
     новое имя не может быть дубликатом(исключая текущее имя).
+    Из базы данных читается только идентификатор проекта.
     """
-    charity_project = await charity_project_crud.get_by_name(
+    project_id = await charity_project_crud.get_id_by_name(
         project_name, session
     )
-    if charity_project and charity_project.id != old_project_id:
+    check_charity_project_name_is_free(
+        project_id is not None and project_id != old_project_id
+    )
+
+
+def check_charity_project_name_is_free(is_name_taken: bool) -> None:
+    """
+    Выбрасывает исключение, если имя проекта уже занято
+    другим проектом.
+    """
+    if is_name_taken:
         raise HTTPException(
             status_code=HTTPStatus.BAD_REQUEST,
             detail=CHARITY_PROJECT_DUPLICATE_NAME_ERROR
         )
 
 
+async def split_charity_projects_for_import(
+    charity_projects: dict[int, CharityProjectCreate],
+    session: AsyncSession
+) -> tuple[list[CharityProjectCreate], list[BulkItemError]]:
+    """
+    Отбирает проекты массовой загрузки, которые можно создать.
+    Занятость всех имен проверяется одним запросом. Проект не
+    создается, если его имя занято, совпадает с именем проекта
+    выше в запросе или не проходит проверок модели CharityProject,
+    которые не выполняются при вставке без ORM-объектов.
+    Возвращает отобранные проекты и ошибки остальных.
+    """
+    taken_names = await charity_project_crud.get_taken_names(
+        {project.name for project in charity_projects.values()}, session
+    )
+    accepted, errors = [], []
+    for index, project in charity_projects.items():
+        try:
+            CharityProject(**project.dict())
+        except ValueError as error:
+            errors.append(get_item_error(index, str(error)))
+            continue
+        if project.name in taken_names:
+            errors.append(get_item_error(
+                index, CHARITY_PROJECT_DUPLICATE_NAME_ERROR, field='name'
+            ))
+            continue
+        taken_names.add(project.name)
+        accepted.append(project)
+    return accepted, errors
+
+
 async def check_charity_project_exist(
     project_id: int,
     session: AsyncSession
-) -> CharityProject:
+) -> None:
     """
     Проверяет, что благотворительный проект с указанным
     идентификатором существует, если это не так,
     то выбрасывает исключение.
-    Если нет, и объект существует, то возвращает его.
+    Колонки проекта при этом не читаются.
+    """
+    if not await charity_project_crud.exists(project_id, session):
+        raise HTTPException(
+            status_code=HTTPStatus.NOT_FOUND,
+            detail=NOT_FOUND_CHARITY_PROJECT_ERROR
+        )
+
+
+def check_charity_project_found(
+    charity_project: Optional[CharityProject]
+) -> CharityProject:
+    """
+    Проверяет, что проект был найден, если это не так,
+    то выбрасывает исключение. Иначе возвращает проект.
     """
-    charity_project = await charity_project_crud.get(project_id, session)
     if charity_project is None:
         raise HTTPException(
             status_code=HTTPStatus.NOT_FOUND,
@@ -58,14 +125,13 @@ async def check_charity_project_exist(
     return charity_project
 
 
-async def check_is_closed_or_invested_project(
-    project_id: int,
+def check_is_closed_or_invested_project(
+    charity_project: CharityProject,
     is_closed: bool,
-    session: AsyncSession,
     is_invested: Optional[bool] = None,
 ) -> None:
     """
-    Проверяет, что проект с указанным идентификатором не был
+    Проверяет, что проект не был
     закрыт или в него были инвестированны деньги.
     Если проект попадает в указанные критерии, то выбрасывается
     исключение или же просто ничего не происходит.
@@ -74,22 +140,21 @@ async def check_is_closed_or_invested_project(
     is_invested (опциональный, если не указан, то в вычислении не используется)
         означает, были ли инвестированы в проект деньги.
     """
-    charity_project = (
-        await charity_project_crud.get_closed_or_invested_charity_project(
-            project_id, is_closed, is_invested, session
-        )
-    )
-    if charity_project is not None:
+    if charity_project.fully_invested == is_closed or (
+        is_invested is not None and (
+            charity_project.invested_amount >
+            MINIMUM_MONEY_VALUE_FOR_CHARITY_PROJECT
+        ) == is_invested
+    ):
         raise HTTPException(
             status_code=HTTPStatus.BAD_REQUEST,
             detail=INVESTED_OR_CLOSED_CHARITY_PROJECT_ERROR
         )
 
 
-async def check_new_full_amount_cant_be_less_than_invested_amount(
-    project_id: int,
-    new_full_amount: int,
-    session: AsyncSession
+def check_new_full_amount_cant_be_less_than_invested_amount(
+    charity_project: CharityProject,
+    new_full_amount: int
 ) -> None:
     """
     Проверяет, что при обновлении проекта, новая необходимая сумма
@@ -97,9 +162,82 @@ async def check_new_full_amount_cant_be_less_than_invested_amount(
     Если это условие нарушается - то выбрасывается исключение.
     Если условие верно, то ничего не просиходит.
     """
-    charity_project = await charity_project_crud.get(project_id, session)
     if charity_project.invested_amount > new_full_amount:
         raise HTTPException(
             status_code=HTTPStatus.BAD_REQUEST,
             detail=NEW_FULL_AMOUNT_LESS_THAN_OLD_ERROR
         )
+
+
+async def validate_charity_project_update(
+    project_id: int,
+    obj_in: CharityProjectUpdate,
+    session: AsyncSession
+) -> CharityProject:
+    """
+    Загружает изменяемый проект одним запросом вместе с проверкой
+    занятости нового имени и проводит над ним все проверки
+    изменения в прежнем порядке: существование, закрытие,
+    новая необходимая сумма, уникальность имени.
+    Возвращает заблокированный для изменения проект.
+    """
+    charity_project, is_name_taken = (
+        await charity_project_crud.get_for_update(
+            project_id, session, obj_in.name
+        )
+    )
+    check_charity_project_found(charity_project)
+    check_is_closed_or_invested_project(charity_project, is_closed=True)
+    if obj_in.full_amount:
+        check_new_full_amount_cant_be_less_than_invested_amount(
+            charity_project, obj_in.full_amount
+        )
+    check_charity_project_name_is_free(is_name_taken)
+    return charity_project
+
+
+async def validate_charity_project_delete(
+    project_id: int,
+    session: AsyncSession
+) -> CharityProject:
+    """
+    Загружает удаляемый проект одним запросом и проверяет, что он
+    существует, не закрыт и в него не инвестировали деньги.
+    Возвращает заблокированный для удаления проект.
+    """
+    charity_project, _ = await charity_project_crud.get_for_update(
+        project_id, session
+    )
+    check_charity_project_found(charity_project)
+    check_is_closed_or_invested_project(
+        charity_project, is_closed=True, is_invested=True
+    )
+    return charity_project
+
+
+async def check_donation_available_for_user(
+    donation_id: int,
+    user: User,
+    session: AsyncSession
+) -> Donation:
+    """
+    Проверяет, что пожертвование с указанным идентификатором
+    существует и принадлежит пользователю. Суперпользователю
+    доступны все пожертвования.
+    Если проверка пройдена, то возвращает пожертвование, у которого
+    загружены только идентификатор и владелец.
+    """
+    donation = await donation_crud.get(
+        donation_id, session, Donation.id, Donation.user_id
+    )
+    if donation is None:
+        raise HTTPException(
+            status_code=HTTPStatus.NOT_FOUND,
+            detail=NOT_FOUND_DONATION_ERROR
+        )
+    if donation.user_id != user.id and not user.is_superuser:
+        raise HTTPException(
+            status_code=HTTPStatus.FORBIDDEN,
+            detail=FORBIDDEN_DONATION_ERROR
+        )
+    return donation
@@ -0,0 +1,86 @@
+import time
+from abc import ABC, abstractmethod
+from collections import OrderedDict
+from typing import Optional
+
+from app.core.config import settings
+
+
+class CacheBackend(ABC):
+    """
+    Интерфейс хранилища кэша. Значения - байты, поэтому его
+    методы один к одному ложатся на команды GET, SET с EX и DEL
+    Redis-совместимого хранилища.
+    """
+
+    @abstractmethod
+    async def get(self, key: str) -> Optional[bytes]:
+        """Возвращает значение ключа или None, если его нет."""
+
+    @abstractmethod
+    async def set(
+        self,
+        key: str,
+        value: bytes,
+        ttl: Optional[float] = None
+    ) -> None:
+        """Сохраняет значение ключа на ttl секунд."""
+
+    @abstractmethod
+    async def delete(self, key: str) -> None:
+        """Удаляет ключ."""
+
+
+class MemoryCache(CacheBackend):
+    """
+    Кэш внутри процесса с вытеснением давно не использованных
+    ключей (LRU) и временем жизни записей.
+    Каждый процесс веб-сервера держит собственную копию, поэтому
+    инвалидация видна только в процессе, который ее выполнил,
+    а остальные процессы увидят изменения по истечении ttl.
+    """
+
+    def __init__(
+        self,
+        max_size: int = settings.cache_max_size,
+        ttl: Optional[float] = settings.cache_ttl,
+    ):
+        self.max_size = max_size
+        self.ttl = ttl
+        self._entries: OrderedDict[str, tuple[Optional[float], bytes]] = (
+            OrderedDict()
+        )
+
+    async def get(self, key: str) -> Optional[bytes]:
+        entry = self._entries.get(key)
+        if entry is None:
+            return None
+        expires_at, value = entry
+        if expires_at is not None and expires_at <= time.monotonic():
+            del self._entries[key]
+            return None
+        self._entries.move_to_end(key)
+        return value
+
+    async def set(
+        self,
+        key: str,
+        value: bytes,
+        ttl: Optional[float] = None
+    ) -> None:
+        ttl = self.ttl if ttl is None else ttl
+        expires_at = None if ttl is None else time.monotonic() + ttl
+        self._entries[key] = (expires_at, value)
+        self._entries.move_to_end(key)
+        while len(self._entries) > self.max_size:
+            self._entries.popitem(last=False)
+
+    async def delete(self, key: str) -> None:
+        self._entries.pop(key, None)
+
+
+CACHE_BACKENDS = {
+    'memory': MemoryCache,
+}
+
+cache_backend = CACHE_BACKENDS[settings.cache_backend]()
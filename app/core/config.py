@@ -17,6 +17,44 @@ class Settings(BaseSettings):
     secret: str = DEFAULT_SECRET_KEY
     first_superuser_email: Optional[str] = None
     first_superuser_password: Optional[str] = None
+    investing_engine: str = 'two_pointers'
+    investing_chunk_size: int = 100
+    investing_retry_attempts: int = 3
+    investing_in_background: bool = False
+    investing_worker_in_process: bool = True
+    investing_batch_delay: float = 0.05
+    investing_poll_interval: Optional[float] = None
+    pagination_default_limit: int = 100
+    pagination_max_limit: int = 1000
+    bulk_max_items: int = 1000
+    cache_backend: str = 'memory'
+    cache_ttl: Optional[float] = 60.0
+    cache_max_size: int = 1024
+    sql_instrumentation: bool = False
+    pool_size: int = 5
+    pool_max_overflow: int = 10
+    pool_timeout: float = 30.0
+    pool_recycle: int = 1800
+    pool_pre_ping: bool = True
+    pool_warm_up: bool = True
+    query_cache_size: int = 500
+    sqlite_tuning: bool = True
+    sqlite_journal_mode: str = 'wal'
+    sqlite_synchronous: str = 'normal'
+    sqlite_mmap_size: int = 268435456
+    sqlite_cache_size: int = -65536
+    sqlite_temp_store: str = 'memory'
+    sqlite_busy_timeout: int = 5000
+    read_replica_url: Optional[str] = None
+    read_your_writes_window: float = 5.0
+    user_cache_ttl: float = 30.0
+    jwt_trust_claims: bool = False
+    jwt_algorithm: str = 'HS256'
+    jwt_private_key_file: Optional[str] = None
+    jwt_key_id: Optional[str] = None
+    password_hash_workers: int = 4
+    password_hash_max_concurrency: int = 8
+    password_hash_executor: str = 'thread'
 
     class Config:
         env_file = '.env'
@@ -1,8 +1,21 @@
-from sqlalchemy import Column, Integer
-from sqlalchemy.ext.asyncio import AsyncSession, create_async_engine
+import asyncio
+from contextlib import AsyncExitStack
+from typing import Optional
+
+from fastapi import Depends
+from sqlalchemy import Column, Integer, event
+from sqlalchemy.engine import make_url
+from sqlalchemy.ext.asyncio import (
+    AsyncEngine, AsyncSession, create_async_engine
+)
 from sqlalchemy.orm import declarative_base, sessionmaker, declared_attr
+from sqlalchemy.pool import (
+    AsyncAdaptedQueuePool, NullPool, QueuePool, StaticPool
+)
+
+from app.core.config import Settings, settings
 
-from app.core.config import settings
+SQLITE_MEMORY_DATABASES = (None, '', ':memory:')
 
 
 class PreBase:
@@ -16,11 +29,147 @@ class PreBase:
 
 Base = declarative_base(cls=PreBase)
 
-engine = create_async_engine(settings.database_url)
+
+def get_engine_options(
+    config: Settings,
+    database_url: Optional[str] = None
+) -> dict:
+    """
+    Возвращает параметры create_async_engine для базы данных
+    database_url, по умолчанию - config.database_url.
+    SQLite в памяти живет, пока открыто соединение, поэтому
+    использует одно общее соединение (StaticPool). Остальные базы
+    получают пул на pool_size соединений, pool_size=0 отключает
+    пул (NullPool), например за внешним пулером соединений.
+    Проверка соединений перед выдачей и их пересоздание включаются
+    только для серверных баз: соединения с файлом SQLite
+    не обрываются со стороны сервера.
+    """
+    url = make_url(database_url or config.database_url)
+    options = {'query_cache_size': config.query_cache_size}
+    if url.get_backend_name() == 'sqlite':
+        options['connect_args'] = {'check_same_thread': False}
+        if url.database in SQLITE_MEMORY_DATABASES:
+            options['poolclass'] = StaticPool
+            return options
+    else:
+        options['pool_pre_ping'] = config.pool_pre_ping
+        options['pool_recycle'] = config.pool_recycle
+    if not config.pool_size:
+        options['poolclass'] = NullPool
+        return options
+    options.update(
+        poolclass=AsyncAdaptedQueuePool,
+        pool_size=config.pool_size,
+        max_overflow=config.pool_max_overflow,
+        pool_timeout=config.pool_timeout
+    )
+    return options
+
+
+def get_sqlite_pragmas(config: Settings) -> dict:
+    """
+    Возвращает профиль настроек соединения SQLite:
+    WAL позволяет читать базу во время записи, а synchronous=NORMAL
+    в режиме WAL синхронизирует диск только при контрольных точках.
+    mmap_size и cache_size (отрицательное значение задается в КиБ)
+    уменьшают число чтений с диска, temp_store переносит временные
+    таблицы и индексы сортировок в память, а busy_timeout заставляет
+    ждать освобождения блокировки вместо ошибки database is locked.
+    """
+    return {
+        'journal_mode': config.sqlite_journal_mode,
+        'synchronous': config.sqlite_synchronous,
+        'mmap_size': config.sqlite_mmap_size,
+        'cache_size': config.sqlite_cache_size,
+        'temp_store': config.sqlite_temp_store,
+        'busy_timeout': config.sqlite_busy_timeout,
+    }
+
+
+def apply_sqlite_pragmas(
+    engine: AsyncEngine,
+    config: Settings,
+    read_only: bool = False
+) -> None:
+    """
+    Подключает установку профиля настроек SQLite к каждому новому
+    соединению движка. Для остальных баз ничего не делает.
+    С read_only=True соединения дополнительно запрещают запись
+    (PRAGMA query_only).
+    """
+    if engine.dialect.name != 'sqlite':
+        return
+    pragmas = get_sqlite_pragmas(config) if config.sqlite_tuning else {}
+    if read_only:
+        pragmas['query_only'] = 1
+    if not pragmas:
+        return
+
+    @event.listens_for(engine.sync_engine, 'connect')
+    def set_sqlite_pragmas(dbapi_connection, connection_record):
+        cursor = dbapi_connection.cursor()
+        for name, value in pragmas.items():
+            cursor.execute(f'PRAGMA {name}={value}')
+        cursor.close()
+
+
+async def warm_up_engine(engine: AsyncEngine) -> int:
+    """
+    Заранее открывает постоянные соединения пула, чтобы первые
+    запросы после запуска не тратили время на подключение к базе.
+    Первое соединение открывается отдельно: при нем движок
+    инициализирует диалект, блокируя остальные подключения.
+    Остальные открываются параллельно, после чего все соединения
+    возвращаются в пул. Возвращает число открытых соединений.
+    """
+    pool = engine.sync_engine.pool
+    if not isinstance(pool, QueuePool) or not pool.size():
+        return 0
+    async with AsyncExitStack() as stack:
+        await stack.enter_async_context(engine.connect())
+        await asyncio.gather(*(
+            stack.enter_async_context(engine.connect())
+            for _ in range(pool.size() - 1)
+        ))
+    return pool.size()
+
+
+engine = create_async_engine(
+    settings.database_url, **get_engine_options(settings)
+)
+apply_sqlite_pragmas(engine, settings)
 
 AsyncSessionLocal = sessionmaker(engine, class_=AsyncSession)
 
+read_engine: Optional[AsyncEngine] = None
+AsyncReadSessionLocal: Optional[sessionmaker] = None
+if settings.read_replica_url:
+    read_engine = create_async_engine(
+        settings.read_replica_url,
+        **get_engine_options(settings, settings.read_replica_url)
+    )
+    apply_sqlite_pragmas(read_engine, settings, read_only=True)
+    AsyncReadSessionLocal = sessionmaker(read_engine, class_=AsyncSession)
+
 
 async def get_async_session():
     async with AsyncSessionLocal() as async_session:
         yield async_session
+
+
+async def get_read_session(
+    session: AsyncSession = Depends(get_async_session)
+):
+    """
+    Сессия для эндпоинтов, которые только читают данные.
+    Если задан READ_REPLICA_URL, то чтение идет с реплики, иначе
+    используется сессия основной базы. Сессия основной базы
+    не открывает соединение до первого запроса, поэтому при
+    чтении с реплики она ничего не стоит.
+    """
+    if AsyncReadSessionLocal is None:
+        yield session
+        return
+    async with AsyncReadSessionLocal() as read_session:
+        yield read_session
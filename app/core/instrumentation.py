@@ -0,0 +1,180 @@
+import re
+import time
+from contextlib import contextmanager
+from contextvars import ContextVar
+from typing import Iterator, Optional
+
+from sqlalchemy import event
+from sqlalchemy.ext.asyncio import AsyncEngine
+from starlette.datastructures import MutableHeaders
+from starlette.types import ASGIApp, Message, Receive, Scope, Send
+
+from app.core.metrics import Metric, format_labels, registry
+
+SLOWEST_STATEMENTS_COUNT = 5
+STATEMENT_MAX_LENGTH = 200
+QUERY_START_TIMES_KEY = 'query_start_times'
+SERVER_TIMING_HEADER = 'Server-Timing'
+SERVER_TIMING_VALUE = 'db;dur={:.2f};desc="queries: {}"'
+WHITESPACE_PATTERN = re.compile(r'\s+')
+
+
+class SlowestStatements(Metric):
+    """
+    Самые долгие различные SQL-запросы и их наибольшая
+    длительность. Хранится не больше size запросов.
+    """
+    metric_type = 'gauge'
+
+    def __init__(
+        self,
+        name: str = 'db_slowest_query_duration_seconds',
+        documentation: str = 'Наибольшая длительность самых долгих запросов.',
+        size: int = SLOWEST_STATEMENTS_COUNT
+    ):
+        super().__init__(name, documentation, ('statement',))
+        self.size = size
+
+    def record(self, statement: str, duration: float) -> None:
+        if statement in self._values:
+            self._values[statement] = max(self._values[statement], duration)
+            return
+        if len(self._values) < self.size:
+            self._values[statement] = duration
+            return
+        fastest = min(self._values, key=self._values.get)
+        if duration > self._values[fastest]:
+            del self._values[fastest]
+            self._values[statement] = duration
+
+    def items(self) -> list[tuple[str, float]]:
+        """Возвращает запросы от самого долгого к самому быстрому."""
+        return sorted(
+            self._values.items(), key=lambda item: item[1], reverse=True
+        )
+
+    def render_samples(self) -> list[str]:
+        return [
+            f'{self.name}{format_labels({"statement": statement})} '
+            f'{duration!r}'
+            for statement, duration in self.items()
+        ]
+
+
+class QueryStats:
+    """Число, суммарная длительность и самые долгие SQL-запросы."""
+
+    def __init__(self):
+        self.count = 0
+        self.duration = 0.0
+        self.slowest = SlowestStatements()
+
+    def record(self, statement: str, duration: float) -> None:
+        self.count += 1
+        self.duration += duration
+        self.slowest.record(statement, duration)
+
+    def server_timing(self) -> str:
+        return SERVER_TIMING_VALUE.format(self.duration * 1000, self.count)
+
+
+db_queries_total = registry.counter(
+    'db_queries_total', 'Число выполненных SQL-запросов.'
+)
+db_query_duration_seconds = registry.histogram(
+    'db_query_duration_seconds', 'Длительность SQL-запросов.'
+)
+db_slowest_queries = registry.register(SlowestStatements())
+
+current_query_stats: ContextVar[Optional[QueryStats]] = ContextVar(
+    'current_query_stats', default=None
+)
+query_observers: list[QueryStats] = []
+
+
+def normalize_statement(statement: str) -> str:
+    return WHITESPACE_PATTERN.sub(' ', statement).strip()[
+        :STATEMENT_MAX_LENGTH
+    ]
+
+
+def record_query(statement: str, duration: float) -> None:
+    """
+    Учитывает выполненный запрос в метриках процесса, в статистике
+    текущего запроса к API и во всех активных наблюдателях.
+    """
+    statement = normalize_statement(statement)
+    db_queries_total.inc()
+    db_query_duration_seconds.observe(duration)
+    db_slowest_queries.record(statement, duration)
+    request_stats = current_query_stats.get()
+    if request_stats is not None:
+        request_stats.record(statement, duration)
+    for stats in query_observers:
+        stats.record(statement, duration)
+
+
+def before_cursor_execute(conn, cursor, statement, *args) -> None:
+    conn.info.setdefault(QUERY_START_TIMES_KEY, []).append(
+        time.perf_counter()
+    )
+
+
+def after_cursor_execute(conn, cursor, statement, *args) -> None:
+    started = conn.info[QUERY_START_TIMES_KEY].pop()
+    record_query(statement, time.perf_counter() - started)
+
+
+def instrument_engine(engine: AsyncEngine) -> None:
+    """Подключает учет запросов к событиям движка базы данных."""
+    sync_engine = engine.sync_engine
+    if event.contains(
+        sync_engine, 'before_cursor_execute', before_cursor_execute
+    ):
+        return
+    event.listen(sync_engine, 'before_cursor_execute', before_cursor_execute)
+    event.listen(sync_engine, 'after_cursor_execute', after_cursor_execute)
+
+
+@contextmanager
+def observe_queries() -> Iterator[QueryStats]:
+    """
+    Собирает статистику всех запросов, выполненных внутри блока,
+    независимо от задачи и потока, в котором они выполнялись.
+    """
+    stats = QueryStats()
+    query_observers.append(stats)
+    try:
+        yield stats
+    finally:
+        query_observers.remove(stats)
+
+
+class QueryStatsMiddleware:
+    """
+    ASGI-middleware, собирающее статистику SQL-запросов каждого
+    запроса к API и добавляющее ее в заголовок Server-Timing.
+    Запросы учитываются, только если движок подключен через
+    instrument_engine.
+    """
+
+    def __init__(self, app: ASGIApp):
+        self.app = app
+
+    async def __call__(self, scope: Scope, receive: Receive, send: Send):
+        if scope['type'] != 'http':
+            return await self.app(scope, receive, send)
+        stats = QueryStats()
+        token = current_query_stats.set(stats)
+
+        async def send_with_server_timing(message: Message) -> None:
+            if message['type'] == 'http.response.start' and stats.count:
+                MutableHeaders(scope=message).append(
+                    SERVER_TIMING_HEADER, stats.server_timing()
+                )
+            await send(message)
+
+        try:
+            await self.app(scope, receive, send_with_server_timing)
+        finally:
+            current_query_stats.reset(token)
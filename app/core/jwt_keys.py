@@ -0,0 +1,110 @@
+import base64
+import hashlib
+import json
+from pathlib import Path
+from typing import Any, Optional, Union
+
+from cryptography.hazmat.primitives.asymmetric.ed448 import Ed448PrivateKey
+from cryptography.hazmat.primitives.asymmetric.ed25519 import (
+    Ed25519PrivateKey
+)
+from cryptography.hazmat.primitives.asymmetric.rsa import RSAPrivateKey
+from cryptography.hazmat.primitives.serialization import (
+    Encoding, PublicFormat, load_pem_private_key
+)
+from jwt.algorithms import OKPAlgorithm, RSAAlgorithm
+
+from app.core.config import Settings, settings
+
+SYMMETRIC_ALGORITHM = 'HS256'
+ASYMMETRIC_ALGORITHMS = {
+    'RS256': (RSAAlgorithm, (RSAPrivateKey,)),
+    'EdDSA': (OKPAlgorithm, (Ed25519PrivateKey, Ed448PrivateKey)),
+}
+KEY_ID_LENGTH = 16
+KEY_USE_SIGNATURE = 'sig'
+UNKNOWN_ALGORITHM = 'Неизвестный алгоритм подписи JWT {}, доступны: {}.'
+PRIVATE_KEY_REQUIRED = (
+    'Для алгоритма подписи JWT {} нужен закрытый ключ '
+    'в JWT_PRIVATE_KEY_FILE.'
+)
+WRONG_KEY_TYPE = 'Ключ из {} не подходит для алгоритма подписи JWT {}.'
+
+
+def get_key_id(public_key: Any) -> str:
+    """Идентификатор ключа kid по SHA-256 открытого ключа."""
+    digest = hashlib.sha256(public_key.public_bytes(
+        Encoding.DER, PublicFormat.SubjectPublicKeyInfo
+    )).digest()
+    return base64.urlsafe_b64encode(digest).decode()[:KEY_ID_LENGTH]
+
+
+class JWTKeys:
+    """
+    Ключи подписи и проверки JWT. Для асимметричных алгоритмов
+    хранит разобранные объекты ключей cryptography, поэтому
+    PEM читается и разбирается один раз, а открытый ключ
+    публикуется в JWKS для проверки токенов без секрета.
+    """
+
+    def __init__(
+        self,
+        algorithm: str,
+        encode_key: Union[str, Any],
+        decode_key: Union[str, Any],
+        key_id: Optional[str] = None
+    ):
+        self.algorithm = algorithm
+        self.encode_key = encode_key
+        self.decode_key = decode_key
+        self.key_id = key_id
+
+    @property
+    def is_asymmetric(self) -> bool:
+        return self.algorithm in ASYMMETRIC_ALGORITHMS
+
+    def get_jwks(self) -> dict:
+        """JSON Web Key Set с открытым ключом, пустой для HS256."""
+        if not self.is_asymmetric:
+            return {'keys': []}
+        algorithm_class, _ = ASYMMETRIC_ALGORITHMS[self.algorithm]
+        return {'keys': [{
+            **json.loads(algorithm_class.to_jwk(self.decode_key)),
+            'kid': self.key_id,
+            'alg': self.algorithm,
+            'use': KEY_USE_SIGNATURE,
+        }]}
+
+
+def load_jwt_keys(config: Settings = settings) -> JWTKeys:
+    """
+    Загружает ключи JWT_ALGORITHM: для HS256 это SECRET,
+    для RS256 и EdDSA - закрытый ключ из PEM-файла
+    JWT_PRIVATE_KEY_FILE и полученный из него открытый ключ.
+    """
+    algorithm = config.jwt_algorithm
+    if algorithm == SYMMETRIC_ALGORITHM:
+        return JWTKeys(algorithm, config.secret, config.secret)
+    if algorithm not in ASYMMETRIC_ALGORITHMS:
+        raise ValueError(UNKNOWN_ALGORITHM.format(
+            algorithm,
+            ', '.join((SYMMETRIC_ALGORITHM, *ASYMMETRIC_ALGORITHMS))
+        ))
+    if config.jwt_private_key_file is None:
+        raise ValueError(PRIVATE_KEY_REQUIRED.format(algorithm))
+    private_key = load_pem_private_key(
+        Path(config.jwt_private_key_file).read_bytes(), password=None
+    )
+    _, key_types = ASYMMETRIC_ALGORITHMS[algorithm]
+    if not isinstance(private_key, key_types):
+        raise ValueError(
+            WRONG_KEY_TYPE.format(config.jwt_private_key_file, algorithm)
+        )
+    public_key = private_key.public_key()
+    return JWTKeys(
+        algorithm, private_key, public_key,
+        config.jwt_key_id or get_key_id(public_key)
+    )
+
+
+jwt_signing_keys = load_jwt_keys()
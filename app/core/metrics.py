@@ -0,0 +1,176 @@
+from abc import ABC, abstractmethod
+from typing import Iterable, Optional
+
+PROMETHEUS_CONTENT_TYPE = 'text/plain; version=0.0.4'
+DEFAULT_BUCKETS = (
+    0.001, 0.0025, 0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0
+)
+
+
+def escape_label_value(value) -> str:
+    return (
+        str(value).replace('\\', '\\\\').replace('\n', '\\n')
+        .replace('"', '\\"')
+    )
+
+
+def format_labels(labels: dict) -> str:
+    if not labels:
+        return ''
+    return '{' + ','.join(
+        f'{name}="{escape_label_value(value)}"'
+        for name, value in labels.items()
+    ) + '}'
+
+
+def format_value(value: float) -> str:
+    if value == float('inf'):
+        return '+Inf'
+    return repr(float(value))
+
+
+class Metric(ABC):
+    """
+    Метрика реестра в текстовом формате Prometheus.
+    Значения хранятся по наборам значений меток labelnames.
+    """
+    metric_type = 'untyped'
+
+    def __init__(
+        self,
+        name: str,
+        documentation: str,
+        labelnames: Iterable[str] = ()
+    ):
+        self.name = name
+        self.documentation = documentation
+        self.labelnames = tuple(labelnames)
+        self._values = {}
+
+    def get_key(self, labels: dict) -> tuple:
+        return tuple(labels.get(name, '') for name in self.labelnames)
+
+    @abstractmethod
+    def render_samples(self) -> list[str]:
+        """Возвращает строки значений метрики."""
+
+    def render(self) -> list[str]:
+        return [
+            f'# HELP {self.name} {self.documentation}',
+            f'# TYPE {self.name} {self.metric_type}',
+            *self.render_samples(),
+        ]
+
+
+class Counter(Metric):
+    metric_type = 'counter'
+
+    def inc(self, amount: float = 1, **labels) -> None:
+        key = self.get_key(labels)
+        self._values[key] = self._values.get(key, 0) + amount
+
+    def get(self, **labels) -> float:
+        return self._values.get(self.get_key(labels), 0)
+
+    def render_samples(self) -> list[str]:
+        return [
+            f'{self.name}{format_labels(dict(zip(self.labelnames, key)))} '
+            f'{format_value(value)}'
+            for key, value in self._values.items()
+        ]
+
+
+class Gauge(Counter):
+    metric_type = 'gauge'
+
+    def set(self, value: float, **labels) -> None:
+        self._values[self.get_key(labels)] = value
+
+
+class Histogram(Metric):
+    metric_type = 'histogram'
+
+    def __init__(
+        self,
+        name: str,
+        documentation: str,
+        labelnames: Iterable[str] = (),
+        buckets: Iterable[float] = DEFAULT_BUCKETS
+    ):
+        super().__init__(name, documentation, labelnames)
+        self.buckets = (*sorted(buckets), float('inf'))
+
+    def observe(self, value: float, **labels) -> None:
+        key = self.get_key(labels)
+        counts, total = self._values.get(key, ([0] * len(self.buckets), 0))
+        for index, bound in enumerate(self.buckets):
+            if value <= bound:
+                counts[index] += 1
+        self._values[key] = (counts, total + value)
+
+    def get_count(self, **labels) -> int:
+        counts, _ = self._values.get(
+            self.get_key(labels), ([0] * len(self.buckets), 0)
+        )
+        return counts[-1]
+
+    def get_sum(self, **labels) -> float:
+        _, total = self._values.get(self.get_key(labels), (None, 0))
+        return total
+
+    def render_samples(self) -> list[str]:
+        samples = []
+        for key, (counts, total) in self._values.items():
+            labels = dict(zip(self.labelnames, key))
+            samples.extend(
+                f'{self.name}_bucket'
+                f'{format_labels({**labels, "le": format_value(bound)})} '
+                f'{count}'
+                for bound, count in zip(self.buckets, counts)
+            )
+            samples.append(
+                f'{self.name}_sum{format_labels(labels)} '
+                f'{format_value(total)}'
+            )
+            samples.append(
+                f'{self.name}_count{format_labels(labels)} {counts[-1]}'
+            )
+        return samples
+
+
+class MetricsRegistry:
+    """Реестр метрик процесса, отдаваемых эндпоинтом /metrics."""
+
+    def __init__(self):
+        self._metrics: dict[str, Metric] = {}
+
+    def register(self, metric: Metric) -> Metric:
+        self._metrics[metric.name] = metric
+        return metric
+
+    def get(self, name: str) -> Optional[Metric]:
+        return self._metrics.get(name)
+
+    def counter(self, name: str, documentation: str, **kwargs) -> Counter:
+        return self.register(Counter(name, documentation, **kwargs))
+
+    def gauge(self, name: str, documentation: str, **kwargs) -> Gauge:
+        return self.register(Gauge(name, documentation, **kwargs))
+
+    def histogram(
+        self,
+        name: str,
+        documentation: str,
+        **kwargs
+    ) -> Histogram:
+        return self.register(Histogram(name, documentation, **kwargs))
+
+    def render(self) -> str:
+        return ''.join(
+            line + '\n'
+            for metric in self._metrics.values()
+            for line in metric.render()
+        )
+
+
+registry = MetricsRegistry()
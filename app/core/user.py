@@ -1,20 +1,30 @@
-from typing import Optional, Union
+from datetime import datetime, timedelta
+from typing import Any, Optional, Union
 import logging
 
+import jwt
 from fastapi import Depends, Request
+from fastapi.security import OAuth2PasswordRequestForm
 from fastapi_users import (
-    BaseUserManager, FastAPIUsers, IntegerIDMixin, InvalidPasswordException
+    BaseUserManager, FastAPIUsers, IntegerIDMixin, InvalidPasswordException,
+    exceptions
 )
 from fastapi_users.authentication import (
-    AuthenticationBackend, BearerTransport, JWTStrategy
+    AuthenticationBackend, Authenticator, BearerTransport, JWTStrategy
 )
+from fastapi_users.jwt import decode_jwt
 from fastapi_users_db_sqlalchemy import SQLAlchemyUserDatabase
 from sqlalchemy.ext.asyncio import AsyncSession
 
 from app.core.config import settings
 from app.core.db import get_async_session
+from app.core.jwt_keys import JWTKeys, jwt_signing_keys
 from app.models.user import User
 from app.schemas.user import UserCreate
+from app.services.password_hashing import password_hashing
+from app.services.user_cache import (
+    USER_PRINCIPAL_FIELDS, build_principal, user_principal_cache
+)
 
 BEARER_TRANSPORT_URL = 'auth/jwt/login'
 JWT_TOKEN_LIFETIME = 3600
@@ -25,6 +35,10 @@ EMAIL_IN_PASSWORD_ERROR = 'Пароль не должен содержать е
 AFTER_USER_REGISTRATION_MESSAGE = (
     'Пользователь {} был успешно зарегистрирован!'
 )
+USER_ID_CLAIM = 'user_id'
+PRINCIPAL_CLAIMS = tuple(
+    field for field in USER_PRINCIPAL_FIELDS if field != 'id'
+)
 
 
 async def get_user_db(
@@ -36,8 +50,90 @@ async def get_user_db(
 bearer_transport = BearerTransport(tokenUrl=BEARER_TRANSPORT_URL)
 
 
+class PrincipalJWTStrategy(JWTStrategy):
+    """
+    JWT-стратегия, которая кроме идентификатора записывает в токен
+    поля пользователя, нужные для проверки прав (PRINCIPAL_CLAIMS).
+    Токены подписываются ключами JWTKeys, а при асимметричной
+    подписи в заголовок добавляется идентификатор ключа kid.
+    """
+
+    def __init__(self, keys: JWTKeys, lifetime_seconds: Optional[int]):
+        super().__init__(
+            keys.encode_key, lifetime_seconds,
+            algorithm=keys.algorithm, public_key=keys.decode_key
+        )
+        self.key_id = keys.key_id
+
+    async def write_token(self, user: User) -> str:
+        data = {
+            USER_ID_CLAIM: str(user.id),
+            'aud': self.token_audience,
+            **{claim: getattr(user, claim) for claim in PRINCIPAL_CLAIMS},
+        }
+        if self.lifetime_seconds:
+            data['exp'] = datetime.utcnow() + timedelta(
+                seconds=self.lifetime_seconds
+            )
+        return jwt.encode(
+            data, self.encode_key, algorithm=self.algorithm,
+            headers={'kid': self.key_id} if self.key_id else None
+        )
+
+
+class CachedPrincipalJWTStrategy(PrincipalJWTStrategy):
+    """
+    JWT-стратегия, которая не читает пользователя из базы данных
+    на каждый запрос. Если JWT_TRUST_CLAIMS включен, то пользователь
+    восстанавливается из полей токена, и изменения прав вступают
+    в силу только с новым токеном. Иначе пользователь берется из
+    кэша user_principal_cache и читается из базы только при промахе.
+    """
+
+    async def read_token(
+        self,
+        token: Optional[str],
+        user_manager: BaseUserManager[User, int]
+    ) -> Optional[User]:
+        if token is None:
+            return None
+        try:
+            data: dict[str, Any] = decode_jwt(
+                token, self.decode_key, self.token_audience,
+                algorithms=[self.algorithm]
+            )
+            if data.get(USER_ID_CLAIM) is None:
+                return None
+            user_id = user_manager.parse_id(data[USER_ID_CLAIM])
+        except (jwt.PyJWTError, exceptions.InvalidID):
+            return None
+        if settings.jwt_trust_claims and all(
+            claim in data for claim in PRINCIPAL_CLAIMS
+        ):
+            return build_principal({**data, 'id': user_id})
+        user = await user_principal_cache.get(user_id)
+        if user is not None:
+            return user
+        try:
+            user = await user_manager.get(user_id)
+        except exceptions.UserNotExists:
+            return None
+        await user_principal_cache.set(user)
+        return user
+
+
+jwt_strategy = PrincipalJWTStrategy(jwt_signing_keys, JWT_TOKEN_LIFETIME)
+cached_jwt_strategy = CachedPrincipalJWTStrategy(
+    jwt_signing_keys, JWT_TOKEN_LIFETIME
+)
+
+
 def get_jwt_strategy() -> JWTStrategy:
-    return JWTStrategy(settings.secret, lifetime_seconds=JWT_TOKEN_LIFETIME)
+    return jwt_strategy
+
+
+def get_cached_jwt_strategy() -> JWTStrategy:
+    return cached_jwt_strategy
 
 
 auth_backend = AuthenticationBackend(
@@ -46,8 +142,84 @@ auth_backend = AuthenticationBackend(
     get_strategy=get_jwt_strategy
 )
 
+cached_auth_backend = AuthenticationBackend(
+    name=AUTH_BACKEND_NAME,
+    transport=bearer_transport,
+    get_strategy=get_cached_jwt_strategy
+)
+
 
 class UserManager(IntegerIDMixin, BaseUserManager):
+    """
+    Менеджер пользователей, который хеширует и проверяет пароли
+    через password_hashing в пуле, а не в потоке event loop.
+    Методы create и authenticate повторяют одноименные методы
+    BaseUserManager, заменяя только вызовы password_helper, а _update
+    передает базовому методу уже готовый хеш нового пароля
+    и удаляет пользователя из кэша user_principal_cache.
+    """
+
+    async def create(
+        self,
+        user_create: UserCreate,
+        safe: bool = False,
+        request: Optional[Request] = None
+    ) -> User:
+        await self.validate_password(user_create.password, user_create)
+        if await self.user_db.get_by_email(user_create.email) is not None:
+            raise exceptions.UserAlreadyExists()
+        user_dict = (
+            user_create.create_update_dict()
+            if safe
+            else user_create.create_update_dict_superuser()
+        )
+        user_dict['hashed_password'] = await password_hashing.hash(
+            user_dict.pop('password')
+        )
+        created_user = await self.user_db.create(user_dict)
+        await self.on_after_register(created_user, request)
+        return created_user
+
+    async def authenticate(
+        self,
+        credentials: OAuth2PasswordRequestForm
+    ) -> Optional[User]:
+        try:
+            user = await self.get_by_email(credentials.username)
+        except exceptions.UserNotExists:
+            # Хеширование выравнивает время ответа для несуществующих
+            # пользователей и существующих.
+            await password_hashing.hash(credentials.password)
+            return None
+        verified, updated_password_hash = (
+            await password_hashing.verify_and_update(
+                credentials.password, user.hashed_password
+            )
+        )
+        if not verified:
+            return None
+        if updated_password_hash is not None:
+            await self.user_db.update(
+                user, {'hashed_password': updated_password_hash}
+            )
+        return user
+
+    async def _update(self, user: User, update_dict: dict[str, Any]) -> User:
+        """
+        Через _update проходят update, verify и reset_password, поэтому
+        кэш пользователя удаляется здесь, а не в on_after_update.
+        """
+        if 'password' in update_dict:
+            update_dict = update_dict.copy()
+            password = update_dict.pop('password')
+            await self.validate_password(password, user)
+            update_dict['hashed_password'] = await password_hashing.hash(
+                password
+            )
+        updated_user = await super()._update(user, update_dict)
+        await user_principal_cache.invalidate(updated_user.id)
+        return updated_user
+
     async def validate_password(
         self,
         password: str,
@@ -79,5 +251,14 @@ fastapi_users = FastAPIUsers[User, int](
     auth_backends=[auth_backend]
 )
 
-current_user = fastapi_users.current_user(active=True)
-current_superuser = fastapi_users.current_user(active=True, superuser=True)
+# Эндпоинты фонда получают пользователя через кэширующую стратегию.
+# Роуты fastapi-users (/users/me и др.) изменяют пользователя в сессии,
+# поэтому продолжают читать его из базы данных.
+principal_authenticator = Authenticator(
+    [cached_auth_backend], get_user_manager
+)
+
+current_user = principal_authenticator.current_user(active=True)
+current_superuser = principal_authenticator.current_user(
+    active=True, superuser=True
+)
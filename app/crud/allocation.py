@@ -0,0 +1,37 @@
+from sqlalchemy import select
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from app.crud.base import BaseCRUD
+from app.schemas.allocation import AllocationBase
+from app.models.allocation import Allocation
+
+
+class AllocationCRUD(
+    BaseCRUD[Allocation, AllocationBase, AllocationBase]
+):
+    async def get_by_project(
+        self,
+        project_id: int,
+        session: AsyncSession
+    ) -> list[Allocation]:
+        allocations = await session.execute(
+            select(self.model).where(
+                self.model.project_id == project_id
+            ).order_by(self.model.id)
+        )
+        return allocations.scalars().all()
+
+    async def get_by_donation(
+        self,
+        donation_id: int,
+        session: AsyncSession
+    ) -> list[Allocation]:
+        allocations = await session.execute(
+            select(self.model).where(
+                self.model.donation_id == donation_id
+            ).order_by(self.model.id)
+        )
+        return allocations.scalars().all()
+
+
+allocation_crud = AllocationCRUD(Allocation)
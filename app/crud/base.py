@@ -1,9 +1,14 @@
-from typing import Generic, Optional, List, Type, TypeVar
+from datetime import datetime
+from typing import (
+    Any, Dict, Generic, Optional, List, Tuple, Type, TypeVar
+)
 
 from pydantic import BaseModel
 from fastapi.encoders import jsonable_encoder
-from sqlalchemy import select
+from sqlalchemy import exists, insert, select, tuple_
+from sqlalchemy.engine import Row
 from sqlalchemy.ext.asyncio import AsyncSession
+from sqlalchemy.orm import load_only
 
 from app.core.db import Base
 from app.models.user import User
@@ -27,19 +32,93 @@ class BaseCRUD(
         self,
         obj_id: int,
         session: AsyncSession,
+        *columns
     ) -> Optional[ModelType]:
-        db_obj = await session.execute(
-            select(self.model).where(self.model.id == obj_id)
-        )
+        """
+        Возвращает объект по идентификатору. Если переданы columns,
+        то загружаются только эти колонки (load_only), обращение
+        к остальным атрибутам потребует отдельного запроса.
+        """
+        statement = select(self.model).where(self.model.id == obj_id)
+        if columns:
+            statement = statement.options(load_only(*columns))
+        db_obj = await session.execute(statement)
         return db_obj.scalars().first()
 
-    async def get_multi(
+    async def exists(
         self,
+        obj_id: int,
         session: AsyncSession
+    ) -> bool:
+        """Проверяет существование объекта, не читая его колонки."""
+        return await session.scalar(
+            select(exists().where(self.model.id == obj_id))
+        )
+
+    def select_multi(
+        self,
+        *entities,
+        limit: Optional[int] = None,
+        last_key: Optional[Tuple[datetime, int]] = None,
+        descending: bool = False,
+        **filters
+    ):
+        """
+        Строит выборку entities, упорядоченную по (create_date, id),
+        с descending=True - от новых к старым.
+        Для keyset-пагинации передается last_key - ключ последнего
+        объекта предыдущей страницы, тогда выборка начинается сразу
+        после него по индексу, а не пропуском строк через OFFSET.
+        filters - условия равенства колонкам модели, например user_id.
+        """
+        key = tuple_(self.model.create_date, self.model.id)
+        order = (self.model.create_date, self.model.id)
+        if descending:
+            order = tuple(column.desc() for column in order)
+        statement = select(*entities).filter_by(**filters).order_by(*order)
+        if last_key is not None:
+            statement = statement.where(
+                key < last_key if descending else key > last_key
+            )
+        if limit is not None:
+            statement = statement.limit(limit)
+        return statement
+
+    async def get_multi(
+        self,
+        session: AsyncSession,
+        limit: Optional[int] = None,
+        last_key: Optional[Tuple[datetime, int]] = None,
+        **filters
     ) -> List[ModelType]:
-        db_objs = await session.execute(select(self.model))
+        db_objs = await session.execute(self.select_multi(
+            self.model, limit=limit, last_key=last_key, **filters
+        ))
         return db_objs.scalars().all()
 
+    async def get_multi_rows(
+        self,
+        fields: List[str],
+        session: AsyncSession,
+        limit: Optional[int] = None,
+        last_key: Optional[Tuple[datetime, int]] = None,
+        descending: bool = False,
+        **filters
+    ) -> List[Row]:
+        """
+        То же, что get_multi, но выбирает только колонки fields
+        и возвращает строки без создания ORM-объектов.
+        Порядок и условия задаются так же, как в select_multi.
+        """
+        db_rows = await session.execute(self.select_multi(
+            *(getattr(self.model, field) for field in fields),
+            limit=limit,
+            last_key=last_key,
+            descending=descending,
+            **filters
+        ))
+        return db_rows.all()
+
     async def create(
         self,
         obj_in: CreateSchemaType,
@@ -55,20 +134,52 @@ class BaseCRUD(
         await session.refresh(db_obj)
         return db_obj
 
+    async def create_multi(
+        self,
+        objs_in: List[CreateSchemaType],
+        session: AsyncSession,
+        user: Optional[User] = None,
+        commit: bool = True
+    ) -> Dict[str, Any]:
+        """
+        Создает объекты objs_in одним запросом INSERT ... VALUES,
+        без создания ORM-объектов и чтения каждого из них обратно.
+        Все объекты партии получают одну дату создания. Возвращает
+        условия партии (create_date и user_id), по которым get_multi
+        выбирает созданные объекты в порядке вставки.
+        С commit=False фиксирует изменения вызывающий код.
+        """
+        batch = {'create_date': datetime.now()}
+        if user is not None:
+            batch['user_id'] = user.id
+        if objs_in:
+            await session.execute(insert(self.model).values([
+                {**obj_in.dict(), **batch} for obj_in in objs_in
+            ]))
+        if commit:
+            await session.commit()
+        return batch
+
     async def update(
         self,
         db_obj: ModelType,
         obj_in: UpdateSchemaType,
-        session: AsyncSession
+        session: AsyncSession,
+        commit: bool = True
     ) -> ModelType:
+        """
+        Изменяет объект данными obj_in. С commit=False изменения
+        только добавляются в сессию, а фиксирует их вызывающий код.
+        """
         obj_data = jsonable_encoder(db_obj)
         update_data = obj_in.dict(exclude_unset=True)
         for field in obj_data:
             if field in update_data:
                 setattr(db_obj, field, update_data[field])
         session.add(db_obj)
-        await session.commit()
-        await session.refresh(db_obj)
+        if commit:
+            await session.commit()
+            await session.refresh(db_obj)
         return db_obj
 
     async def remove(
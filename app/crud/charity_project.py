@@ -1,7 +1,8 @@
-from typing import Optional
+from typing import Collection, Optional
 
-from sqlalchemy import select, or_
+from sqlalchemy import exists, false, select
 from sqlalchemy.ext.asyncio import AsyncSession
+from sqlalchemy.orm import aliased
 
 from app.crud.base import BaseCRUD
 from app.schemas.charity_project import (
@@ -9,8 +10,6 @@ from app.schemas.charity_project import (
 )
 from app.models.charity_project import CharityProject
 
-MINIMUM_MONEY_VALUE_FOR_CHARITY_PROJECT = 0
-
 
 class CharityProjectCrud(
     BaseCRUD[
@@ -19,34 +18,33 @@ class CharityProjectCrud(
         CharityProjectUpdate
     ]
 ):
-    async def get_closed_or_invested_charity_project(
+    async def get_for_update(
         self,
         project_id: int,
-        is_closed: bool,
-        is_invested: Optional[bool],
-        session: AsyncSession
-    ) -> Optional[CharityProject]:
-        if is_invested is not None:
-            statement = select(self.model).where(
-                self.model.id == project_id,
-                or_(
-                    self.model.fully_invested == is_closed,
-                    (
-                        (
-                            self.model.invested_amount >
-                            MINIMUM_MONEY_VALUE_FOR_CHARITY_PROJECT
-                        ) == is_invested
-                    )
-                )
-            )
+        session: AsyncSession,
+        new_name: Optional[str] = None
+    ) -> tuple[Optional[CharityProject], bool]:
+        """
+        Загружает проект для изменения или удаления одним запросом,
+        блокируя строку через SELECT ... FOR UPDATE там, где это
+        поддерживается. Если передано new_name, то тем же запросом
+        проверяется, занято ли это имя другим проектом.
+        Возвращает проект (или None) и признак занятости имени.
+        """
+        if new_name is None:
+            is_name_taken = false()
         else:
-            statement = select(self.model).where(
-                self.model.id == project_id,
-                self.model.fully_invested == is_closed
+            other_project = aliased(self.model)
+            is_name_taken = exists().where(
+                other_project.name == new_name,
+                other_project.id != project_id
             )
-
-        charity_project = await session.execute(statement)
-        return charity_project.scalars().first()
+        charity_project = await session.execute(
+            select(self.model, is_name_taken).where(
+                self.model.id == project_id
+            ).with_for_update(of=self.model)
+        )
+        return charity_project.first() or (None, False)
 
     async def get_by_name(
         self,
@@ -60,5 +58,43 @@ class CharityProjectCrud(
         )
         return charity_project.scalars().first()
 
+    async def get_id_by_name(
+        self,
+        project_name: str,
+        session: AsyncSession
+    ) -> Optional[int]:
+        return await session.scalar(
+            select(self.model.id).where(self.model.name == project_name)
+        )
+
+    async def get_taken_names(
+        self,
+        project_names: Collection[str],
+        session: AsyncSession
+    ) -> set[str]:
+        """
+        Возвращает имена из project_names, занятые проектами,
+        одним запросом WHERE name IN (...).
+        """
+        if not project_names:
+            return set()
+        taken_names = await session.scalars(
+            select(self.model.name).where(self.model.name.in_(project_names))
+        )
+        return set(taken_names)
+
+    async def get_multi_by_names(
+        self,
+        project_names: Collection[str],
+        session: AsyncSession
+    ) -> list[CharityProject]:
+        """Возвращает проекты с именами project_names в порядке создания."""
+        charity_projects = await session.execute(
+            self.select_multi(self.model).where(
+                self.model.name.in_(project_names)
+            )
+        )
+        return charity_projects.scalars().all()
+
 
 charity_project_crud = CharityProjectCrud(CharityProject)
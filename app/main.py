@@ -2,7 +2,11 @@ from fastapi import FastAPI
 
 from app.core.config import settings
 from app.api.routers import main_router
+from app.core.db import engine, read_engine, warm_up_engine
 from app.core.init_db import create_first_superuser
+from app.core.instrumentation import QueryStatsMiddleware, instrument_engine
+from app.services.investing_worker import investing_worker
+from app.services.password_hashing import password_hashing
 
 app = FastAPI(
     title=settings.app_title,
@@ -11,7 +15,32 @@ app = FastAPI(
 
 app.include_router(main_router)
 
+app.add_middleware(QueryStatsMiddleware)
+
+if settings.sql_instrumentation:
+    instrument_engine(engine)
+    if read_engine is not None:
+        instrument_engine(read_engine)
+
 
 @app.on_event('startup')
 async def startup():
+    if settings.pool_warm_up:
+        await warm_up_engine(engine)
+        if read_engine is not None:
+            await warm_up_engine(read_engine)
     await create_first_superuser()
+    if (
+        settings.investing_in_background and
+        settings.investing_worker_in_process
+    ):
+        await investing_worker.start()
+
+
+@app.on_event('shutdown')
+async def shutdown():
+    await investing_worker.stop()
+    password_hashing.shutdown()
+    await engine.dispose()
+    if read_engine is not None:
+        await read_engine.dispose()
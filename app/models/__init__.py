@@ -1,4 +1,5 @@
 from .base import InvestmentBase # noqa
 from .donation import Donation # noqa
 from .charity_project import CharityProject # noqa
+from .allocation import Allocation # noqa
 from .user import User # noqa
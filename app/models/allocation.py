@@ -0,0 +1,33 @@
+from datetime import datetime
+
+from sqlalchemy import Column, DateTime, ForeignKey, Integer
+from sqlalchemy.schema import CheckConstraint
+
+from app.core.db import Base
+from app.models.base import GREATER_THAN_ZERO_CONSTRAINT_NAME
+
+
+class Allocation(Base):
+    """
+    Запись журнала распределения денег: сколько денег пожертвования
+    donation_id было вложено в проект project_id.
+    Записи только добавляются механизмом инвестирования и никогда
+    не изменяются, поэтому по журналу можно восстановить историю
+    каждого проекта и пожертвования.
+    """
+    __tablename__ = 'allocation'
+    project_id = Column(
+        Integer, ForeignKey('charity_project.id'), nullable=False, index=True
+    )
+    donation_id = Column(
+        Integer, ForeignKey('donation.id'), nullable=False, index=True
+    )
+    amount = Column(Integer, nullable=False)
+    create_date = Column(DateTime(timezone=True), default=datetime.now)
+
+    __table_args__ = (
+        CheckConstraint(
+            'amount > 0',
+            name=GREATER_THAN_ZERO_CONSTRAINT_NAME.format('amount')
+        ),
+    )
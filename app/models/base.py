@@ -1,8 +1,8 @@
 from datetime import datetime
 
-from sqlalchemy import Column, Integer, DateTime, Boolean
+from sqlalchemy import Column, Integer, DateTime, Boolean, Index, text
 from sqlalchemy.schema import CheckConstraint
-from sqlalchemy.orm import validates
+from sqlalchemy.orm import declared_attr, validates
 
 from app.core.db import Base
 
@@ -11,6 +11,38 @@ GREATER_THAN_ZERO_CONSTRAINT_NAME = '{}_greater_than_zero'
 GREATER_THAN_ZERO_CONSTRAINT_ERROR = (
     'Поле {} должно быть больше нуля!'
 )
+OPEN_QUEUE_INDEX_NAME = 'ix_{}_open_queue'
+OPEN_QUEUE_INDEX_COLUMNS = ('fully_invested', 'create_date', 'id')
+OPEN_QUEUE_SQLITE_CONDITION = 'fully_invested = 0'
+OPEN_QUEUE_POSTGRESQL_CONDITION = 'NOT fully_invested'
+CREATION_ORDER_INDEX_NAME = 'ix_{}_create_date_id'
+CREATION_ORDER_INDEX_COLUMNS = ('create_date', 'id')
+
+
+def open_queue_index(table_name: str) -> Index:
+    """
+    Частичный индекс очереди открытых объектов для механизма
+    инвестирования. Условие индекса совпадает с тем, как SQLAlchemy
+    компилирует not_(fully_invested) для каждого бэкенда, иначе
+    планировщик не сможет его использовать.
+    """
+    return Index(
+        OPEN_QUEUE_INDEX_NAME.format(table_name),
+        *OPEN_QUEUE_INDEX_COLUMNS,
+        sqlite_where=text(OPEN_QUEUE_SQLITE_CONDITION),
+        postgresql_where=text(OPEN_QUEUE_POSTGRESQL_CONDITION),
+    )
+
+
+def creation_order_index(table_name: str) -> Index:
+    """
+    Индекс порядка создания (create_date, id), по которому
+    списки отдаются keyset-пагинацией.
+    """
+    return Index(
+        CREATION_ORDER_INDEX_NAME.format(table_name),
+        *CREATION_ORDER_INDEX_COLUMNS,
+    )
 
 
 class InvestmentBase(Base):
@@ -20,6 +52,12 @@ class InvestmentBase(Base):
     invested_amount = Column(Integer, default=DEFAULT_INTEGER)
     create_date = Column(DateTime(timezone=True), default=datetime.now)
     close_date = Column(DateTime(timezone=True), default=datetime.now)
+    version_id = Column(
+        Integer,
+        nullable=False,
+        default=DEFAULT_INTEGER,
+        server_default=str(DEFAULT_INTEGER)
+    )
 
     __table_args__ = (
         CheckConstraint(
@@ -28,6 +66,15 @@ class InvestmentBase(Base):
         ),
     )
 
+    @declared_attr
+    def __mapper_args__(cls):
+        """
+        Версия строки для оптимистичной блокировки: каждый UPDATE
+        через ORM проверяет, что строку никто не изменил после чтения,
+        иначе выбрасывается StaleDataError.
+        """
+        return {'version_id_col': cls.version_id}
+
     @validates('full_amount')
     def validate_name(self, key, full_amount) -> str:
         if full_amount <= 0:
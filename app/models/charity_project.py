@@ -2,7 +2,9 @@ from sqlalchemy import Column, String, Text
 from sqlalchemy.schema import CheckConstraint
 from sqlalchemy.orm import validates
 
-from app.models.base import InvestmentBase
+from app.models.base import (
+    InvestmentBase, creation_order_index, open_queue_index
+)
 
 
 MIN_LENGTH_CONSTRAINT_NAME = '{}_min_length'
@@ -26,6 +28,8 @@ class CharityProject(InvestmentBase):
             MIN_LENGTH_CONSTRAINT_EXPRESSION.format('description'),
             name=MIN_LENGTH_CONSTRAINT_NAME.format('description')
         ),
+        open_queue_index(__tablename__),
+        creation_order_index(__tablename__),
     )
 
     @validates('name')
@@ -1,9 +1,20 @@
-from sqlalchemy import Column, Text, Integer, ForeignKey
+from sqlalchemy import Column, Index, Text, Integer, ForeignKey
 
-from app.models.base import InvestmentBase
+from app.models.base import (
+    InvestmentBase, creation_order_index, open_queue_index
+)
+
+USER_HISTORY_INDEX_NAME = 'ix_donation_user_id_create_date'
+USER_HISTORY_INDEX_COLUMNS = ('user_id', 'create_date', 'id')
 
 
 class Donation(InvestmentBase):
     __tablename__ = 'donation'
     user_id = Column(Integer, ForeignKey('user.id'))
     comment = Column(Text)
+
+    __table_args__ = InvestmentBase.__table_args__ + (
+        open_queue_index(__tablename__),
+        creation_order_index(__tablename__),
+        Index(USER_HISTORY_INDEX_NAME, *USER_HISTORY_INDEX_COLUMNS),
+    )
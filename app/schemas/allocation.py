@@ -0,0 +1,17 @@
+from datetime import datetime
+
+from pydantic import BaseModel, PositiveInt
+
+
+class AllocationBase(BaseModel):
+    project_id: int
+    donation_id: int
+    amount: PositiveInt
+
+    class Config:
+        orm_mode = True
+
+
+class AllocationDB(AllocationBase):
+    id: int
+    create_date: datetime
@@ -0,0 +1,8 @@
+from typing import Any
+
+from pydantic import BaseModel
+
+
+class BulkItemError(BaseModel):
+    index: int
+    errors: list[dict[str, Any]]
@@ -3,6 +3,8 @@ from typing import Optional
 
 from pydantic import BaseModel, Extra, Field, PositiveInt
 
+from app.schemas.bulk import BulkItemError
+
 MIN_STRING_LENGTH = 1
 MAX_STRING_LENGTH = 100
 
@@ -47,3 +49,8 @@ class CharityProjectDB(CharityProjectBase):
     fully_invested: bool
     create_date: datetime = Field(datetime.now())
     close_date: datetime = Field(datetime.now())
+
+
+class CharityProjectBulkResult(BaseModel):
+    created: list[CharityProjectDB]
+    errors: list[BulkItemError]
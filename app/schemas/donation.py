@@ -3,6 +3,8 @@ from typing import Optional
 
 from pydantic import BaseModel, PositiveInt, Field
 
+from app.schemas.bulk import BulkItemError
+
 
 class DonationBase(BaseModel):
     full_amount: PositiveInt = Field(...)
@@ -27,3 +29,8 @@ class DonationDB(DonationBase):
     invested_amount: int
     fully_invested: bool
     close_date: datetime
+
+
+class DonationBulkResult(BaseModel):
+    created: list[DonationDB]
+    errors: list[BulkItemError]
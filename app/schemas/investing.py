@@ -0,0 +1,9 @@
+from pydantic import BaseModel
+
+
+class InvestingStats(BaseModel):
+    requests_count: int
+    runs_count: int
+    merged_count: int
+    worker_notifications_count: int
+    worker_passes_count: int
@@ -0,0 +1,92 @@
+import hashlib
+import json
+from typing import NamedTuple, Optional
+from uuid import uuid4
+
+from app.core.cache import CacheBackend, cache_backend
+from app.schemas.charity_project import CharityProjectDB
+from app.services.serialization import dump_rows, schema_fields
+
+CACHE_VERSION_KEY = 'charity_project:version'
+CACHE_LIST_PAGE_KEY = 'charity_project:{}:list:{}:{}'
+PAGE_HEADER_SEPARATOR = b'\n'
+CHARITY_PROJECT_FIELDS = schema_fields(CharityProjectDB)
+
+
+class CachedPage(NamedTuple):
+    """Сериализованная страница списка проектов и ее заголовки."""
+    body: bytes
+    etag: str
+    next_cursor: Optional[str]
+
+    @classmethod
+    def render(
+        cls,
+        rows: list[tuple],
+        next_cursor: Optional[str]
+    ) -> 'CachedPage':
+        """
+        Сериализует строки с полями CHARITY_PROJECT_FIELDS
+        быстрым путем и вычисляет ETag по телу и курсору.
+        """
+        body = dump_rows(CHARITY_PROJECT_FIELDS, rows)
+        digest = hashlib.blake2b(body, digest_size=16)
+        digest.update((next_cursor or '').encode())
+        return cls(body, f'"{digest.hexdigest()}"', next_cursor)
+
+    def dumps(self) -> bytes:
+        header = json.dumps([self.etag, self.next_cursor]).encode()
+        return header + PAGE_HEADER_SEPARATOR + self.body
+
+    @classmethod
+    def loads(cls, value: bytes) -> 'CachedPage':
+        header, body = value.split(PAGE_HEADER_SEPARATOR, 1)
+        etag, next_cursor = json.loads(header)
+        return cls(body, etag, next_cursor)
+
+
+class CharityProjectCache:
+    """
+    Кэш публичного списка проектов поверх хранилища backend.
+    Ключи страниц содержат версию, хранящуюся в самом кэше.
+    Инвалидация заменяет версию новым случайным значением, поэтому
+    одним SET становятся недоступны все страницы, включая ту,
+    которую параллельный запрос прочитал из базы до изменения
+    и сохранит под старой версией. Потеря ключа версии при
+    вытеснении так же безопасна: будет выбрана новая версия.
+    """
+
+    def __init__(self, backend: CacheBackend):
+        self.backend = backend
+
+    async def get_version(self) -> str:
+        version = await self.backend.get(CACHE_VERSION_KEY)
+        if version is None:
+            version = uuid4().hex.encode()
+            await self.backend.set(CACHE_VERSION_KEY, version)
+        return version.decode()
+
+    async def get_list_page(
+        self,
+        limit: int,
+        cursor: Optional[str]
+    ) -> tuple[str, Optional[CachedPage]]:
+        """
+        Возвращает ключ страницы списка и саму страницу,
+        если она есть в кэше.
+        """
+        key = CACHE_LIST_PAGE_KEY.format(
+            await self.get_version(), limit, cursor or ''
+        )
+        value = await self.backend.get(key)
+        return key, None if value is None else CachedPage.loads(value)
+
+    async def set_list_page(self, key: str, page: CachedPage) -> None:
+        await self.backend.set(key, page.dumps())
+
+    async def invalidate(self) -> None:
+        """Делает недоступными все закэшированные страницы проектов."""
+        await self.backend.set(CACHE_VERSION_KEY, uuid4().hex.encode())
+
+
+charity_project_cache = CharityProjectCache(cache_backend)
@@ -0,0 +1,103 @@
+import csv
+import io
+import json
+from enum import Enum
+from typing import AsyncIterator
+
+from fastapi.responses import StreamingResponse
+from pydantic import BaseModel
+from sqlalchemy import select
+from sqlalchemy.ext.asyncio import AsyncSession
+
+EXPORT_PARTITION_SIZE = 1000
+EXPORT_CONTENT_DISPOSITION = 'attachment; filename="{}.{}"'
+
+
+class ExportFormat(str, Enum):
+    ndjson = 'ndjson'
+    csv = 'csv'
+
+
+EXPORT_MEDIA_TYPES = {
+    ExportFormat.ndjson: 'application/x-ndjson',
+    ExportFormat.csv: 'text/csv',
+}
+
+
+def serialize_value(value) -> object:
+    """Приводит дату к ISO 8601, остальные значения не меняет."""
+    return value.isoformat() if hasattr(value, 'isoformat') else value
+
+
+def render_ndjson(fields: list[str], rows: list) -> str:
+    """Возвращает порцию строк в формате NDJSON: объект JSON на строку."""
+    return ''.join(
+        json.dumps(
+            dict(zip(fields, map(serialize_value, row))),
+            ensure_ascii=False
+        ) + '\n'
+        for row in rows
+    )
+
+
+def render_csv(rows: list) -> str:
+    """Возвращает порцию строк в формате CSV."""
+    buffer = io.StringIO()
+    csv.writer(buffer).writerows(
+        [serialize_value(value) for value in row] for row in rows
+    )
+    return buffer.getvalue()
+
+
+async def iterate_export_chunks(
+    session: AsyncSession,
+    model,
+    fields: list[str],
+    export_format: ExportFormat
+) -> AsyncIterator[str]:
+    """
+    Асинхронный генератор выгрузки таблицы model.
+    Строки читаются через session.stream() серверным курсором
+    порциями по EXPORT_PARTITION_SIZE только нужными колонками,
+    без создания ORM-объектов, и каждая порция сразу отдается
+    клиенту. Поэтому потребление памяти не зависит от размера таблицы.
+    """
+    if export_format == ExportFormat.csv:
+        yield render_csv([fields])
+    result = await session.stream(
+        select(*(getattr(model, field) for field in fields)).order_by(
+            model.create_date, model.id
+        ).execution_options(yield_per=EXPORT_PARTITION_SIZE)
+    )
+    try:
+        async for rows in result.partitions(EXPORT_PARTITION_SIZE):
+            if export_format == ExportFormat.csv:
+                yield render_csv(rows)
+            else:
+                yield render_ndjson(fields, rows)
+    finally:
+        await result.close()
+
+
+def export_response(
+    session: AsyncSession,
+    model,
+    schema: type[BaseModel],
+    export_format: ExportFormat
+) -> StreamingResponse:
+    """
+    Возвращает потоковый ответ с выгрузкой таблицы model.
+    Набор и порядок полей берутся из схемы ответа schema,
+    чтобы выгрузка совпадала с JSON API.
+    """
+    return StreamingResponse(
+        iterate_export_chunks(
+            session, model, list(schema.__fields__), export_format
+        ),
+        media_type=EXPORT_MEDIA_TYPES[export_format],
+        headers={
+            'Content-Disposition': EXPORT_CONTENT_DISPOSITION.format(
+                model.__tablename__, export_format.value
+            )
+        }
+    )
@@ -0,0 +1,72 @@
+import asyncio
+from typing import Optional
+
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from app.services.money_transaction import (
+    TransactionInvesting, transaction_mechanism
+)
+
+
+class SingleFlightInvesting:
+    """
+    Координатор запусков механизма инвестирования.
+    Одновременно выполняется не больше одного прохода. Запрос,
+    пришедший во время прохода, не запускает свой, а становится
+    ведущим следующего прохода: тот начнется после текущего и увидит
+    все закоммиченные к этому моменту объекты. Остальные запросы,
+    пришедшие до его начала, присоединяются к нему и просто ждут
+    его завершения. Так N одновременных запросов дают не больше
+    двух проходов вместо N.
+    Если ведущий следующего прохода отменен, пока ждет текущий, или
+    его проход завершился ошибкой, то присоединившиеся к нему запросы
+    выбирают нового ведущего и выполняют проход заново.
+    """
+
+    def __init__(self, mechanism: TransactionInvesting):
+        self.mechanism = mechanism
+        self.requests_count = 0
+        self.runs_count = 0
+        self.merged_count = 0
+        self._running: Optional[asyncio.Future] = None
+        self._pending: Optional[asyncio.Future] = None
+
+    async def launch_investing_proccess(self, session: AsyncSession) -> None:
+        """
+        Запускает проход инвестирования в сессии session или
+        присоединяет запрос к ближайшему еще не начатому проходу.
+        """
+        self.requests_count += 1
+        while self._pending is not None:
+            if await asyncio.shield(self._pending):
+                self.merged_count += 1
+                return
+        loop = asyncio.get_running_loop()
+        if self._running is None:
+            self._running = loop.create_future()
+        else:
+            pending = self._pending = loop.create_future()
+            try:
+                await asyncio.wait({self._running})
+            except asyncio.CancelledError:
+                # Проход не выполнен: присоединившиеся запросы
+                # получают False и выбирают нового ведущего.
+                self._pending = None
+                pending.set_result(False)
+                raise
+            self._running, self._pending = pending, None
+        await self._run(session)
+
+    async def _run(self, session: AsyncSession) -> None:
+        future = self._running
+        succeeded = False
+        try:
+            await self.mechanism.launch_investing_with_retry(session)
+            succeeded = True
+        finally:
+            self.runs_count += 1
+            self._running = None
+            future.set_result(succeeded)
+
+
+investing_coordinator = SingleFlightInvesting(transaction_mechanism)
@@ -0,0 +1,117 @@
+import time
+from contextvars import ContextVar
+from functools import wraps
+from typing import Optional
+
+from app.core.metrics import registry
+
+EARLY_EXIT_NO_CHARITY_PROJECTS = 'no_charity_projects'
+EARLY_EXIT_NO_DONATIONS = 'no_donations'
+ROWS_BUCKETS = (1, 10, 100, 1000, 10000, 100000)
+AMOUNT_BUCKETS = (10, 100, 1000, 10000, 100000, 1000000)
+
+investing_run_duration_seconds = registry.histogram(
+    'investing_run_duration_seconds',
+    'Длительность прохода инвестирования.',
+    labelnames=('engine',)
+)
+investing_rows_loaded = registry.histogram(
+    'investing_rows_loaded',
+    'Число объектов очереди, загруженных за проход инвестирования.',
+    labelnames=('engine', 'queue'),
+    buckets=ROWS_BUCKETS
+)
+investing_rows_closed_total = registry.counter(
+    'investing_rows_closed_total',
+    'Число объектов, закрытых проходами инвестирования.',
+    labelnames=('engine', 'queue')
+)
+investing_amount_transferred = registry.histogram(
+    'investing_amount_transferred',
+    'Сумма, переведенная за проход инвестирования.',
+    labelnames=('engine',),
+    buckets=AMOUNT_BUCKETS
+)
+investing_commit_duration_seconds = registry.histogram(
+    'investing_commit_duration_seconds',
+    'Длительность commit прохода инвестирования.',
+    labelnames=('engine',)
+)
+investing_early_exits_total = registry.counter(
+    'investing_early_exits_total',
+    'Число проходов инвестирования, завершенных без перевода денег.',
+    labelnames=('engine', 'reason')
+)
+investing_retries_total = registry.counter(
+    'investing_retries_total',
+    'Число повторов прохода инвестирования после конфликта.',
+    labelnames=('engine',)
+)
+
+
+class InvestingRun:
+    """
+    Статистика одного прохода инвестирования. Собирается
+    механизмом во время прохода и записывается в метрики
+    по его завершении.
+    """
+
+    def __init__(self, engine: str):
+        self.engine = engine
+        self.rows_loaded: dict[str, int] = {}
+        self.rows_closed: dict[str, int] = {}
+        self.commit_duration: Optional[float] = None
+        self.early_exit_reason: Optional[str] = None
+
+    def observe_loaded(self, queue: str, count: int) -> None:
+        self.rows_loaded[queue] = self.rows_loaded.get(queue, 0) + count
+
+    def observe_closed(self, queue: str, count: int = 1) -> None:
+        self.rows_closed[queue] = self.rows_closed.get(queue, 0) + count
+
+    def finish(self, amount: int, duration: float) -> None:
+        investing_run_duration_seconds.observe(duration, engine=self.engine)
+        for queue, count in self.rows_loaded.items():
+            investing_rows_loaded.observe(
+                count, engine=self.engine, queue=queue
+            )
+        for queue, count in self.rows_closed.items():
+            investing_rows_closed_total.inc(
+                count, engine=self.engine, queue=queue
+            )
+        if self.commit_duration is not None:
+            investing_commit_duration_seconds.observe(
+                self.commit_duration, engine=self.engine
+            )
+        if self.early_exit_reason is not None:
+            investing_early_exits_total.inc(
+                engine=self.engine, reason=self.early_exit_reason
+            )
+        else:
+            investing_amount_transferred.observe(amount, engine=self.engine)
+
+
+current_investing_run: ContextVar[Optional[InvestingRun]] = ContextVar(
+    'current_investing_run', default=None
+)
+
+
+def observe_investing_run(launch_investing_proccess):
+    """
+    Декоратор метода launch_investing_proccess механизма
+    инвестирования: делает статистику прохода доступной механизму
+    через current_investing_run и записывает ее в метрики, если
+    проход завершился без исключения.
+    """
+    @wraps(launch_investing_proccess)
+    async def wrapper(self, session) -> int:
+        run = InvestingRun(self.name)
+        token = current_investing_run.set(run)
+        started = time.perf_counter()
+        try:
+            amount = await launch_investing_proccess(self, session)
+        finally:
+            current_investing_run.reset(token)
+        run.finish(amount, time.perf_counter() - started)
+        return amount
+    return wrapper
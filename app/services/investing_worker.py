@@ -0,0 +1,138 @@
+import asyncio
+import logging
+from typing import Optional
+
+from sqlalchemy.ext.asyncio import AsyncSession
+from sqlalchemy.orm import sessionmaker
+
+from app.core.config import settings
+from app.core.db import AsyncSessionLocal
+from app.services.investing_coordinator import investing_coordinator
+from app.services.money_transaction import (
+    TransactionInvesting, transaction_mechanism
+)
+
+INVESTING_PASS_ERROR = 'Фоновый проход инвестирования завершился ошибкой!'
+INVESTING_PASS_RETRY_DELAY = 1.0
+
+
+class InvestingWorker:
+    """
+    Фоновый воркер инвестирования.
+    Эндпоинты только сообщают ему о новых объектах методом notify,
+    а воркер сам запускает проходы механизма инвестирования.
+    Уведомления, пришедшие во время ожидания batch_delay или во время
+    прохода, объединяются в один следующий проход. Проходы выполняются
+    строго последовательно, поэтому не конкурируют друг с другом.
+    Если указан poll_interval, проход запускается и без уведомлений
+    не реже раза в poll_interval секунд. Проход, завершившийся
+    ошибкой, повторяется через retry_delay секунд без нового
+    уведомления.
+    """
+
+    def __init__(
+        self,
+        mechanism: TransactionInvesting,
+        session_factory: sessionmaker,
+        batch_delay: float = settings.investing_batch_delay,
+        poll_interval: Optional[float] = settings.investing_poll_interval,
+        retry_delay: float = INVESTING_PASS_RETRY_DELAY,
+    ):
+        self.mechanism = mechanism
+        self.session_factory = session_factory
+        self.batch_delay = batch_delay
+        self.poll_interval = poll_interval
+        self.retry_delay = retry_delay
+        self.notifications_count = 0
+        self.passes_count = 0
+        self._has_changes = False
+        self._is_stopping = False
+        self._wakeup: Optional[asyncio.Event] = None
+        self._task: Optional[asyncio.Task] = None
+
+    def notify(self) -> None:
+        """Сообщает воркеру, что в очередях появились новые объекты."""
+        self.notifications_count += 1
+        self._has_changes = True
+        if self._wakeup is not None:
+            self._wakeup.set()
+
+    async def run_pass(self) -> bool:
+        """
+        Выполняет один проход инвестирования в отдельной сессии.
+        Возвращает False, если проход завершился ошибкой.
+        """
+        self.passes_count += 1
+        try:
+            async with self.session_factory() as session:
+                await self.mechanism.launch_investing_with_retry(session)
+        except Exception:
+            logging.exception(INVESTING_PASS_ERROR)
+            return False
+        return True
+
+    async def run_forever(self) -> None:
+        """
+        Основной цикл воркера. Первый проход запускается сразу, чтобы
+        распределить объекты, созданные, пока воркер не работал.
+        Завершается после вызова stop, предварительно обработав
+        все полученные уведомления. После stop проход, завершившийся
+        ошибкой, не повторяется.
+        """
+        self._wakeup = asyncio.Event()
+        self._wakeup.set()
+        self._has_changes = True
+        while True:
+            try:
+                await asyncio.wait_for(
+                    self._wakeup.wait(), timeout=self.poll_interval
+                )
+            except asyncio.TimeoutError:
+                self._has_changes = True
+            self._wakeup.clear()
+            if self._has_changes:
+                if not self._is_stopping:
+                    await asyncio.sleep(self.batch_delay)
+                self._has_changes = False
+                if not await self.run_pass() and not self._is_stopping:
+                    # Пауза перед повтором, чтобы постоянная ошибка
+                    # не превращала цикл в непрерывные проходы.
+                    await asyncio.sleep(self.retry_delay)
+                    self._has_changes = True
+                    self._wakeup.set()
+            if self._is_stopping and not self._has_changes:
+                return
+
+    async def start(self) -> None:
+        """Запускает воркер задачей в текущем цикле событий."""
+        self._is_stopping = False
+        self._task = asyncio.create_task(self.run_forever())
+        await asyncio.sleep(0)
+
+    async def stop(self) -> None:
+        """Останавливает воркер, дождавшись последнего прохода."""
+        if self._task is None:
+            return
+        self._is_stopping = True
+        self._wakeup.set()
+        await self._task
+        self._task = None
+
+
+investing_worker = InvestingWorker(transaction_mechanism, AsyncSessionLocal)
+
+
+async def launch_investing(session: AsyncSession, *objects) -> None:
+    """
+    Распределяет деньги после создания объектов.
+    В фоновом режиме только уведомляет воркер, и ответ отдается
+    сразу после вставки. Иначе проводит инвестирование через
+    координатор одновременных запусков и обновляет переданные
+    объекты из базы данных.
+    """
+    if settings.investing_in_background:
+        investing_worker.notify()
+        return
+    await investing_coordinator.launch_investing_proccess(session)
+    for obj in objects:
+        await session.refresh(obj)
@@ -1,13 +1,83 @@
+import time
 from datetime import datetime
+from typing import AsyncIterator, Optional
 
-from sqlalchemy import select, not_
+from sqlalchemy import (
+    bindparam, case, false, func, insert, select, not_, tuple_, update
+)
+from sqlalchemy.engine import Row
+from sqlalchemy.exc import OperationalError
 from sqlalchemy.ext.asyncio import AsyncSession
+from sqlalchemy.orm.exc import StaleDataError
 
+from app.core.config import settings
+from app.models.allocation import Allocation
+from app.models.base import InvestmentBase
 from app.models.charity_project import CharityProject
 from app.models.donation import Donation
+from app.services.charity_project_cache import charity_project_cache
+from app.services.investing_metrics import (
+    EARLY_EXIT_NO_CHARITY_PROJECTS, EARLY_EXIT_NO_DONATIONS,
+    current_investing_run, investing_retries_total, observe_investing_run
+)
+
+INVESTING_RETRY_ERRORS = (StaleDataError, OperationalError)
+STALE_QUEUE_ERROR = (
+    'Очередь {} была изменена параллельным проходом инвестирования!'
+)
+
+
+def select_open_queue(model, *entities):
+    """
+    Выборка открытых объектов очереди model (по умолчанию - самих
+    объектов) с блокировкой строк SELECT ... FOR UPDATE там, где это
+    поддерживается. Блокировка ожидающая, без SKIP LOCKED: пропустив
+    заблокированные головы очереди, проход увидел бы пустую очередь
+    или нарушил бы порядок FIFO. Поэтому параллельные проходы
+    выполняются по очереди, и следующий видит результат предыдущего.
+    """
+    return select(*(entities or (model,))).where(
+        not_(model.fully_invested)
+    ).with_for_update()
 
 
 class TransactionInvesting:
+    name = 'two_pointers'
+
+    @staticmethod
+    def observe_loaded(model, count: int) -> None:
+        """Учитывает в статистике прохода загруженные объекты очереди."""
+        run = current_investing_run.get()
+        if run is not None:
+            run.observe_loaded(model.__tablename__, count)
+
+    @staticmethod
+    def observe_closed(model, count: int = 1) -> None:
+        """Учитывает в статистике прохода закрытые объекты очереди."""
+        run = current_investing_run.get()
+        if run is not None:
+            run.observe_closed(model.__tablename__, count)
+
+    @staticmethod
+    def exit_early(reason: str) -> int:
+        """
+        Отмечает в статистике прохода, что он завершился без перевода
+        денег по причине reason, и возвращает переведенную сумму 0.
+        """
+        run = current_investing_run.get()
+        if run is not None:
+            run.early_exit_reason = reason
+        return 0
+
+    @staticmethod
+    async def commit(session: AsyncSession) -> None:
+        """Фиксирует проход, учитывая длительность commit."""
+        started = time.perf_counter()
+        await session.commit()
+        run = current_investing_run.get()
+        if run is not None:
+            run.commit_duration = time.perf_counter() - started
+
     async def get_all_available_objects(
         self,
         model,
@@ -16,34 +86,30 @@ class TransactionInvesting:
         """
         Функция находит все доступные объекты из базы данных
         и возвращает их, упорядочив по дате(от старых к новым),
+        а объекты с одной датой - по идентификатору,
         если таковые имеются. В противном случае
         будет возвращен пустой список.
         Под "доступным" подразумевается - объект со
         значением False у поля fully_invested.
+        Строки блокируются выборкой select_open_queue.
         """
         available_objects = await session.execute(
-            select(model).where(
-                not_(model.fully_invested)
-            ).order_by(model.create_date)
+            select_open_queue(model).order_by(model.create_date, model.id)
         )
         available_objects = available_objects.scalars().all()
+        self.observe_loaded(model, len(available_objects))
         return available_objects
 
-    async def recalculate_project_status(
-        self,
-        project: CharityProject,
-        session: AsyncSession
-    ) -> None:
+    def recalculate_project_status(self, project: CharityProject) -> None:
         """"
         Проводит проверку того, что после редактирования проекта,
         его необходимая сумма не набрана. Если сумма набранна, то
         проект закрывается, в проитвном случае ничего не происходит.
+        Изменения фиксирует вызывающий код.
         """
         if project.full_amount == project.invested_amount:
             project.fully_invested = True
             project.close_date = datetime.now()
-            session.add(project)
-            await session.commit()
 
     def note_object_as_closed(self, instance) -> None:
         """
@@ -55,50 +121,142 @@ class TransactionInvesting:
         instance.invested_amount = instance.full_amount
         instance.fully_invested = True
         instance.close_date = datetime.now()
+        self.observe_closed(type(instance))
+
+    @staticmethod
+    def build_allocation(
+        project_id: int,
+        donation_id: int,
+        amount: int,
+        create_date: datetime
+    ) -> dict:
+        """Возвращает параметры записи журнала распределения."""
+        return {
+            'project_id': project_id,
+            'donation_id': donation_id,
+            'amount': amount,
+            'create_date': create_date,
+        }
 
-    async def launch_investing_proccess(self, session: AsyncSession) -> None:
+    async def record_allocations(
+        self,
+        allocations: list[dict],
+        session: AsyncSession
+    ) -> None:
         """
-        Проводит процесс транзакции для начисления денег с
-        доступных пожертвований в проекты.
-        Использует алгоритм "Двух указателей", чтобы выполнить
-        необходимые расчеты.
-        Логика работы:
-        open_charity_projects - список всех доступных проектов, если он пуст,
-            то функция прерывается.
-        available_donations - списко доступных пожертвований, если список пуст,
-            то функция прерывается.
-        project_index и donation_index служат указателями на текущий эелемент
-            в списках по своему названию соответственно.
-        Далее запускаем цикл, пока не переберем все доступные проекты
-            или пожертвования. В теле цикла инициализируем переменные:
-        current_project и current_donation извлекают экземпляр модели из списка
-            по индексам
+        Записывает переводы прохода в журнал распределения
+        одним пакетным INSERT в той же транзакции, что и изменение
+        сумм, поэтому журнал всегда согласован со счетчиками.
+        """
+        if allocations:
+            await session.execute(insert(Allocation), allocations)
+
+    async def launch_investing_with_retry(
+        self,
+        session: AsyncSession,
+        attempts: int = settings.investing_retry_attempts
+    ) -> int:
+        """
+        Запускает launch_investing_proccess и повторяет его, если
+        параллельный проход успел изменить те же объекты (проверка
+        версии строк выбросила StaleDataError) или база данных
+        оказалась заблокирована. Перед повтором транзакция
+        откатывается, поэтому очереди будут перечитаны.
+        Если проход перевел деньги, то кэш списка проектов
+        инвалидируется. Возвращает переведенную сумму.
+        Проход выполняется хотя бы один раз, даже если attempts
+        меньше единицы.
+        """
+        attempts = max(attempts, 1)
+        for attempt in range(1, attempts + 1):
+            try:
+                amount = await self.launch_investing_proccess(session)
+                break
+            except INVESTING_RETRY_ERRORS:
+                await session.rollback()
+                investing_retries_total.inc(engine=self.name)
+                if attempt == attempts:
+                    raise
+        if amount:
+            await charity_project_cache.invalidate()
+        return amount
+
+    def transfer_money(
+        self,
+        project: CharityProject,
+        donation: Donation
+    ) -> int:
+        """
+        Переводит деньги из пожертвования в проект и возвращает
+        переведенную сумму.
         needed_project_amount - означает, сколько денег необходимо,
             чтобы набрать необходимую сумму для проекта.
         actual_donation_amount - означает, сколько денег доступно с текущего
             пожертвования
         Возможны 3 варианта в дереве принятия решений:
-        - 1-ый) actual_donation_amount больше actual_donation_amount:
-           Перерасчитываем остаток доступных денег с пожертвования;
+        - 1-ый) actual_donation_amount больше needed_project_amount:
+            Перерасчитываем остаток доступных денег с пожертвования;
             Устанавливаем проекту необходимую сумму;
             Помечаем проект, как, закрытый и устанавливаем
             время закрытия функцией datetime.now();
-            Увеличиваем project_index на 1;
-        - 2-ой) actual_donation_amount равна actual_donation_amount:
+        - 2-ой) actual_donation_amount равна needed_project_amount:
             Устанавливаем пожертвование, как полностью потраченное
                 и закрываем его, устанавливаем при этом время закрытия;
             Устанавливаем проект, как закрытый и помечаем соответсвующее поле,
                 указываем время закрытия;
-            Увеличиваем project_index и donation_index на 1;
-        - 3-ий) actual_donation_amount меньше actual_donation_amount:
+        - 3-ий) actual_donation_amount меньше needed_project_amount:
             Устанавливаем пожертвование, как полностью потраченное
                 и закрываем его, устанавливаем при этом время закрытия;
             Перерасчитываем необходмую сумму для проекта;
-            Увеличивем donation_index на 1;
+        """
+        needed_project_amount = project.full_amount - project.invested_amount
+        actual_donation_amount = (
+            donation.full_amount - donation.invested_amount
+        )
+        if actual_donation_amount > needed_project_amount:
+            donation.invested_amount += needed_project_amount
+
+            self.note_object_as_closed(project)
+
+            return needed_project_amount
+        if actual_donation_amount == needed_project_amount:
+            self.note_object_as_closed(donation)
+
+            self.note_object_as_closed(project)
+
+            return needed_project_amount
+        project.invested_amount += actual_donation_amount
+
+        self.note_object_as_closed(donation)
+
+        return actual_donation_amount
+
+    @observe_investing_run
+    async def launch_investing_proccess(self, session: AsyncSession) -> int:
+        """
+        Проводит процесс транзакции для начисления денег с
+        доступных пожертвований в проекты.
+        Использует алгоритм "Двух указателей", чтобы выполнить
+        необходимые расчеты.
+        Логика работы:
+        open_charity_projects - список всех доступных проектов, если он пуст,
+            то функция прерывается.
+        available_donations - списко доступных пожертвований, если список пуст,
+            то функция прерывается.
+        project_index и donation_index служат указателями на текущий эелемент
+            в списках по своему названию соответственно.
+        Далее запускаем цикл, пока не переберем все доступные проекты
+            или пожертвования. В теле цикла current_project и current_donation
+            извлекают экземпляр модели из списка по индексам, а метод
+            transfer_money переводит деньги между ними.
+        Закрытый после перевода проект сдвигает project_index на 1,
+            закрытое пожертвование - donation_index на 1.
         В конце каждой итерации добавляем current_project и current_donation
-        в индекс базы данных методом session.add(obj)
-        После конца цикла закрепляем изменения в базе данных,
-            методом session.commit()
+        в индекс базы данных методом session.add(obj), а перевод -
+        в список allocations для журнала распределения.
+        После конца цикла записываем журнал и закрепляем изменения
+            в базе данных, методом session.commit()
+        Возвращает сумму, переведенную за проход.
 
         Асимптотическая сложность алгоритма O(N + M), где
             N - размер списка с доступными проектами,
@@ -109,16 +267,18 @@ class TransactionInvesting:
             CharityProject, session
         )
         if not open_charity_projects:
-            return
+            return self.exit_early(EARLY_EXIT_NO_CHARITY_PROJECTS)
 
         available_donations = await self.get_all_available_objects(
             Donation, session
         )
         if not available_donations:
-            return
+            return self.exit_early(EARLY_EXIT_NO_DONATIONS)
 
         project_index = 0
         donation_index = 0
+        allocations = []
+        create_date = datetime.now()
         while (
             project_index < len(open_charity_projects) and
             donation_index < len(available_donations)
@@ -126,36 +286,509 @@ class TransactionInvesting:
             current_project: CharityProject = (
                 open_charity_projects[project_index]
             )
-            needed_project_amount = (
-                current_project.full_amount - current_project.invested_amount
-            )
             current_donation: Donation = available_donations[donation_index]
-            actual_donation_amount = (
-                current_donation.full_amount - current_donation.invested_amount
+            amount = self.transfer_money(current_project, current_donation)
+            if amount:
+                allocations.append(self.build_allocation(
+                    current_project.id, current_donation.id,
+                    amount, create_date
+                ))
+            if current_project.fully_invested:
+                project_index += 1
+            if current_donation.fully_invested:
+                donation_index += 1
+
+            session.add(current_donation)
+            session.add(current_project)
+        await self.record_allocations(allocations, session)
+        await self.commit(session)
+        return sum(allocation['amount'] for allocation in allocations)
+
+
+class IncrementalTransactionInvesting(TransactionInvesting):
+    """
+    Инкрементальный механизм инвестирования.
+    Вместо загрузки всех открытых проектов и пожертвований
+    читает очереди порциями по chunk_size объектов, используя
+    keyset-пагинацию по (create_date, id). Чтение прекращается,
+    как только одна из очередей исчерпана, поэтому стоимость
+    запуска зависит от суммы перевода, а не от размера очередей.
+    """
+
+    name = 'incremental'
+
+    def __init__(self, chunk_size: int = settings.investing_chunk_size):
+        self.chunk_size = chunk_size
+
+    async def iterate_available_objects(
+        self,
+        model,
+        session: AsyncSession
+    ) -> AsyncIterator[InvestmentBase]:
+        """
+        Асинхронный генератор доступных объектов, упорядоченных
+        от старых к новым. Каждая следующая порция запрашивается
+        только тогда, когда предыдущая полностью перебрана.
+        """
+        last_key = None
+        while True:
+            statement = select_open_queue(model)
+            if last_key is not None:
+                statement = statement.where(
+                    tuple_(model.create_date, model.id) > last_key
+                )
+            chunk = await session.execute(
+                statement.order_by(
+                    model.create_date, model.id
+                ).limit(self.chunk_size)
             )
-            if actual_donation_amount > needed_project_amount:
-                current_donation.invested_amount += needed_project_amount
+            chunk = chunk.scalars().all()
+            self.observe_loaded(model, len(chunk))
+            for instance in chunk:
+                yield instance
+            if len(chunk) < self.chunk_size:
+                return
+            last_key = (chunk[-1].create_date, chunk[-1].id)
 
-                self.note_object_as_closed(current_project)
+    @staticmethod
+    async def get_next_object(
+        objects: AsyncIterator[InvestmentBase]
+    ) -> Optional[InvestmentBase]:
+        """Возвращает следующий объект очереди или None, если она пуста."""
+        try:
+            return await objects.__anext__()
+        except StopAsyncIteration:
+            return None
 
-                project_index += 1
-            elif actual_donation_amount == needed_project_amount:
-                self.note_object_as_closed(current_donation)
+    @observe_investing_run
+    async def launch_investing_proccess(self, session: AsyncSession) -> int:
+        """
+        Проводит тот же процесс транзакции, что и базовый механизм,
+        но с ленивым чтением очередей.
+        После каждой сохраненной операции открытой остается только одна
+        из очередей, поэтому новый объект распределяется по голове
+        противоположной очереди и цикл завершается, как только
+        он будет полностью распределен.
+        """
+        charity_projects = self.iterate_available_objects(
+            CharityProject, session
+        )
+        donations = self.iterate_available_objects(Donation, session)
+        current_project = await self.get_next_object(charity_projects)
+        if current_project is None:
+            return self.exit_early(EARLY_EXIT_NO_CHARITY_PROJECTS)
+        current_donation = await self.get_next_object(donations)
+        is_changed = False
+        allocations = []
+        create_date = datetime.now()
+        try:
+            while (
+                current_project is not None and current_donation is not None
+            ):
+                amount = self.transfer_money(current_project, current_donation)
+                session.add(current_donation)
+                session.add(current_project)
+                is_changed = True
+                if amount:
+                    allocations.append(self.build_allocation(
+                        current_project.id, current_donation.id,
+                        amount, create_date
+                    ))
+                if current_project.fully_invested:
+                    current_project = await self.get_next_object(
+                        charity_projects
+                    )
+                if current_donation.fully_invested:
+                    current_donation = await self.get_next_object(donations)
+        finally:
+            await charity_projects.aclose()
+            await donations.aclose()
+        if not is_changed:
+            return self.exit_early(EARLY_EXIT_NO_DONATIONS)
+        await self.record_allocations(allocations, session)
+        await self.commit(session)
+        return sum(allocation['amount'] for allocation in allocations)
 
-                self.note_object_as_closed(current_project)
 
-                project_index += 1
-                donation_index += 1
-            else:
-                current_project.invested_amount += actual_donation_amount
+class BulkTransactionInvesting(TransactionInvesting):
+    """
+    Механизм инвестирования с пакетным обновлением.
+    Очереди читаются только нужными колонками, без создания
+    ORM-объектов, распределение считается по префиксным суммам,
+    а результат записывается несколькими UPDATE ... WHERE id IN (...),
+    поэтому число обращений к базе не зависит от числа закрытых объектов.
+    """
 
-                self.note_object_as_closed(current_donation)
+    name = 'bulk'
 
-                donation_index += 1
+    async def get_available_rows(
+        self,
+        model,
+        session: AsyncSession
+    ) -> list[Row]:
+        """
+        Возвращает строки (id, версия, остаток суммы) доступных
+        объектов, упорядоченные от старых к новым, блокируя их
+        так же, как get_all_available_objects.
+        """
+        rows = await session.execute(
+            select_open_queue(
+                model,
+                model.id,
+                model.version_id,
+                model.full_amount - model.invested_amount
+            ).order_by(model.create_date, model.id)
+        )
+        rows = rows.all()
+        self.observe_loaded(model, len(rows))
+        return rows
+
+    @staticmethod
+    def allocate(
+        rows: list[Row],
+        amount: int
+    ) -> tuple[list[tuple[int, int]], Optional[tuple[int, int, int]]]:
+        """
+        Распределяет сумму amount по очереди rows.
+        Возвращает пары (id, версия) объектов, которые будут закрыты,
+        и тройку (id, версия, зачисленная сумма) для объекта,
+        получившего деньги частично, если такой есть.
+        """
+        closed_keys = []
+        for obj_id, version_id, remaining_amount in rows:
+            if amount < remaining_amount:
+                if amount:
+                    return closed_keys, (obj_id, version_id, amount)
+                break
+            closed_keys.append((obj_id, version_id))
+            amount -= remaining_amount
+        return closed_keys, None
+
+    def match_allocations(
+        self,
+        charity_projects: list[Row],
+        donations: list[Row],
+        amount: int
+    ) -> list[dict]:
+        """
+        Сопоставляет головы очередей так же, как алгоритм
+        "Двух указателей", и возвращает записи журнала распределения
+        для суммы перевода amount. Сумма не превышает остатка ни одной
+        из очередей, поэтому строк всегда хватает.
+        """
+        allocations = []
+        create_date = datetime.now()
+        projects = iter(charity_projects)
+        donations = iter(donations)
+        project_remaining = donation_remaining = 0
+        while amount:
+            if not project_remaining:
+                project_id, _, project_remaining = next(projects)
+            if not donation_remaining:
+                donation_id, _, donation_remaining = next(donations)
+            transferred = min(project_remaining, donation_remaining, amount)
+            allocations.append(self.build_allocation(
+                project_id, donation_id, transferred, create_date
+            ))
+            project_remaining -= transferred
+            donation_remaining -= transferred
+            amount -= transferred
+        return allocations
+
+    async def apply_allocation(
+        self,
+        model,
+        closed_keys: list[tuple[int, int]],
+        partial: Optional[tuple[int, int, int]],
+        session: AsyncSession
+    ) -> None:
+        """
+        Записывает результат распределения в базу данных:
+        один UPDATE для всех закрываемых объектов (ключи
+        подставляются литералами, чтобы не упереться в лимит
+        параметров SQLite) и один UPDATE для частично
+        инвестированного объекта.
+        Каждая строка обновляется только при неизменной версии,
+        если обновлено меньше строк, чем ожидалось, выбрасывается
+        StaleDataError.
+        """
+        updated_count = 0
+        if closed_keys:
+            closed = await session.execute(
+                update(model).where(
+                    tuple_(model.id, model.version_id).in_(bindparam(
+                        'closed_keys', closed_keys,
+                        expanding=True, literal_execute=True
+                    ))
+                ).values(
+                    invested_amount=model.full_amount,
+                    fully_invested=True,
+                    close_date=datetime.now(),
+                    version_id=model.version_id + 1
+                ).execution_options(synchronize_session=False)
+            )
+            updated_count += closed.rowcount
+        if partial is not None:
+            obj_id, version_id, amount = partial
+            partially_invested = await session.execute(
+                update(model).where(
+                    model.id == obj_id, model.version_id == version_id
+                ).values(
+                    invested_amount=model.invested_amount + amount,
+                    version_id=model.version_id + 1
+                ).execution_options(synchronize_session=False)
+            )
+            updated_count += partially_invested.rowcount
+        if updated_count != len(closed_keys) + (partial is not None):
+            raise StaleDataError(
+                STALE_QUEUE_ERROR.format(model.__tablename__)
+            )
+
+    @observe_investing_run
+    async def launch_investing_proccess(self, session: AsyncSession) -> int:
+        """
+        Проводит процесс транзакции пакетно.
+        Сумма перевода равна меньшей из сумм остатков очередей,
+        каждая очередь распределяет ее от старых объектов к новым
+        независимо от другой, что дает тот же результат, что и
+        алгоритм "Двух указателей".
+        Записи журнала распределения получаются слиянием голов
+        очередей и вставляются одним пакетным INSERT.
+        Число запросов постоянно: два SELECT, до четырех UPDATE,
+        INSERT и commit.
+        """
+        charity_projects = await self.get_available_rows(
+            CharityProject, session
+        )
+        if not charity_projects:
+            return self.exit_early(EARLY_EXIT_NO_CHARITY_PROJECTS)
+        donations = await self.get_available_rows(Donation, session)
+        if not donations:
+            return self.exit_early(EARLY_EXIT_NO_DONATIONS)
+        amount = min(
+            sum(remaining for *_, remaining in charity_projects),
+            sum(remaining for *_, remaining in donations)
+        )
+        for model, rows in (
+            (CharityProject, charity_projects), (Donation, donations)
+        ):
+            closed_keys, partial = self.allocate(rows, amount)
+            await self.apply_allocation(model, closed_keys, partial, session)
+            self.observe_closed(model, len(closed_keys))
+        await self.record_allocations(
+            self.match_allocations(charity_projects, donations, amount),
+            session
+        )
+        await self.commit(session)
+        return amount
+
+
+class SQLTransactionInvesting(TransactionInvesting):
+    """
+    Механизм инвестирования, выполняющий распределение целиком
+    в базе данных.
+    Распределение по очереди - это задача о пересечении префиксных
+    сумм: объект очереди получает деньги, пока накопленная сумма
+    остатков до него меньше суммы перевода. Накопленные суммы
+    считаются оконной функцией SUM() OVER (ORDER BY create_date, id),
+    поэтому на каждую таблицу нужен один UPDATE без загрузки
+    ORM-объектов. Требует SQLite 3.25+ или PostgreSQL.
+    """
+
+    name = 'sql'
+
+    CORRELATED_UPDATE_DIALECTS = ('sqlite',)
+
+    @staticmethod
+    def build_queue(model):
+        """
+        Возвращает CTE очереди доступных объектов с остатком суммы
+        и накопленной суммой остатков по порядку создания.
+        """
+        remaining_amount = model.full_amount - model.invested_amount
+        return select(
+            model.id.label('id'),
+            remaining_amount.label('remaining_amount'),
+            func.sum(remaining_amount).over(
+                order_by=(model.create_date, model.id)
+            ).label('cumulative_amount')
+        ).where(
+            not_(model.fully_invested)
+        ).cte(f'{model.__tablename__}_queue')
+
+    async def lock_queues(
+        self,
+        session: AsyncSession,
+        is_correlated: bool
+    ) -> None:
+        """
+        Блокирует очереди до чтения сумм остатков. Пропускать
+        заблокированные строки здесь нельзя: накопленные суммы
+        считаются по всей очереди, поэтому параллельные проходы
+        выполняются по очереди.
+        В PostgreSQL все доступные проекты и пожертвования блокируются
+        через SELECT ... FOR UPDATE. В SQLite блокировок строк нет,
+        поэтому пустым UPDATE захватывается блокировка записи всей
+        базы. Он же открывает транзакцию: pysqlite начинает ее только
+        перед запросами, начинающимися с UPDATE, и без нее
+        WITH ... UPDATE выполнялись бы в режиме autocommit.
+        """
+        if is_correlated:
+            await session.execute(
+                update(CharityProject).where(false()).values(
+                    version_id=CharityProject.version_id
+                )
+            )
+            return
+        for model in (CharityProject, Donation):
+            await session.execute(
+                select(model.id).where(
+                    not_(model.fully_invested)
+                ).with_for_update()
+            )
+
+    async def get_remaining_totals(
+        self,
+        session: AsyncSession
+    ) -> tuple[int, int]:
+        """
+        Возвращает суммы остатков открытых проектов
+        и открытых пожертвований.
+        """
+        totals = await session.execute(select(*(
+            select(
+                func.coalesce(
+                    func.sum(model.full_amount - model.invested_amount), 0
+                )
+            ).where(not_(model.fully_invested)).scalar_subquery()
+            for model in (CharityProject, Donation)
+        )))
+        return tuple(totals.one())
+
+    @staticmethod
+    def least(first, second):
+        """Переносимый аналог LEAST для двух выражений."""
+        return case((first < second, first), else_=second)
+
+    @staticmethod
+    def greatest(first, second):
+        """Переносимый аналог GREATEST для двух выражений."""
+        return case((first > second, first), else_=second)
+
+    def build_allocations_insert(self, amount: int):
+        """
+        Строит INSERT ... SELECT записей журнала распределения.
+        Каждый объект очереди занимает отрезок префиксных сумм
+        [cumulative_amount - remaining_amount, cumulative_amount),
+        пожертвование переводит в проект ровно длину пересечения их
+        отрезков, обрезанного суммой перевода amount. Соединяются
+        только объекты, получающие деньги в этом проходе.
+        Должен выполняться до UPDATE, пока очереди не изменились.
+        """
+        projects = self.build_queue(CharityProject)
+        donations = self.build_queue(Donation)
+        project_start = (
+            projects.c.cumulative_amount - projects.c.remaining_amount
+        )
+        donation_start = (
+            donations.c.cumulative_amount - donations.c.remaining_amount
+        )
+        start = self.greatest(project_start, donation_start)
+        end = self.least(
+            self.least(projects.c.cumulative_amount,
+                       donations.c.cumulative_amount),
+            amount
+        )
+        return insert(Allocation).from_select(
+            ['project_id', 'donation_id', 'amount', 'create_date'],
+            select(
+                projects.c.id,
+                donations.c.id,
+                end - start,
+                bindparam('create_date', datetime.now())
+            ).where(
+                project_start < amount,
+                donation_start < amount,
+                project_start < donations.c.cumulative_amount,
+                donation_start < projects.c.cumulative_amount
+            ).order_by(
+                projects.c.cumulative_amount, donations.c.cumulative_amount
+            )
+        )
+
+    def build_update(self, model, amount: int, is_correlated: bool):
+        """
+        Строит UPDATE, распределяющий сумму amount по очереди model.
+        PostgreSQL получает UPDATE ... FROM очереди, а для SQLite,
+        где SQLAlchemy не поддерживает UPDATE ... FROM, накопленная
+        сумма читается коррелированным подзапросом к той же CTE.
+        SQLite материализует CTE один раз до изменения строк
+        и ищет в ней по автоматическому индексу.
+        """
+        queue = self.build_queue(model)
+        close_date = bindparam('close_date', datetime.now())
+        is_reached = (
+            queue.c.cumulative_amount - queue.c.remaining_amount < amount
+        )
+        if is_correlated:
+            cumulative_amount = select(queue.c.cumulative_amount).where(
+                queue.c.id == model.id
+            ).scalar_subquery()
+            statement = update(model).add_cte(queue).where(
+                model.id.in_(select(queue.c.id).where(is_reached))
+            )
+        else:
+            cumulative_amount = queue.c.cumulative_amount
+            statement = update(model).where(
+                model.id == queue.c.id, is_reached
+            )
+        is_closed = cumulative_amount <= amount
+        return statement.values(
+            invested_amount=model.full_amount - case(
+                (is_closed, 0), else_=cumulative_amount - amount
+            ),
+            fully_invested=is_closed,
+            close_date=case((is_closed, close_date), else_=model.close_date),
+            version_id=model.version_id + 1
+        ).execution_options(synchronize_session=False)
+
+    @observe_investing_run
+    async def launch_investing_proccess(self, session: AsyncSession) -> int:
+        """
+        Проводит процесс транзакции средствами базы данных:
+        блокировка очередей, один SELECT для суммы перевода,
+        INSERT ... SELECT журнала распределения и по одному UPDATE
+        на таблицу проектов и таблицу пожертвований.
+        """
+        connection = await session.connection()
+        is_correlated = (
+            connection.dialect.name in self.CORRELATED_UPDATE_DIALECTS
+        )
+        await self.lock_queues(session, is_correlated)
+        projects_total, donations_total = await self.get_remaining_totals(
+            session
+        )
+        if not projects_total or not donations_total:
+            await session.rollback()
+            return self.exit_early(
+                EARLY_EXIT_NO_DONATIONS if projects_total
+                else EARLY_EXIT_NO_CHARITY_PROJECTS
+            )
+        amount = min(projects_total, donations_total)
+        await session.execute(self.build_allocations_insert(amount))
+        for model in (CharityProject, Donation):
+            await session.execute(
+                self.build_update(model, amount, is_correlated)
+            )
+        await self.commit(session)
+        return amount
 
-            session.add(current_donation)
-            session.add(current_project)
-        await session.commit()
 
+INVESTING_ENGINES = {
+    'two_pointers': TransactionInvesting,
+    'incremental': IncrementalTransactionInvesting,
+    'bulk': BulkTransactionInvesting,
+    'sql': SQLTransactionInvesting,
+}
 
-transaction_mechanism = TransactionInvesting()
+transaction_mechanism = INVESTING_ENGINES[settings.investing_engine]()
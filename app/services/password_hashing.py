@@ -0,0 +1,144 @@
+import asyncio
+import time
+from concurrent.futures import (
+    Executor, ProcessPoolExecutor, ThreadPoolExecutor
+)
+from typing import Callable, Optional, Tuple
+
+from fastapi_users.password import PasswordHelper
+
+from app.core.config import settings
+from app.core.metrics import registry
+
+OPERATION_HASH = 'hash'
+OPERATION_VERIFY = 'verify'
+EXECUTOR_THREAD = 'thread'
+EXECUTOR_PROCESS = 'process'
+EXECUTORS = {
+    EXECUTOR_THREAD: ThreadPoolExecutor,
+    EXECUTOR_PROCESS: ProcessPoolExecutor,
+}
+UNKNOWN_EXECUTOR = (
+    'Неизвестный пул хеширования паролей {}, доступны: {}.'
+)
+PASSWORD_HASH_BUCKETS = (
+    0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0
+)
+
+password_helper = PasswordHelper()
+
+password_hash_duration_seconds = registry.histogram(
+    'password_hash_duration_seconds',
+    'Длительность хеширования или проверки пароля, включая '
+    'ожидание в пуле.',
+    labelnames=('operation',),
+    buckets=PASSWORD_HASH_BUCKETS
+)
+password_hash_wait_seconds = registry.histogram(
+    'password_hash_wait_seconds',
+    'Ожидание свободного места в пуле хеширования паролей.',
+    labelnames=('operation',),
+    buckets=PASSWORD_HASH_BUCKETS
+)
+password_hash_in_flight = registry.gauge(
+    'password_hash_in_flight',
+    'Число хеширований и проверок паролей, выполняемых в пуле.'
+)
+
+
+def hash_password(password: str) -> str:
+    return password_helper.hash(password)
+
+
+def verify_and_update_password(
+    plain_password: str,
+    hashed_password: str
+) -> Tuple[bool, Optional[str]]:
+    return password_helper.verify_and_update(plain_password, hashed_password)
+
+
+class PasswordHashingService:
+    """
+    Хеширование и проверка паролей bcrypt вне потока event loop.
+    Вычисления выполняются в пуле из workers потоков или процессов,
+    одновременно в пул передается не больше max_concurrency операций,
+    остальные ждут своей очереди в event loop. Если workers равен 0,
+    то вычисления выполняются прямо в event loop.
+    """
+
+    def __init__(
+        self,
+        workers: int = settings.password_hash_workers,
+        max_concurrency: int = settings.password_hash_max_concurrency,
+        executor: str = settings.password_hash_executor
+    ):
+        if executor not in EXECUTORS:
+            raise ValueError(
+                UNKNOWN_EXECUTOR.format(executor, ', '.join(EXECUTORS))
+            )
+        self.workers = workers
+        self.max_concurrency = max_concurrency
+        self.executor_class = EXECUTORS[executor]
+        self._executor: Optional[Executor] = None
+        self._semaphores: dict[
+            asyncio.AbstractEventLoop, asyncio.Semaphore
+        ] = {}
+
+    @property
+    def executor(self) -> Optional[Executor]:
+        if self.workers and self._executor is None:
+            self._executor = self.executor_class(max_workers=self.workers)
+        return self._executor
+
+    def get_semaphore(self) -> asyncio.Semaphore:
+        loop = asyncio.get_running_loop()
+        if loop not in self._semaphores:
+            self._semaphores = {
+                loop: asyncio.Semaphore(self.max_concurrency)
+            }
+        return self._semaphores[loop]
+
+    async def run(self, operation: str, function: Callable, *args):
+        started = time.perf_counter()
+        if not self.workers:
+            try:
+                return function(*args)
+            finally:
+                password_hash_duration_seconds.observe(
+                    time.perf_counter() - started, operation=operation
+                )
+        async with self.get_semaphore():
+            password_hash_wait_seconds.observe(
+                time.perf_counter() - started, operation=operation
+            )
+            password_hash_in_flight.inc()
+            try:
+                return await asyncio.get_running_loop().run_in_executor(
+                    self.executor, function, *args
+                )
+            finally:
+                password_hash_in_flight.inc(-1)
+                password_hash_duration_seconds.observe(
+                    time.perf_counter() - started, operation=operation
+                )
+
+    async def hash(self, password: str) -> str:
+        return await self.run(OPERATION_HASH, hash_password, password)
+
+    async def verify_and_update(
+        self,
+        plain_password: str,
+        hashed_password: str
+    ) -> Tuple[bool, Optional[str]]:
+        return await self.run(
+            OPERATION_VERIFY, verify_and_update_password,
+            plain_password, hashed_password
+        )
+
+    def shutdown(self) -> None:
+        if self._executor is not None:
+            self._executor.shutdown()
+            self._executor = None
+
+
+password_hashing = PasswordHashingService()
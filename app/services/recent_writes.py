@@ -0,0 +1,37 @@
+from app.core.cache import CacheBackend, cache_backend
+from app.core.config import settings
+
+RECENT_WRITE_KEY = 'recent_write:user:{}'
+RECENT_WRITE_VALUE = b'1'
+
+
+class RecentWrites:
+    """
+    Отметки о недавних изменениях данных пользователя.
+    Пока отметка жива (window секунд - с запасом больше задержки
+    реплики), чтения пользователя направляются в основную базу,
+    и он сразу видит собственные изменения.
+    Отметки хранятся в общем хранилище кэша, поэтому с хранилищем
+    внутри процесса они видны только процессу, принявшему запрос.
+    """
+
+    def __init__(
+        self,
+        backend: CacheBackend,
+        window: float = settings.read_your_writes_window
+    ):
+        self.backend = backend
+        self.window = window
+
+    async def mark(self, user_id: int) -> None:
+        await self.backend.set(
+            RECENT_WRITE_KEY.format(user_id), RECENT_WRITE_VALUE, self.window
+        )
+
+    async def is_recent(self, user_id: int) -> bool:
+        return await self.backend.get(
+            RECENT_WRITE_KEY.format(user_id)
+        ) is not None
+
+
+recent_writes = RecentWrites(cache_backend)
@@ -0,0 +1,59 @@
+import json
+from typing import Optional
+
+from app.core.cache import CacheBackend, cache_backend
+from app.core.config import settings
+from app.models.user import User
+
+USER_PRINCIPAL_KEY = 'user:{}:principal'
+USER_PRINCIPAL_FIELDS = (
+    'id', 'email', 'is_active', 'is_superuser', 'is_verified'
+)
+
+
+def build_principal(data: dict) -> User:
+    """
+    Создает пользователя из полей USER_PRINCIPAL_FIELDS.
+    Объект не связан с сессией и нужен только для проверки прав
+    и идентификатора в эндпоинтах: добавлять его в сессию нельзя.
+    """
+    return User(**{field: data[field] for field in USER_PRINCIPAL_FIELDS})
+
+
+class UserPrincipalCache:
+    """
+    Кэш пользователей, прошедших аутентификацию, по идентификатору.
+    Позволяет не читать пользователя из базы данных на каждый
+    запрос с JWT. Запись живет ttl секунд и удаляется при изменении
+    пользователя через UserManager.
+    """
+
+    def __init__(
+        self,
+        backend: CacheBackend,
+        ttl: float = settings.user_cache_ttl
+    ):
+        self.backend = backend
+        self.ttl = ttl
+
+    async def get(self, user_id: int) -> Optional[User]:
+        value = await self.backend.get(USER_PRINCIPAL_KEY.format(user_id))
+        if value is None:
+            return None
+        return build_principal(json.loads(value))
+
+    async def set(self, user: User) -> None:
+        await self.backend.set(
+            USER_PRINCIPAL_KEY.format(user.id),
+            json.dumps({
+                field: getattr(user, field)
+                for field in USER_PRINCIPAL_FIELDS
+            }).encode(),
+            self.ttl
+        )
+
+    async def invalidate(self, user_id: int) -> None:
+        await self.backend.delete(USER_PRINCIPAL_KEY.format(user_id))
+
+
+user_principal_cache = UserPrincipalCache(cache_backend)
@@ -0,0 +1,33 @@
+"""
+Отдельный процесс фонового инвестирования.
+Запуск: python -m app.worker
+Используется вместе с INVESTING_IN_BACKGROUND=True, когда воркер
+не должен работать внутри процессов веб-сервера. Так как уведомления
+от эндпоинтов до него не доходят, он опрашивает очереди раз в
+INVESTING_POLL_INTERVAL секунд.
+"""
+import asyncio
+import logging
+
+from app.core.config import settings
+from app.core.db import AsyncSessionLocal
+from app.services.investing_worker import InvestingWorker
+from app.services.money_transaction import transaction_mechanism
+
+DEFAULT_POLL_INTERVAL = 1.0
+
+
+async def main() -> None:
+    worker = InvestingWorker(
+        transaction_mechanism,
+        AsyncSessionLocal,
+        poll_interval=(
+            settings.investing_poll_interval or DEFAULT_POLL_INTERVAL
+        ),
+    )
+    await worker.run_forever()
+
+
+if __name__ == '__main__':
+    logging.basicConfig(level=logging.INFO)
+    asyncio.run(main())
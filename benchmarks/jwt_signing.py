@@ -0,0 +1,113 @@
+"""
+Микробенчмарк выпуска и проверки JWT.
+
+Для каждого алгоритма подписи (HS256, RS256, EdDSA) замеряет
+число выпущенных и проверенных токенов в секунду в двух режимах:
+- pem: стратегия создается на каждый вызов и получает ключи
+  PEM-строками, которые PyJWT разбирает при каждой подписи и проверке;
+- cached: одна стратегия app.core.user.PrincipalJWTStrategy
+  с ключами, разобранными app.core.jwt_keys.load_jwt_keys.
+Для HS256 режимы отличаются только созданием стратегии.
+
+Запуск из корня проекта:
+    python -m benchmarks.jwt_signing --tokens 2000
+"""
+import argparse
+import asyncio
+import tempfile
+import time
+from pathlib import Path
+
+from cryptography.hazmat.primitives.asymmetric import ed25519, rsa
+from cryptography.hazmat.primitives.serialization import (
+    Encoding, NoEncryption, PrivateFormat, PublicFormat
+)
+from fastapi_users.jwt import decode_jwt
+
+from app.core.config import Settings
+from app.core.jwt_keys import JWTKeys, load_jwt_keys
+from app.core.user import JWT_TOKEN_LIFETIME, PrincipalJWTStrategy
+from app.models import User
+
+DEFAULT_TOKENS = 2000
+SECRET = 'benchmark-secret'
+BENCH_USER = User(
+    id=1, email='bench@example.com', hashed_password='',
+    is_active=True, is_superuser=False, is_verified=True
+)
+KEY_FACTORIES = {
+    'RS256': lambda: rsa.generate_private_key(
+        public_exponent=65537, key_size=2048
+    ),
+    'EdDSA': ed25519.Ed25519PrivateKey.generate,
+}
+
+
+def get_keys(algorithm: str, directory: Path) -> tuple[JWTKeys, JWTKeys]:
+    """Возвращает ключи алгоритма PEM-строками и разобранными."""
+    if algorithm not in KEY_FACTORIES:
+        keys = load_jwt_keys(Settings(jwt_algorithm=algorithm, secret=SECRET))
+        return keys, keys
+    private_key = KEY_FACTORIES[algorithm]()
+    private_pem = private_key.private_bytes(
+        Encoding.PEM, PrivateFormat.PKCS8, NoEncryption()
+    )
+    path = directory / f'{algorithm}.pem'
+    path.write_bytes(private_pem)
+    keys = load_jwt_keys(Settings(
+        jwt_algorithm=algorithm, jwt_private_key_file=str(path)
+    ))
+    public_pem = private_key.public_key().public_bytes(
+        Encoding.PEM, PublicFormat.SubjectPublicKeyInfo
+    )
+    return JWTKeys(
+        algorithm, private_pem.decode(), public_pem.decode(), keys.key_id
+    ), keys
+
+
+async def measure(keys: JWTKeys, tokens: int, cached: bool) -> tuple:
+    """Возвращает число выпущенных и проверенных токенов в секунду."""
+    strategy = PrincipalJWTStrategy(keys, JWT_TOKEN_LIFETIME)
+
+    def get_strategy() -> PrincipalJWTStrategy:
+        if cached:
+            return strategy
+        return PrincipalJWTStrategy(keys, JWT_TOKEN_LIFETIME)
+
+    started = time.perf_counter()
+    issued = [
+        await get_strategy().write_token(BENCH_USER) for _ in range(tokens)
+    ]
+    issue_elapsed = time.perf_counter() - started
+    started = time.perf_counter()
+    for token in issued:
+        current_strategy = get_strategy()
+        decode_jwt(
+            token, current_strategy.decode_key,
+            current_strategy.token_audience,
+            algorithms=[current_strategy.algorithm]
+        )
+    verify_elapsed = time.perf_counter() - started
+    return tokens / issue_elapsed, tokens / verify_elapsed
+
+
+async def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument('--tokens', type=int, default=DEFAULT_TOKENS)
+    args = parser.parse_args()
+    print('алгоритм |  режим | выпуск в с | проверка в с')
+    with tempfile.TemporaryDirectory() as directory:
+        for algorithm in ('HS256', *KEY_FACTORIES):
+            pem_keys, cached_keys = get_keys(algorithm, Path(directory))
+            for mode, keys in (('pem', pem_keys), ('cached', cached_keys)):
+                issue_rate, verify_rate = await measure(
+                    keys, args.tokens, cached=mode == 'cached'
+                )
+                print(
+                    f'{algorithm:>8} | {mode:>6} | {issue_rate:10.0f}'
+                    f' | {verify_rate:12.0f}'
+                )
+
+
+if __name__ == '__main__':
+    asyncio.run(main())
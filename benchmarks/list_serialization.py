@@ -0,0 +1,124 @@
+"""
+Бенчмарк сериализации списков.
+
+Заполняет временную SQLite базу пожертвованиями и сравнивает
+два пути отдачи страницы списка:
+- schema: выборка ORM-объектов, валидация каждого через DonationDB
+  (orm_mode), jsonable_encoder и JSONResponse, как у эндпоинта
+  с response_model;
+- fast: выборка только нужных колонок и кодирование строк
+  в JSON через orjson (app.services.serialization.dump_rows).
+Для каждого пути выводится время запроса и время сериализации.
+
+Запуск из корня проекта:
+    python -m benchmarks.list_serialization --sizes 100 1000 10000
+"""
+import argparse
+import tempfile
+import time
+from datetime import datetime, timedelta
+from pathlib import Path
+
+from fastapi.encoders import jsonable_encoder
+from fastapi.responses import JSONResponse
+from sqlalchemy import create_engine, select
+from sqlalchemy.orm import Session
+
+from app.core.db import Base
+from app.models import Donation
+from app.schemas.donation import DonationDB
+from app.services.serialization import dump_rows, schema_fields
+
+DEFAULT_SIZES = (100, 1_000, 10_000)
+REPEATS = 5
+START_DATE = datetime(2010, 10, 10)
+FIELDS = schema_fields(DonationDB)
+
+
+def fill_donations(connection, size: int) -> None:
+    connection.execute(
+        Donation.__table__.insert(),
+        [
+            {
+                'user_id': 1,
+                'comment': f'Donation {index}',
+                'full_amount': 100,
+                'invested_amount': 100,
+                'fully_invested': True,
+                'create_date': START_DATE + timedelta(seconds=index),
+                'close_date': START_DATE + timedelta(seconds=index),
+            }
+            for index in range(size)
+        ]
+    )
+
+
+def schema_path(session: Session):
+    donations = session.execute(
+        select(Donation).order_by(Donation.create_date, Donation.id)
+    ).scalars().all()
+    started = time.perf_counter()
+    body = JSONResponse(jsonable_encoder([
+        DonationDB.from_orm(donation) for donation in donations
+    ])).body
+    return started, body
+
+
+def fast_path(session: Session):
+    rows = session.execute(
+        select(*(getattr(Donation, field) for field in FIELDS)).order_by(
+            Donation.create_date, Donation.id
+        )
+    ).all()
+    started = time.perf_counter()
+    return started, dump_rows(FIELDS, rows)
+
+
+def measure(engine, path) -> tuple[float, float]:
+    """Возвращает лучшее время запроса и сериализации в миллисекундах."""
+    query_timings, serialization_timings = [], []
+    for _ in range(REPEATS):
+        with Session(engine) as session:
+            started = time.perf_counter()
+            serialization_started, _ = path(session)
+            finished = time.perf_counter()
+        query_timings.append(serialization_started - started)
+        serialization_timings.append(finished - serialization_started)
+    return min(query_timings) * 1000, min(serialization_timings) * 1000
+
+
+def run(size: int, directory: Path) -> None:
+    engine = create_engine(f'sqlite:///{directory / f"bench_{size}.db"}')
+    Base.metadata.create_all(engine, tables=[Donation.__table__])
+    with engine.begin() as connection:
+        fill_donations(connection, size)
+    results = {
+        name: measure(engine, path)
+        for name, path in (('schema', schema_path), ('fast', fast_path))
+    }
+    engine.dispose()
+    (schema_query, schema_dump), (fast_query, fast_dump) = results.values()
+    print(
+        f'{size:>9} | {schema_query:8.2f} + {schema_dump:8.2f} ms'
+        f' | {fast_query:8.2f} + {fast_dump:8.2f} ms'
+        f' | x{(schema_query + schema_dump) / (fast_query + fast_dump):.1f}'
+    )
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument(
+        '--sizes', type=int, nargs='+', default=DEFAULT_SIZES
+    )
+    args = parser.parse_args()
+    print(
+        '     rows |  schema: запрос + сериализация |'
+        '    fast: запрос + сериализация | ускорение'
+    )
+    with tempfile.TemporaryDirectory() as directory:
+        for size in args.sizes:
+            run(size, Path(directory))
+
+
+if __name__ == '__main__':
+    main()
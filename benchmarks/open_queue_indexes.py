@@ -0,0 +1,116 @@
+"""
+Бенчмарк индексов очередей открытых объектов.
+
+Заполняет временную SQLite базу таблицей пожертвований заданного
+размера (по умолчанию открыта 1% строк), после чего сравнивает план
+и время выполнения запросов механизма инвестирования без индекса
+ix_donation_open_queue и с ним.
+
+Запуск из корня проекта:
+    python -m benchmarks.open_queue_indexes --sizes 10000 100000 1000000
+"""
+import argparse
+import tempfile
+import time
+from datetime import datetime, timedelta
+from pathlib import Path
+
+from sqlalchemy import create_engine, not_, select
+from sqlalchemy.dialects import sqlite
+
+from app.core.db import Base
+from app.models import Donation
+
+DEFAULT_SIZES = (10_000, 100_000, 1_000_000)
+OPEN_ROWS_SHARE = 0.01
+CHUNK_SIZE = 100
+REPEATS = 5
+INDEX_NAME = 'ix_donation_open_queue'
+START_DATE = datetime(2010, 10, 10)
+
+QUERIES = {
+    'full queue': select(Donation.id, Donation.full_amount).where(
+        not_(Donation.fully_invested)
+    ).order_by(Donation.create_date, Donation.id),
+    'queue head': select(Donation.id, Donation.full_amount).where(
+        not_(Donation.fully_invested)
+    ).order_by(Donation.create_date, Donation.id).limit(CHUNK_SIZE),
+}
+
+
+def compile_query(statement) -> str:
+    return str(statement.compile(
+        dialect=sqlite.dialect(), compile_kwargs={'literal_binds': True}
+    ))
+
+
+def fill_donations(connection, size: int) -> None:
+    open_every = int(1 / OPEN_ROWS_SHARE)
+    connection.execute(
+        Donation.__table__.insert(),
+        [
+            {
+                'full_amount': 100,
+                'invested_amount': 0 if index % open_every == 0 else 100,
+                'fully_invested': index % open_every != 0,
+                'create_date': START_DATE + timedelta(seconds=index),
+                'close_date': START_DATE + timedelta(seconds=index),
+            }
+            for index in range(size)
+        ]
+    )
+
+
+def measure(connection, query: str) -> tuple[str, float]:
+    plan = ' | '.join(
+        row[-1] for row in connection.exec_driver_sql(
+            f'EXPLAIN QUERY PLAN {query}'
+        )
+    )
+    timings = []
+    for _ in range(REPEATS):
+        started = time.perf_counter()
+        connection.exec_driver_sql(query).fetchall()
+        timings.append(time.perf_counter() - started)
+    return plan, min(timings) * 1000
+
+
+def run(size: int, directory: Path) -> None:
+    engine = create_engine(f'sqlite:///{directory / f"bench_{size}.db"}')
+    Base.metadata.create_all(engine, tables=[Donation.__table__])
+    with engine.begin() as connection:
+        connection.exec_driver_sql(f'DROP INDEX {INDEX_NAME}')
+        fill_donations(connection, size)
+        results = {}
+        for name, statement in QUERIES.items():
+            results[name] = [measure(connection, compile_query(statement))]
+        for index in Donation.__table__.indexes:
+            if index.name == INDEX_NAME:
+                index.create(connection)
+        connection.exec_driver_sql('ANALYZE')
+        for name, statement in QUERIES.items():
+            results[name].append(measure(connection, compile_query(statement)))
+    engine.dispose()
+    for name, ((plan_before, before), (plan_after, after)) in results.items():
+        print(
+            f'{size:>9} | {name:<10} | {before:9.2f} ms | {after:9.2f} ms'
+            f' | x{before / after:.1f}'
+        )
+        print(f'{"":>9} |   без индекса: {plan_before}')
+        print(f'{"":>9} |   с индексом:  {plan_after}')
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument(
+        '--sizes', type=int, nargs='+', default=DEFAULT_SIZES
+    )
+    args = parser.parse_args()
+    print('     rows | query      | без индекса  |  с индексом  | ускорение')
+    with tempfile.TemporaryDirectory() as directory:
+        for size in args.sizes:
+            run(size, Path(directory))
+
+
+if __name__ == '__main__':
+    main()
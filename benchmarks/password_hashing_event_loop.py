@@ -0,0 +1,166 @@
+"""
+Бенчмарк задержки event loop при массовом входе пользователей.
+
+Создает временную SQLite базу с пользователем и отправляет
+в приложение параллельные запросы POST /auth/jwt/login напрямую
+через ASGI, без сети. Одновременно фоновая задача каждые
+TICK_INTERVAL секунд засыпает и замеряет, насколько позже
+она просыпается - так же ждали бы ответа остальные запросы воркера.
+Профили:
+- inline: bcrypt выполняется в потоке event loop (workers=0);
+- pool: bcrypt выполняется в пуле app.services.password_hashing.
+Выводится число входов в секунду и задержка event loop
+(медиана, 99-й перцентиль и максимум) в миллисекундах.
+
+Запуск из корня проекта:
+    python -m benchmarks.password_hashing_event_loop --logins 200
+"""
+import argparse
+import asyncio
+import statistics
+import tempfile
+import time
+from pathlib import Path
+from urllib.parse import urlencode
+
+from sqlalchemy.ext.asyncio import AsyncSession, create_async_engine
+from sqlalchemy.orm import sessionmaker
+
+from app.core import user as user_module
+from app.core.db import Base, get_async_session
+from app.main import app
+from app.models import User
+from app.services.password_hashing import (
+    PasswordHashingService, hash_password
+)
+
+DEFAULT_LOGINS = 200
+DEFAULT_CONCURRENCY = 50
+DEFAULT_WORKERS = 4
+TICK_INTERVAL = 0.005
+EMAIL = 'bench@example.com'
+PASSWORD = 'benchmark-password'
+
+
+async def post_login() -> int:
+    """Отправляет в приложение POST /auth/jwt/login и возвращает статус."""
+    body = urlencode({'username': EMAIL, 'password': PASSWORD}).encode()
+    scope = {
+        'type': 'http',
+        'asgi': {'version': '3.0'},
+        'http_version': '1.1',
+        'method': 'POST',
+        'scheme': 'http',
+        'path': '/auth/jwt/login',
+        'raw_path': b'/auth/jwt/login',
+        'root_path': '',
+        'query_string': b'',
+        'headers': [
+            (b'content-type', b'application/x-www-form-urlencoded'),
+            (b'content-length', str(len(body)).encode()),
+        ],
+        'client': ('benchmark', 0),
+        'server': ('benchmark', 80),
+    }
+    messages = [{'type': 'http.request', 'body': body, 'more_body': False}]
+    statuses = []
+
+    async def receive():
+        return messages.pop() if messages else {'type': 'http.disconnect'}
+
+    async def send(message):
+        if message['type'] == 'http.response.start':
+            statuses.append(message['status'])
+
+    try:
+        await app(scope, receive, send)
+    except Exception:
+        return 500
+    return statuses[0]
+
+
+async def measure_lag(lags: list[float], stop: asyncio.Event) -> None:
+    """Записывает в lags опоздания пробуждений event loop в секундах."""
+    while not stop.is_set():
+        started = time.perf_counter()
+        await asyncio.sleep(TICK_INTERVAL)
+        lags.append(time.perf_counter() - started - TICK_INTERVAL)
+
+
+async def run(
+    profile: str,
+    logins: int,
+    concurrency: int,
+    workers: int,
+    directory: Path
+) -> None:
+    engine = create_async_engine(
+        f'sqlite+aiosqlite:///{directory / f"{profile}.db"}'
+    )
+    session_factory = sessionmaker(engine, class_=AsyncSession)
+    async with engine.begin() as connection:
+        await connection.run_sync(Base.metadata.create_all)
+        await connection.execute(User.__table__.insert(), [{
+            'email': EMAIL,
+            'hashed_password': hash_password(PASSWORD),
+            'is_active': True,
+            'is_superuser': False,
+            'is_verified': True,
+        }])
+
+    async def get_bench_session():
+        async with session_factory() as session:
+            yield session
+
+    app.dependency_overrides = {get_async_session: get_bench_session}
+    user_module.password_hashing = PasswordHashingService(
+        workers=0 if profile == 'inline' else workers,
+        max_concurrency=workers
+    )
+    semaphore = asyncio.Semaphore(concurrency)
+
+    async def limited_login() -> int:
+        async with semaphore:
+            return await post_login()
+
+    lags = []
+    stop = asyncio.Event()
+    ticker = asyncio.create_task(measure_lag(lags, stop))
+    started = time.perf_counter()
+    statuses = await asyncio.gather(
+        *(limited_login() for _ in range(logins))
+    )
+    elapsed = time.perf_counter() - started
+    stop.set()
+    await ticker
+    user_module.password_hashing.shutdown()
+    app.dependency_overrides = {}
+    await engine.dispose()
+    lags_ms = sorted(lag * 1000 for lag in lags)
+    print(
+        f'{profile:>7} | {statuses.count(200) / elapsed:10.1f}'
+        f' | {statistics.median(lags_ms):9.1f}'
+        f' | {lags_ms[int(len(lags_ms) * 0.99)]:8.1f}'
+        f' | {lags_ms[-1]:8.1f}'
+    )
+
+
+async def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument('--logins', type=int, default=DEFAULT_LOGINS)
+    parser.add_argument(
+        '--concurrency', type=int, default=DEFAULT_CONCURRENCY
+    )
+    parser.add_argument('--workers', type=int, default=DEFAULT_WORKERS)
+    args = parser.parse_args()
+    print('profile | входов в с | lag p50 мс | p99 мс | max мс')
+    with tempfile.TemporaryDirectory() as directory:
+        for profile in ('inline', 'pool'):
+            await run(
+                profile, args.logins, args.concurrency, args.workers,
+                Path(directory)
+            )
+
+
+if __name__ == '__main__':
+    asyncio.run(main())
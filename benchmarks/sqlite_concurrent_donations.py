@@ -0,0 +1,160 @@
+"""
+Бенчмарк параллельных пожертвований на SQLite.
+
+Для каждого профиля создает временную SQLite базу с открытыми
+проектами и отправляет в приложение параллельные запросы
+POST /donation/ напрямую через ASGI, без сети:
+- default: режим журнала и настройки соединения SQLite по умолчанию;
+- tuned: профиль app.core.db.apply_sqlite_pragmas (WAL,
+  synchronous=NORMAL, mmap_size, cache_size, temp_store, busy_timeout).
+Выводится число успешных запросов в секунду и число ошибок,
+например database is locked.
+
+Запуск из корня проекта:
+    python -m benchmarks.sqlite_concurrent_donations --requests 500
+"""
+import argparse
+import asyncio
+import json
+import tempfile
+import time
+from datetime import datetime
+from pathlib import Path
+
+from sqlalchemy.ext.asyncio import AsyncSession, create_async_engine
+from sqlalchemy.orm import sessionmaker
+
+from app.core.config import Settings
+from app.core.db import (
+    Base, apply_sqlite_pragmas, get_async_session, get_engine_options
+)
+from app.core.user import current_user
+from app.main import app
+from app.models import CharityProject, User
+
+DEFAULT_REQUESTS = 500
+DEFAULT_CONCURRENCY = (1, 10, 50)
+PROJECTS_COUNT = 100
+PROJECT_AMOUNT = 10_000
+DONATION_AMOUNT = 10
+BENCH_USER = User(
+    id=1, email='bench@example.com', hashed_password='',
+    is_active=True, is_superuser=False, is_verified=True
+)
+
+
+async def post_donation() -> int:
+    """Отправляет в приложение POST /donation/ и возвращает статус-код."""
+    body = json.dumps({'full_amount': DONATION_AMOUNT}).encode()
+    scope = {
+        'type': 'http',
+        'asgi': {'version': '3.0'},
+        'http_version': '1.1',
+        'method': 'POST',
+        'scheme': 'http',
+        'path': '/donation/',
+        'raw_path': b'/donation/',
+        'root_path': '',
+        'query_string': b'',
+        'headers': [
+            (b'content-type', b'application/json'),
+            (b'content-length', str(len(body)).encode()),
+        ],
+        'client': ('benchmark', 0),
+        'server': ('benchmark', 80),
+    }
+    messages = [{'type': 'http.request', 'body': body, 'more_body': False}]
+    statuses = []
+
+    async def receive():
+        return messages.pop() if messages else {'type': 'http.disconnect'}
+
+    async def send(message):
+        if message['type'] == 'http.response.start':
+            statuses.append(message['status'])
+
+    try:
+        await app(scope, receive, send)
+    except Exception:
+        return 500
+    return statuses[0]
+
+
+async def run(
+    profile: str,
+    requests: int,
+    concurrency: int,
+    directory: Path
+) -> None:
+    config = Settings(
+        database_url=(
+            f'sqlite+aiosqlite:///{directory / f"{profile}_{concurrency}.db"}'
+        ),
+        pool_size=concurrency,
+        sqlite_tuning=profile == 'tuned'
+    )
+    engine = create_async_engine(
+        config.database_url, **get_engine_options(config)
+    )
+    apply_sqlite_pragmas(engine, config)
+    session_factory = sessionmaker(engine, class_=AsyncSession)
+    async with engine.begin() as connection:
+        await connection.run_sync(Base.metadata.create_all)
+        await connection.execute(CharityProject.__table__.insert(), [
+            {
+                'name': f'Project {index}',
+                'description': 'Benchmark project',
+                'full_amount': PROJECT_AMOUNT,
+                'invested_amount': 0,
+                'fully_invested': False,
+                'create_date': datetime.now(),
+            }
+            for index in range(PROJECTS_COUNT)
+        ])
+
+    async def get_bench_session():
+        async with session_factory() as session:
+            yield session
+
+    app.dependency_overrides = {
+        get_async_session: get_bench_session,
+        current_user: lambda: BENCH_USER,
+    }
+    semaphore = asyncio.Semaphore(concurrency)
+
+    async def limited_post() -> int:
+        async with semaphore:
+            return await post_donation()
+
+    started = time.perf_counter()
+    statuses = await asyncio.gather(
+        *(limited_post() for _ in range(requests))
+    )
+    elapsed = time.perf_counter() - started
+    app.dependency_overrides = {}
+    await engine.dispose()
+    succeeded = statuses.count(200)
+    print(
+        f'{profile:>8} | {concurrency:>11} | {succeeded / elapsed:9.1f}'
+        f' | {requests - succeeded:>6}'
+    )
+
+
+async def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument('--requests', type=int, default=DEFAULT_REQUESTS)
+    parser.add_argument(
+        '--concurrency', type=int, nargs='+', default=DEFAULT_CONCURRENCY
+    )
+    args = parser.parse_args()
+    print(' profile | concurrency |     RPS   | ошибки')
+    with tempfile.TemporaryDirectory() as directory:
+        for concurrency in args.concurrency:
+            for profile in ('default', 'tuned'):
+                await run(
+                    profile, args.requests, concurrency, Path(directory)
+                )
+
+
+if __name__ == '__main__':
+    asyncio.run(main())
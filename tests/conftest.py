@@ -1,3 +1,4 @@
+import os
 from pathlib import Path
 
 import pytest
@@ -7,6 +8,10 @@ from sqlalchemy import create_engine
 from sqlalchemy.ext.asyncio import AsyncSession, create_async_engine
 from sqlalchemy.orm import sessionmaker
 
+# Тесты работают с test.db, а прогрев пула при запуске приложения
+# открывал бы соединения с рабочей базой и переводил ее в режим WAL.
+os.environ.setdefault('POOL_WARM_UP', 'False')
+
 try:
     from app.main import app  # noqa
 except (NameError, ImportError) as error:
@@ -42,12 +47,14 @@ except (NameError, ImportError) as error:
         f'{type(error).__name__}: {error}.'
     )
 
+from app.services.charity_project_cache import charity_project_cache  # noqa
 
 BASE_DIR = Path(__file__).resolve(strict=True).parent.parent
 
 pytest_plugins = [
     'fixtures.user',
     'fixtures.data',
+    'fixtures.query_budget',
 ]
 
 TEST_DB = BASE_DIR / 'test.db'
@@ -73,6 +80,7 @@ async def init_db():
     yield
     async with engine.begin() as conn:
         await conn.run_sync(Base.metadata.drop_all)
+    await charity_project_cache.invalidate()
 
 
 @pytest.fixture
@@ -0,0 +1,44 @@
+"""
+Плагин бюджета SQL-запросов.
+
+Тест, помеченный @pytest.mark.query_budget(N), падает, если за время
+его выполнения (без подготовки фикстур) к тестовой базе данных
+было выполнено больше N запросов.
+"""
+import pytest
+from conftest import engine
+
+from app.core.instrumentation import instrument_engine, observe_queries
+
+QUERY_BUDGET_MARKER = 'query_budget'
+QUERY_BUDGET_EXCEEDED_ERROR = (
+    'Тест выполнил {} SQL-запросов при бюджете {}. '
+    'Самые долгие запросы:\n{}'
+)
+
+instrument_engine(engine)
+
+
+def pytest_configure(config):
+    config.addinivalue_line(
+        'markers',
+        f'{QUERY_BUDGET_MARKER}(count): максимальное число SQL-запросов, '
+        'которое может выполнить тест.'
+    )
+
+
+@pytest.hookimpl(hookwrapper=True)
+def pytest_runtest_call(item):
+    marker = item.get_closest_marker(QUERY_BUDGET_MARKER)
+    if marker is None:
+        yield
+        return
+    budget = marker.args[0]
+    with observe_queries() as stats:
+        outcome = yield
+    if outcome.excinfo is None and stats.count > budget:
+        pytest.fail(QUERY_BUDGET_EXCEEDED_ERROR.format(
+            stats.count, budget, '\n'.join(
+                statement for statement, _ in stats.slowest.items()
+            )
+        ), pytrace=False)
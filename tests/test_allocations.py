@@ -0,0 +1,92 @@
+DONATION_ALLOCATIONS_URL = '/donation/{}/allocations'
+PROJECT_ALLOCATIONS_URL = '/charity_project/{}/allocations'
+ALLOCATION_KEYS = {'id', 'project_id', 'donation_id', 'amount', 'create_date'}
+
+
+def test_get_donation_allocations(user_client, charity_project):
+    donation_id = user_client.post(
+        '/donation/', json={'full_amount': 100}
+    ).json()['id']
+    url = DONATION_ALLOCATIONS_URL.format(donation_id)
+    response = user_client.get(url)
+    assert response.status_code == 200, (
+        f'GET-запрос владельца пожертвования к `{url}` '
+        'должен вернуть статус-код 200.'
+    )
+    allocations = response.json()
+    assert len(allocations) == 1 and set(allocations[0]) == ALLOCATION_KEYS, (
+        f'Ответ `{url}` должен содержать одну запись журнала '
+        f'распределения с ключами {ALLOCATION_KEYS}.'
+    )
+    assert {
+        key: allocations[0][key]
+        for key in ('project_id', 'donation_id', 'amount')
+    } == {
+        'project_id': charity_project.id,
+        'donation_id': donation_id,
+        'amount': 100,
+    }, (
+        'Журнал распределения должен показывать, в какой проект '
+        'и сколько денег вложено из пожертвования.'
+    )
+
+
+def test_get_donation_allocations_of_another_user(
+    user_client, another_donation
+):
+    url = DONATION_ALLOCATIONS_URL.format(another_donation.id)
+    response = user_client.get(url)
+    assert response.status_code == 403, (
+        'GET-запрос к журналу распределения чужого пожертвования '
+        f'`{url}` должен вернуть статус-код 403.'
+    )
+
+
+def test_get_donation_allocations_not_found(user_client):
+    url = DONATION_ALLOCATIONS_URL.format(999)
+    response = user_client.get(url)
+    assert response.status_code == 404, (
+        'GET-запрос к журналу распределения несуществующего '
+        f'пожертвования `{url}` должен вернуть статус-код 404.'
+    )
+
+
+def test_get_charity_project_allocations(superuser_client, donation):
+    project_id = superuser_client.post('/charity_project/', json={
+        'name': 'Allocation project',
+        'description': 'Project with allocations',
+        'full_amount': 1000,
+    }).json()['id']
+    url = PROJECT_ALLOCATIONS_URL.format(project_id)
+    response = superuser_client.get(url)
+    assert response.status_code == 200, (
+        f'GET-запрос суперпользователя к `{url}` '
+        'должен вернуть статус-код 200.'
+    )
+    assert [
+        (allocation['donation_id'], allocation['amount'])
+        for allocation in response.json()
+    ] == [(donation.id, donation.full_amount)], (
+        'Журнал распределения проекта должен показывать, из каких '
+        'пожертвований и сколько денег в него вложено.'
+    )
+
+
+def test_get_charity_project_allocations_not_found(superuser_client):
+    url = PROJECT_ALLOCATIONS_URL.format(999)
+    response = superuser_client.get(url)
+    assert response.status_code == 404, (
+        'GET-запрос к журналу распределения несуществующего '
+        f'проекта `{url}` должен вернуть статус-код 404.'
+    )
+
+
+def test_get_charity_project_allocations_usual_user(
+    user_client, charity_project
+):
+    url = PROJECT_ALLOCATIONS_URL.format(charity_project.id)
+    response = user_client.get(url)
+    assert response.status_code == 403, (
+        f'GET-запрос обычного пользователя к `{url}` '
+        'должен вернуть статус-код 403.'
+    )
@@ -0,0 +1,70 @@
+import pytest
+from conftest import TestingSessionLocal
+
+from app.models import Donation
+
+BULK_CHARITY_PROJECTS_URL = '/charity_project/bulk'
+DESCRIPTION = 'Корм и лечение'
+
+
+def get_project(name, full_amount=100):
+    return {
+        'name': name, 'description': DESCRIPTION, 'full_amount': full_amount
+    }
+
+
+@pytest.mark.usefixtures('closed_charity_project')
+async def test_create_charity_projects_bulk(superuser_client):
+    async with TestingSessionLocal() as session:
+        session.add(Donation(
+            user_id=2, full_amount=150, invested_amount=0,
+            fully_invested=False
+        ))
+        await session.commit()
+    response = superuser_client.post(BULK_CHARITY_PROJECTS_URL, json=[
+        get_project('Зимний приют'),
+        get_project('chimichangas4life'),
+        get_project('Зимний приют'),
+        get_project('x'),
+        get_project('Весенняя прививка', full_amount=0),
+        get_project('Весенняя стерилизация'),
+    ])
+    assert response.status_code == 200, (
+        f'POST-запрос к `{BULK_CHARITY_PROJECTS_URL}` должен вернуть '
+        'статус-код 200.'
+    )
+    data = response.json()
+    assert [error['index'] for error in data['errors']] == [1, 2, 3, 4], (
+        'Проекты с занятыми, повторяющимися или некорректными именами '
+        'и суммами должны возвращаться ошибками со своими номерами.'
+    )
+    assert [
+        (project['name'], project['invested_amount'], project['fully_invested'])
+        for project in data['created']
+    ] == [
+        ('Зимний приют', 100, True),
+        ('Весенняя стерилизация', 50, False),
+    ], (
+        'Проекты должны создаваться в порядке запроса, а открытые '
+        'пожертвования - распределяться по ним.'
+    )
+
+
+@pytest.mark.query_budget(5)
+def test_create_charity_projects_bulk_queries(superuser_client):
+    response = superuser_client.post(BULK_CHARITY_PROJECTS_URL, json=[
+        get_project(f'Проект {index}') for index in range(100)
+    ])
+    assert len(response.json()['created']) == 100, (
+        'Все проекты партии должны быть созданы.'
+    )
+
+
+def test_create_charity_projects_bulk_forbidden(user_client):
+    response = user_client.post(
+        BULK_CHARITY_PROJECTS_URL, json=[get_project('Зимний приют')]
+    )
+    assert response.status_code == 403, (
+        f'POST-запрос пользователя к `{BULK_CHARITY_PROJECTS_URL}` '
+        'должен вернуть статус-код 403.'
+    )
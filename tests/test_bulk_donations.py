@@ -0,0 +1,90 @@
+import json
+
+import pytest
+from conftest import TestingSessionLocal
+from sqlalchemy import select
+
+from app.core.config import settings
+from app.models import CharityProject
+
+BULK_DONATIONS_URL = '/donation/bulk'
+NDJSON_HEADERS = {'Content-Type': 'application/x-ndjson'}
+
+
+@pytest.mark.usefixtures('charity_project')
+async def test_create_donations_bulk(user_client):
+    response = user_client.post(BULK_DONATIONS_URL, json=[
+        {'full_amount': 10},
+        {'full_amount': -5},
+        {'full_amount': 20, 'comment': 'Для кошек'},
+        {'comment': 'Без суммы'},
+    ])
+    assert response.status_code == 200, (
+        f'POST-запрос к `{BULK_DONATIONS_URL}` должен вернуть '
+        'статус-код 200.'
+    )
+    data = response.json()
+    assert [
+        (donation['full_amount'], donation['comment'])
+        for donation in data['created']
+    ] == [(10, None), (20, 'Для кошек')], (
+        'Корректные пожертвования должны создаваться в порядке запроса.'
+    )
+    assert 'invested_amount' not in data['created'][0], (
+        'Пользователю не должны возвращаться служебные поля пожертвований.'
+    )
+    assert [error['index'] for error in data['errors']] == [1, 3], (
+        'Ошибки проверки должны возвращаться с номерами объектов, '
+        'не прерывая загрузку остальных.'
+    )
+    async with TestingSessionLocal() as session:
+        invested_amount = await session.scalar(
+            select(CharityProject.invested_amount)
+        )
+    assert invested_amount == 30, (
+        'Созданные пожертвования должны распределяться по проектам.'
+    )
+
+
+@pytest.mark.query_budget(3)
+def test_create_donations_bulk_queries(user_client):
+    response = user_client.post(
+        BULK_DONATIONS_URL, json=[{'full_amount': 10}] * 100
+    )
+    assert len(response.json()['created']) == 100, (
+        'Все пожертвования партии должны быть созданы.'
+    )
+
+
+def test_create_donations_bulk_ndjson(user_client):
+    body = '\n'.join((
+        json.dumps({'full_amount': 10}),
+        '{not json',
+        '',
+        json.dumps({'full_amount': 30}),
+    ))
+    data = user_client.post(
+        BULK_DONATIONS_URL, data=body, headers=NDJSON_HEADERS
+    ).json()
+    assert (
+        [donation['full_amount'] for donation in data['created']],
+        [error['index'] for error in data['errors']]
+    ) == ([10, 30], [1]), (
+        'NDJSON должен разбираться построчно, а некорректная строка '
+        'должна становиться ошибкой только своего объекта.'
+    )
+
+
+@pytest.mark.parametrize('json_data, status_code', [
+    ({'full_amount': 10}, 422),
+    ([{}] * (settings.bulk_max_items + 1), 413),
+])
+def test_create_donations_bulk_invalid_body(
+    user_client, json_data, status_code
+):
+    response = user_client.post(BULK_DONATIONS_URL, json=json_data)
+    assert response.status_code == status_code, (
+        f'POST-запрос к `{BULK_DONATIONS_URL}` с телом не из массива или '
+        f'со слишком большим массивом должен вернуть {status_code}.'
+    )
+
@@ -0,0 +1,101 @@
+from conftest import TestingSessionLocal
+from sqlalchemy import delete
+
+from app.core.cache import MemoryCache
+from app.models.charity_project import CharityProject
+
+PROJECTS_URL = '/charity_project/'
+PROJECT_DATA = {
+    'name': 'Cached project',
+    'description': 'Project for cache test',
+    'full_amount': 1000,
+}
+
+
+def test_listing_not_modified(user_client, charity_project):
+    response = user_client.get(PROJECTS_URL)
+    etag = response.headers.get('etag')
+    assert etag, (
+        f'Ответ `{PROJECTS_URL}` должен содержать заголовок `ETag`.'
+    )
+    response = user_client.get(
+        PROJECTS_URL, headers={'If-None-Match': etag}
+    )
+    assert response.status_code == 304 and not response.content, (
+        'Неизменившийся список проектов должен отдаваться пустым '
+        'ответом со статус-кодом 304 по заголовку `If-None-Match`.'
+    )
+    assert response.headers.get('etag') == etag, (
+        'Ответ 304 должен содержать тот же `ETag`.'
+    )
+
+
+async def test_listing_is_served_from_cache(user_client, charity_project):
+    expected = user_client.get(PROJECTS_URL).json()
+    async with TestingSessionLocal() as session:
+        await session.execute(delete(CharityProject))
+        await session.commit()
+    assert user_client.get(PROJECTS_URL).json() == expected, (
+        'Повторный запрос списка проектов должен отдаваться из кэша '
+        'без обращения к базе данных.'
+    )
+
+
+def test_listing_invalidated_by_create(superuser_client, charity_project):
+    etag = superuser_client.get(PROJECTS_URL).headers['etag']
+    superuser_client.post(PROJECTS_URL, json=PROJECT_DATA)
+    response = superuser_client.get(
+        PROJECTS_URL, headers={'If-None-Match': etag}
+    )
+    assert response.status_code == 200, (
+        'После создания проекта старый `ETag` списка '
+        'должен перестать совпадать.'
+    )
+    assert [project['name'] for project in response.json()] == [
+        charity_project.name, PROJECT_DATA['name']
+    ], 'После создания проекта кэш списка должен быть сброшен.'
+
+
+def test_listing_invalidated_by_update_and_delete(
+    superuser_client, charity_project
+):
+    url = f'{PROJECTS_URL}{charity_project.id}'
+    superuser_client.get(PROJECTS_URL)
+    superuser_client.patch(url, json={'name': 'Renamed project'})
+    assert superuser_client.get(PROJECTS_URL).json()[0]['name'] == (
+        'Renamed project'
+    ), 'После изменения проекта кэш списка должен быть сброшен.'
+    superuser_client.delete(url)
+    assert superuser_client.get(PROJECTS_URL).json() == [], (
+        'После удаления проекта кэш списка должен быть сброшен.'
+    )
+
+
+def test_listing_invalidated_by_investing(user_client, charity_project):
+    user_client.get(PROJECTS_URL)
+    user_client.post('/donation/', json={'full_amount': 100})
+    assert user_client.get(PROJECTS_URL).json()[0]['invested_amount'] == (
+        100
+    ), 'После инвестирования кэш списка проектов должен быть сброшен.'
+
+
+async def test_memory_cache_evicts_least_recently_used():
+    cache = MemoryCache(max_size=2, ttl=None)
+    await cache.set('first', b'1')
+    await cache.set('second', b'2')
+    await cache.get('first')
+    await cache.set('third', b'3')
+    assert [
+        await cache.get(key) for key in ('first', 'second', 'third')
+    ] == [b'1', None, b'3'], (
+        'При переполнении кэш должен вытеснять давно не '
+        'использованные записи.'
+    )
+
+
+async def test_memory_cache_expires_entries():
+    cache = MemoryCache(ttl=0)
+    await cache.set('key', b'value')
+    assert await cache.get('key') is None, (
+        'Запись с истекшим временем жизни не должна отдаваться из кэша.'
+    )
@@ -0,0 +1,72 @@
+import pytest
+from test_validators import capture_statements
+
+PROJECT_URL = '/charity_project/{}'
+UPDATE_DATA = [
+    pytest.param({'full_amount': 2000000}, id='full_amount'),
+    pytest.param({'name': 'New name', 'description': 'New description'},
+                 id='name_and_description'),
+]
+
+
+@pytest.mark.parametrize('json_data', UPDATE_DATA)
+def test_patch_runs_two_queries(superuser_client, charity_project, json_data):
+    url = PROJECT_URL.format(charity_project.id)
+    with capture_statements() as statements:
+        response = superuser_client.patch(url, json=json_data)
+    assert response.status_code == 200, (
+        f'PATCH-запрос к `{url}` должен вернуть статус-код 200.'
+    )
+    assert all(
+        response.json()[field] == value for field, value in json_data.items()
+    ), f'Ответ PATCH-запроса к `{url}` должен содержать новые значения.'
+    assert [statement.split()[0] for statement in statements] == [
+        'SELECT', 'UPDATE'
+    ], (
+        'Изменение проекта должно занимать два запроса к базе данных: '
+        f'загрузку проекта со всеми проверками и UPDATE, а не {statements}.'
+    )
+
+
+def test_patch_closing_project_runs_two_queries(
+    superuser_client, charity_project_little_invested
+):
+    url = PROJECT_URL.format(charity_project_little_invested.id)
+    with capture_statements() as statements:
+        response = superuser_client.patch(url, json={'full_amount': 100})
+    assert response.json()['fully_invested'], (
+        'Проект, необходимая сумма которого стала равна вложенной, '
+        'должен закрываться.'
+    )
+    assert len(statements) == 2, (
+        'Закрытие проекта при изменении не должно требовать '
+        'отдельного commit и дополнительных запросов.'
+    )
+
+
+def test_delete_runs_two_queries(superuser_client, charity_project):
+    url = PROJECT_URL.format(charity_project.id)
+    with capture_statements() as statements:
+        response = superuser_client.delete(url)
+    assert response.json()['name'] == charity_project.name, (
+        f'DELETE-запрос к `{url}` должен вернуть удаленный проект.'
+    )
+    assert [statement.split()[0] for statement in statements] == [
+        'SELECT', 'DELETE'
+    ], (
+        'Удаление проекта должно занимать два запроса к базе данных: '
+        f'загрузку проекта со всеми проверками и DELETE, а не {statements}.'
+    )
+
+
+@pytest.mark.usefixtures('charity_project_nunchaku')
+def test_patch_duplicate_name_in_single_query(
+    superuser_client, charity_project
+):
+    url = PROJECT_URL.format(charity_project.id)
+    with capture_statements() as statements:
+        response = superuser_client.patch(url, json={'name': 'nunchaku'})
+    assert response.status_code == 400 and len(statements) == 1, (
+        'Занятость нового имени должна проверяться тем же запросом, '
+        'которым загружается изменяемый проект.'
+    )
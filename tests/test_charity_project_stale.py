@@ -0,0 +1,93 @@
+import pytest
+from conftest import TestingSessionLocal
+from sqlalchemy import update
+
+from app.api.endpoints import charity_project as charity_project_endpoints
+from app.models.charity_project import CharityProject
+
+PROJECT_DETAILS_URL = '/charity_project/{project_id}'
+
+
+def commit_investing_after_validation(
+    monkeypatch, validator_name, times, **values
+):
+    """
+    Подменяет проверку эндпоинта так, что первые times раз после
+    чтения проекта его изменяет и фиксирует другая сессия, как это
+    сделал бы параллельный проход инвестирования.
+    """
+    validate = getattr(charity_project_endpoints, validator_name)
+    calls = []
+
+    async def validate_and_invest(project_id, *args):
+        charity_project = await validate(project_id, *args)
+        if len(calls) < times:
+            calls.append(project_id)
+            async with TestingSessionLocal() as session:
+                await session.execute(
+                    update(CharityProject).where(
+                        CharityProject.id == project_id
+                    ).values(
+                        version_id=CharityProject.version_id + 1, **values
+                    )
+                )
+                await session.commit()
+        return charity_project
+
+    monkeypatch.setattr(
+        charity_project_endpoints, validator_name, validate_and_invest
+    )
+
+
+def test_update_retried_after_investing(
+    superuser_client, charity_project, monkeypatch
+):
+    commit_investing_after_validation(
+        monkeypatch, 'validate_charity_project_update', times=1
+    )
+    response = superuser_client.patch(
+        PROJECT_DETAILS_URL.format(project_id=charity_project.id),
+        json={'description': 'Новое описание'}
+    )
+    assert (response.status_code, response.json().get('description')) == (
+        200, 'Новое описание'
+    ), (
+        'Если проход инвестирования изменил проект во время PATCH-запроса, '
+        'то изменение должно повторяться по свежим данным.'
+    )
+
+
+def test_update_conflict_after_retries(
+    superuser_client, charity_project, monkeypatch
+):
+    commit_investing_after_validation(
+        monkeypatch, 'validate_charity_project_update',
+        times=charity_project_endpoints.CHARITY_PROJECT_CHANGE_ATTEMPTS
+    )
+    response = superuser_client.patch(
+        PROJECT_DETAILS_URL.format(project_id=charity_project.id),
+        json={'description': 'Новое описание'}
+    )
+    assert response.status_code == 409, (
+        'Если проект меняется параллельно при каждой попытке, '
+        'то PATCH-запрос должен вернуть статус-код 409.'
+    )
+
+
+@pytest.mark.parametrize('values, status_code', [
+    ({}, 200),
+    ({'invested_amount': 10}, 400),
+])
+def test_delete_retried_after_investing(
+    superuser_client, charity_project, monkeypatch, values, status_code
+):
+    commit_investing_after_validation(
+        monkeypatch, 'validate_charity_project_delete', times=1, **values
+    )
+    response = superuser_client.delete(
+        PROJECT_DETAILS_URL.format(project_id=charity_project.id)
+    )
+    assert response.status_code == status_code, (
+        'Если проход инвестирования изменил проект во время удаления, '
+        'то удаление должно повторяться с проверками по свежим данным.'
+    )
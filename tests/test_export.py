@@ -0,0 +1,61 @@
+import csv
+import io
+import json
+
+import pytest
+
+EXPORT_URLS = ['/donation/export', '/charity_project/export']
+
+
+@pytest.mark.usefixtures('donation', 'another_donation')
+def test_export_donations_ndjson(superuser_client):
+    response = superuser_client.get('/donation/export')
+    assert response.status_code == 200, (
+        'GET-запрос суперпользователя к `/donation/export` '
+        'должен вернуть статус-код 200.'
+    )
+    assert response.headers['content-type'].startswith(
+        'application/x-ndjson'
+    ), 'По умолчанию выгрузка должна отдаваться в формате NDJSON.'
+    rows = [json.loads(line) for line in response.text.splitlines()]
+    assert [row['full_amount'] for row in rows] == [100, 2000], (
+        'Выгрузка должна содержать по строке на каждое пожертвование '
+        'в порядке их создания.'
+    )
+    assert rows[0]['create_date'] == '2011-11-11T00:00:00', (
+        'Даты в выгрузке должны быть в формате ISO 8601.'
+    )
+
+
+@pytest.mark.usefixtures('charity_project', 'charity_project_nunchaku')
+def test_export_charity_projects_csv(superuser_client):
+    response = superuser_client.get(
+        '/charity_project/export', params={'format': 'csv'}
+    )
+    assert response.headers['content-type'].startswith('text/csv'), (
+        'Выгрузка с параметром `format=csv` должна отдаваться в формате CSV.'
+    )
+    rows = list(csv.DictReader(io.StringIO(response.text)))
+    assert [row['name'] for row in rows] == [
+        'chimichangas4life', 'nunchaku'
+    ], (
+        'CSV-выгрузка должна начинаться с заголовка и содержать '
+        'по строке на каждый проект.'
+    )
+
+
+@pytest.mark.parametrize('url', EXPORT_URLS)
+def test_export_empty_table(superuser_client, url):
+    response = superuser_client.get(url)
+    assert response.status_code == 200 and response.text == '', (
+        f'Выгрузка `{url}` пустой таблицы должна быть пустой.'
+    )
+
+
+@pytest.mark.parametrize('url', EXPORT_URLS)
+def test_export_usual_user(user_client, url):
+    response = user_client.get(url)
+    assert response.status_code == 403, (
+        f'GET-запрос обычного пользователя к `{url}` '
+        'должен вернуть статус-код 403.'
+    )
@@ -0,0 +1,56 @@
+import pytest
+
+from app.core.metrics import Histogram
+
+METRICS_URL = '/metrics'
+
+
+@pytest.mark.query_budget(1)
+@pytest.mark.usefixtures('donation', 'another_donation')
+def test_list_query_budget_and_server_timing(superuser_client):
+    response = superuser_client.get('/donation/')
+    server_timing = response.headers.get('server-timing', '')
+    assert server_timing.startswith('db;dur=') and (
+        'desc="queries: 1"' in server_timing
+    ), (
+        'Ответ должен содержать заголовок `Server-Timing` с суммарным '
+        'временем и числом SQL-запросов, выполненных при его обработке.'
+    )
+
+
+@pytest.mark.usefixtures('charity_project')
+def test_metrics_endpoint(user_client):
+    user_client.get('/charity_project/')
+    response = user_client.get(METRICS_URL)
+    assert response.status_code == 200, (
+        f'GET-запрос к `{METRICS_URL}` должен вернуть статус-код 200.'
+    )
+    assert response.headers['content-type'].startswith('text/plain'), (
+        f'`{METRICS_URL}` должен отдавать метрики в текстовом формате '
+        'Prometheus.'
+    )
+    for line in (
+        '# TYPE db_queries_total counter',
+        '# TYPE db_query_duration_seconds histogram',
+        'db_query_duration_seconds_bucket{le="+Inf"}',
+        'db_slowest_query_duration_seconds{statement="',
+    ):
+        assert line in response.text, (
+            f'Метрики `{METRICS_URL}` должны содержать строку `{line}`.'
+        )
+
+
+def test_histogram_render():
+    histogram = Histogram('test_seconds', 'Test.', buckets=(0.1, 1.0))
+    histogram.observe(0.05)
+    histogram.observe(0.5)
+    histogram.observe(5)
+    assert histogram.render() == [
+        '# HELP test_seconds Test.',
+        '# TYPE test_seconds histogram',
+        'test_seconds_bucket{le="0.1"} 1',
+        'test_seconds_bucket{le="1.0"} 2',
+        'test_seconds_bucket{le="+Inf"} 3',
+        'test_seconds_sum 5.55',
+        'test_seconds_count 3',
+    ], 'Гистограмма должна отдавать накопленные бакеты, сумму и число.'
@@ -0,0 +1,124 @@
+import asyncio
+import multiprocessing
+import random
+
+import pytest
+from conftest import SQLALCHEMY_DATABASE_URL, TestingSessionLocal
+from sqlalchemy import func, or_, select
+from sqlalchemy.dialects import postgresql
+from sqlalchemy.exc import OperationalError
+from sqlalchemy.ext.asyncio import AsyncSession, create_async_engine
+from sqlalchemy.orm import sessionmaker
+
+from app.models.allocation import Allocation
+from app.models.charity_project import CharityProject
+from app.models.donation import Donation
+from app.services.money_transaction import (
+    INVESTING_ENGINES, select_open_queue
+)
+
+PROCESSES_COUNT = 4
+ITERATIONS_COUNT = 25
+RETRY_ATTEMPTS = 50
+BUSY_TIMEOUT = 30
+PROJECT_SHARE = 0.3
+
+
+async def commit_with_retry(session):
+    for attempt in range(1, RETRY_ATTEMPTS + 1):
+        try:
+            return await session.commit()
+        except OperationalError:
+            await session.rollback()
+            if attempt == RETRY_ATTEMPTS:
+                raise
+
+
+async def simulate_traffic(engine_name, seed):
+    """
+    Имитирует поток пожертвований и проектов в отдельном процессе:
+    каждый созданный объект сразу запускает проход инвестирования.
+    """
+    engine = create_async_engine(
+        SQLALCHEMY_DATABASE_URL, connect_args={'timeout': BUSY_TIMEOUT}
+    )
+    session_factory = sessionmaker(engine, class_=AsyncSession)
+    mechanism = INVESTING_ENGINES[engine_name]()
+    generator = random.Random(seed)
+    for index in range(ITERATIONS_COUNT):
+        async with session_factory() as session:
+            if generator.random() < PROJECT_SHARE:
+                session.add(CharityProject(
+                    name=f'project_{seed}_{index}',
+                    description='Project for concurrency test',
+                    full_amount=generator.randint(100, 1000),
+                ))
+            else:
+                session.add(Donation(full_amount=generator.randint(1, 300)))
+            await commit_with_retry(session)
+            await mechanism.launch_investing_with_retry(
+                session, attempts=RETRY_ATTEMPTS
+            )
+    await engine.dispose()
+
+
+def run_traffic_process(engine_name, seed):
+    asyncio.run(simulate_traffic(engine_name, seed))
+
+
+@pytest.mark.parametrize('engine_name', list(INVESTING_ENGINES))
+async def test_parallel_investing_conserves_money(engine_name):
+    context = multiprocessing.get_context('spawn')
+    processes = [
+        context.Process(target=run_traffic_process, args=(engine_name, seed))
+        for seed in range(PROCESSES_COUNT)
+    ]
+    for process in processes:
+        process.start()
+    for process in processes:
+        await asyncio.to_thread(process.join)
+    assert all(process.exitcode == 0 for process in processes), (
+        'Параллельные проходы инвестирования должны завершаться без '
+        'ошибок, повторяя транзакцию при конфликте версий.'
+    )
+    async with TestingSessionLocal() as session:
+        invested_totals = [
+            await session.scalar(select(func.sum(model.invested_amount)))
+            for model in (CharityProject, Donation)
+        ]
+        allocated_total = await session.scalar(
+            select(func.sum(Allocation.amount))
+        )
+        broken_objects_count = sum([
+            await session.scalar(select(func.count(model.id)).where(or_(
+                model.invested_amount > model.full_amount,
+                model.fully_invested != (
+                    model.invested_amount == model.full_amount
+                )
+            )))
+            for model in (CharityProject, Donation)
+        ])
+    assert invested_totals[0] == invested_totals[1], (
+        'Сумма, вложенная в проекты, должна совпадать с суммой, '
+        'потраченной из пожертвований, при параллельных проходах.'
+    )
+    assert allocated_total == invested_totals[0], (
+        'Журнал распределения должен содержать каждый перевод '
+        'параллельных проходов ровно один раз.'
+    )
+    assert broken_objects_count == 0, (
+        'Параллельные проходы не должны вкладывать в объект больше '
+        'его необходимой суммы.'
+    )
+
+
+@pytest.mark.parametrize('model', [CharityProject, Donation])
+def test_open_queue_lock_waits_for_other_passes(model):
+    statement = str(select_open_queue(model).compile(
+        dialect=postgresql.dialect()
+    ))
+    assert 'FOR UPDATE' in statement and 'SKIP LOCKED' not in statement, (
+        'Очереди должны блокироваться ожидающим FOR UPDATE: с SKIP LOCKED '
+        'проход, начатый во время другого, видит пустую очередь '
+        'и не распределяет новые объекты.'
+    )
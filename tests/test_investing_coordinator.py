@@ -0,0 +1,130 @@
+import asyncio
+
+from conftest import TestingSessionLocal
+
+from app.models.charity_project import CharityProject
+from app.services.investing_coordinator import SingleFlightInvesting
+from app.services.money_transaction import TransactionInvesting
+from test_investing_engines import (
+    build_expected_state, create_queues, get_invested_state
+)
+
+PROJECT_AMOUNTS = [300, 400]
+DONATION_AMOUNTS = [100] * 8
+CONCURRENT_REQUESTS_COUNT = 8
+STATS_URL = '/investing/stats'
+
+
+async def launch_in_own_session(coordinator):
+    async with TestingSessionLocal() as session:
+        await coordinator.launch_investing_proccess(session)
+
+
+async def test_concurrent_launches_are_merged():
+    async with TestingSessionLocal() as session:
+        await create_queues(session, PROJECT_AMOUNTS, DONATION_AMOUNTS)
+    coordinator = SingleFlightInvesting(TransactionInvesting())
+    await asyncio.gather(*(
+        launch_in_own_session(coordinator)
+        for _ in range(CONCURRENT_REQUESTS_COUNT)
+    ))
+    assert coordinator.runs_count == 2, (
+        'Одновременные запросы должны давать не больше двух проходов '
+        'инвестирования: текущий и один следующий.'
+    )
+    assert coordinator.merged_count == CONCURRENT_REQUESTS_COUNT - 2, (
+        'Запросы, пришедшие во время прохода, должны присоединяться '
+        'к следующему проходу.'
+    )
+    async with TestingSessionLocal() as session:
+        assert await get_invested_state(session, CharityProject) == (
+            build_expected_state(PROJECT_AMOUNTS, DONATION_AMOUNTS)
+        ), 'Объединение запусков не должно влиять на распределение денег.'
+
+
+class BlockingMechanism:
+    """Механизм-заглушка, проходы которого ждут события release."""
+
+    def __init__(self):
+        self.release = asyncio.Event()
+        self.passes_count = 0
+
+    async def launch_investing_with_retry(self, session):
+        self.passes_count += 1
+        await self.release.wait()
+
+
+async def test_cancelled_next_leader_hands_off():
+    mechanism = BlockingMechanism()
+    coordinator = SingleFlightInvesting(mechanism)
+    current = asyncio.create_task(coordinator.launch_investing_proccess(None))
+    await asyncio.sleep(0)
+    next_leader = asyncio.create_task(
+        coordinator.launch_investing_proccess(None)
+    )
+    await asyncio.sleep(0)
+    merged = asyncio.create_task(coordinator.launch_investing_proccess(None))
+    await asyncio.sleep(0)
+    next_leader.cancel()
+    await asyncio.sleep(0)
+    mechanism.release.set()
+    await asyncio.wait_for(asyncio.gather(current, merged), timeout=1)
+    await asyncio.wait_for(
+        coordinator.launch_investing_proccess(None), timeout=1
+    )
+    assert (next_leader.cancelled(), mechanism.passes_count) == (True, 3), (
+        'Если ведущий следующего прохода отменен, то присоединившийся '
+        'к нему запрос должен сам выполнить проход, а последующие '
+        'запросы не должны зависать.'
+    )
+
+
+class FailingSecondPassMechanism(BlockingMechanism):
+    """Механизм-заглушка, второй проход которого завершается ошибкой."""
+
+    async def launch_investing_with_retry(self, session):
+        await super().launch_investing_with_retry(session)
+        if self.passes_count == 2:
+            raise RuntimeError('pass failed')
+
+
+async def test_failed_merged_run_is_repeated_for_followers():
+    mechanism = FailingSecondPassMechanism()
+    coordinator = SingleFlightInvesting(mechanism)
+    tasks = []
+    for _ in range(3):
+        tasks.append(asyncio.create_task(
+            coordinator.launch_investing_proccess(None)
+        ))
+        await asyncio.sleep(0)
+    mechanism.release.set()
+    results = await asyncio.wait_for(
+        asyncio.gather(*tasks, return_exceptions=True), timeout=1
+    )
+    assert (
+        [type(result) for result in results], mechanism.passes_count
+    ) == ([type(None), RuntimeError, type(None)], 3), (
+        'Если проход, к которому присоединился запрос, завершился '
+        'ошибкой, то запрос должен выполнить проход заново, '
+        'а не считать деньги распределенными.'
+    )
+
+
+def test_get_investing_stats(superuser_client):
+    response = superuser_client.get(STATS_URL)
+    assert response.status_code == 200, (
+        f'GET-запрос суперпользователя к `{STATS_URL}` '
+        'должен вернуть статус-код 200.'
+    )
+    assert 'merged_count' in response.json(), (
+        f'Ответ `{STATS_URL}` должен содержать счетчик '
+        'объединенных запусков `merged_count`.'
+    )
+
+
+def test_get_investing_stats_usual_user(user_client):
+    response = user_client.get(STATS_URL)
+    assert response.status_code == 403, (
+        f'GET-запрос обычного пользователя к `{STATS_URL}` '
+        'должен вернуть статус-код 403.'
+    )
@@ -0,0 +1,254 @@
+import random
+from datetime import datetime, timedelta
+from itertools import accumulate
+
+import pytest
+from conftest import TestingSessionLocal
+from sqlalchemy import delete, select
+
+from app.models.allocation import Allocation
+from app.models.charity_project import CharityProject
+from app.models.donation import Donation
+from app.services.money_transaction import (
+    BulkTransactionInvesting, IncrementalTransactionInvesting,
+    SQLTransactionInvesting, TransactionInvesting
+)
+
+START_DATE = datetime(2010, 10, 10)
+INVESTING_ENGINES = [
+    pytest.param(TransactionInvesting(), id='two_pointers'),
+    pytest.param(IncrementalTransactionInvesting(), id='incremental'),
+    pytest.param(IncrementalTransactionInvesting(chunk_size=2),
+                 id='incremental_small_chunks'),
+    pytest.param(BulkTransactionInvesting(), id='bulk'),
+    pytest.param(SQLTransactionInvesting(), id='sql'),
+]
+INVESTING_CASES = [
+    pytest.param([1000], [100, 200], id='donations_less_than_project'),
+    pytest.param([100, 200], [1000], id='donation_covers_projects'),
+    pytest.param([300, 300], [100, 200, 300], id='exact_match'),
+    pytest.param([5, 7, 11, 13], [3, 3, 3, 3, 3, 3, 3, 3, 3, 3, 6],
+                 id='many_small_donations'),
+    pytest.param([50], [], id='no_donations'),
+    pytest.param([], [50], id='no_projects'),
+]
+
+
+def expected_invested_amounts(own_amounts, other_amounts):
+    """
+    Эталонное распределение денег по очереди: объект получает
+    пересечение своего отрезка префиксных сумм с общей суммой
+    противоположной очереди.
+    """
+    other_total = sum(other_amounts)
+    return [
+        max(0, min(end, other_total) - (end - amount))
+        for amount, end in zip(own_amounts, accumulate(own_amounts))
+    ]
+
+
+def expected_allocations(project_amounts, donation_amounts):
+    """
+    Эталонный журнал распределения: пожертвование переводит в проект
+    длину пересечения их отрезков префиксных сумм.
+    Объекты задаются номерами в очереди.
+    """
+    allocations = []
+    for project_index, (project_amount, project_end) in enumerate(
+        zip(project_amounts, accumulate(project_amounts))
+    ):
+        for donation_index, (donation_amount, donation_end) in enumerate(
+            zip(donation_amounts, accumulate(donation_amounts))
+        ):
+            amount = min(project_end, donation_end) - max(
+                project_end - project_amount, donation_end - donation_amount
+            )
+            if amount > 0:
+                allocations.append((project_index, donation_index, amount))
+    return allocations
+
+
+async def create_queues(
+    session, project_amounts, donation_amounts,
+    project_invested=None, donation_invested=None, same_create_date=False
+):
+    minutes = 0 if same_create_date else 1
+    project_invested = project_invested or [0] * len(project_amounts)
+    donation_invested = donation_invested or [0] * len(donation_amounts)
+    for index, (amount, invested) in enumerate(
+        zip(project_amounts, project_invested)
+    ):
+        session.add(CharityProject(
+            name=f'project_{index}',
+            description='Project for investing test',
+            full_amount=amount,
+            invested_amount=invested,
+            fully_invested=False,
+            create_date=START_DATE + timedelta(minutes=index * minutes),
+        ))
+    for index, (amount, invested) in enumerate(
+        zip(donation_amounts, donation_invested)
+    ):
+        session.add(Donation(
+            full_amount=amount,
+            invested_amount=invested,
+            fully_invested=False,
+            create_date=START_DATE + timedelta(minutes=index * minutes),
+        ))
+    await session.commit()
+
+
+async def get_invested_state(session, model):
+    objects = await session.execute(
+        select(
+            model.full_amount, model.invested_amount, model.fully_invested
+        ).order_by(model.create_date, model.id)
+    )
+    return [tuple(row) for row in objects.all()]
+
+
+async def get_allocations(session):
+    """
+    Возвращает журнал распределения, заменив идентификаторы
+    объектов их номерами в очереди.
+    """
+    positions = {}
+    for model in (CharityProject, Donation):
+        ids = await session.scalars(
+            select(model.id).order_by(model.create_date, model.id)
+        )
+        positions[model] = {
+            obj_id: index for index, obj_id in enumerate(ids.all())
+        }
+    allocations = await session.execute(
+        select(
+            Allocation.project_id, Allocation.donation_id, Allocation.amount
+        )
+    )
+    return sorted(
+        (
+            positions[CharityProject][project_id],
+            positions[Donation][donation_id],
+            amount
+        )
+        for project_id, donation_id, amount in allocations.all()
+    )
+
+
+def build_expected_state(own_amounts, other_amounts):
+    return [
+        (amount, invested, amount == invested)
+        for amount, invested in zip(
+            own_amounts,
+            expected_invested_amounts(own_amounts, other_amounts)
+        )
+    ]
+
+
+@pytest.mark.parametrize('engine', INVESTING_ENGINES)
+@pytest.mark.parametrize('project_amounts, donation_amounts', INVESTING_CASES)
+async def test_investing_engine_distribution(
+    engine, project_amounts, donation_amounts
+):
+    async with TestingSessionLocal() as session:
+        await create_queues(session, project_amounts, donation_amounts)
+        await engine.launch_investing_proccess(session)
+    async with TestingSessionLocal() as session:
+        projects = await get_invested_state(session, CharityProject)
+        donations = await get_invested_state(session, Donation)
+        allocations = await get_allocations(session)
+    assert projects == build_expected_state(
+        project_amounts, donation_amounts
+    ), (
+        'Механизм инвестирования должен распределять пожертвования '
+        'по проектам в порядке их создания.'
+    )
+    assert donations == build_expected_state(
+        donation_amounts, project_amounts
+    ), (
+        'Механизм инвестирования должен расходовать пожертвования '
+        'в порядке их создания.'
+    )
+    assert allocations == expected_allocations(
+        project_amounts, donation_amounts
+    ), (
+        'Механизм инвестирования должен записывать в журнал '
+        'распределения каждый перевод из пожертвования в проект.'
+    )
+
+
+def generate_queue(generator, size):
+    amounts = [generator.randint(1, 1000) for _ in range(size)]
+    invested = [generator.randint(0, amount - 1) for amount in amounts]
+    return amounts, invested
+
+
+async def run_engine_on_queues(engine, projects, donations):
+    async with TestingSessionLocal() as session:
+        await session.execute(delete(Allocation))
+        await session.execute(delete(CharityProject))
+        await session.execute(delete(Donation))
+        await session.commit()
+        await create_queues(
+            session, projects[0], donations[0], projects[1], donations[1]
+        )
+        await engine.launch_investing_proccess(session)
+    async with TestingSessionLocal() as session:
+        return (
+            await get_invested_state(session, CharityProject),
+            await get_invested_state(session, Donation),
+            await get_allocations(session),
+        )
+
+
+@pytest.mark.parametrize('engine', INVESTING_ENGINES[1:])
+@pytest.mark.parametrize('seed', range(5))
+async def test_investing_engine_matches_two_pointers(engine, seed):
+    generator = random.Random(seed)
+    projects = generate_queue(generator, generator.randint(1, 30))
+    donations = generate_queue(generator, generator.randint(1, 60))
+    expected = await run_engine_on_queues(
+        TransactionInvesting(), projects, donations
+    )
+    assert await run_engine_on_queues(engine, projects, donations) == (
+        expected
+    ), (
+        'Результат механизма инвестирования должен совпадать с результатом '
+        'и журналом распределения алгоритма "Двух указателей" '
+        'для частично инвестированных очередей.'
+    )
+
+
+@pytest.mark.parametrize('engine', INVESTING_ENGINES)
+async def test_investing_without_retry_attempts(engine):
+    async with TestingSessionLocal() as session:
+        await create_queues(session, [100], [60, 40])
+        amount = await engine.launch_investing_with_retry(session, attempts=0)
+    assert amount == 100, (
+        'Проход инвестирования должен выполняться хотя бы один раз, '
+        'даже если повторы отключены.'
+    )
+
+
+@pytest.mark.parametrize('engine', INVESTING_ENGINES)
+async def test_investing_engine_same_create_date(engine):
+    project_amounts, donation_amounts = [5, 7, 11], [3, 3, 3, 3, 3, 4]
+    async with TestingSessionLocal() as session:
+        await create_queues(
+            session, project_amounts, donation_amounts, same_create_date=True
+        )
+        await engine.launch_investing_proccess(session)
+    async with TestingSessionLocal() as session:
+        state = (
+            await get_invested_state(session, CharityProject),
+            await get_invested_state(session, Donation),
+            await get_allocations(session),
+        )
+    assert state == (
+        build_expected_state(project_amounts, donation_amounts),
+        build_expected_state(donation_amounts, project_amounts),
+        expected_allocations(project_amounts, donation_amounts),
+    ), (
+        'Объекты, созданные одной партией с одинаковой датой, '
+        'должны распределяться в порядке идентификаторов.'
+    )
@@ -0,0 +1,101 @@
+import pytest
+from conftest import TestingSessionLocal
+from test_investing_engines import INVESTING_ENGINES, create_queues
+
+from app.services.investing_metrics import (
+    EARLY_EXIT_NO_CHARITY_PROJECTS, EARLY_EXIT_NO_DONATIONS,
+    investing_amount_transferred, investing_commit_duration_seconds,
+    investing_early_exits_total, investing_rows_closed_total,
+    investing_rows_loaded, investing_run_duration_seconds
+)
+
+
+def get_run_metrics(engine):
+    return {
+        'runs': investing_run_duration_seconds.get_count(engine=engine.name),
+        'commits': investing_commit_duration_seconds.get_count(
+            engine=engine.name
+        ),
+        'amount': investing_amount_transferred.get_sum(engine=engine.name),
+        'loaded': investing_rows_loaded.get_sum(
+            engine=engine.name, queue='donation'
+        ),
+        'closed': investing_rows_closed_total.get(
+            engine=engine.name, queue='charity_project'
+        ),
+    }
+
+
+@pytest.mark.parametrize('engine', INVESTING_ENGINES)
+async def test_investing_run_metrics(engine):
+    before = get_run_metrics(engine)
+    async with TestingSessionLocal() as session:
+        await create_queues(session, [100, 200], [150, 30])
+        amount = await engine.launch_investing_proccess(session)
+    after = get_run_metrics(engine)
+    assert amount == 180, (
+        'Проход инвестирования должен возвращать переведенную сумму.'
+    )
+    assert after['runs'] == before['runs'] + 1, (
+        'Каждый проход инвестирования должен учитываться '
+        'в гистограмме длительности.'
+    )
+    assert after['commits'] == before['commits'] + 1, (
+        'Длительность commit прохода должна учитываться в метриках.'
+    )
+    assert after['amount'] == before['amount'] + amount, (
+        'Переведенная за проход сумма должна учитываться в метриках.'
+    )
+    if engine.name != 'sql':
+        assert after['loaded'] == before['loaded'] + 2, (
+            'Число загруженных объектов очереди должно учитываться '
+            'в метриках.'
+        )
+        assert after['closed'] == before['closed'] + 1, (
+            'Число закрытых проходом объектов должно учитываться '
+            'в метриках.'
+        )
+
+
+@pytest.mark.parametrize('engine', INVESTING_ENGINES)
+@pytest.mark.parametrize('project_amounts, donation_amounts, reason', [
+    pytest.param([50], [], EARLY_EXIT_NO_DONATIONS, id='no_donations'),
+    pytest.param([], [50], EARLY_EXIT_NO_CHARITY_PROJECTS, id='no_projects'),
+])
+async def test_investing_early_exit_metrics(
+    engine, project_amounts, donation_amounts, reason
+):
+    early_exits = investing_early_exits_total.get(
+        engine=engine.name, reason=reason
+    )
+    commits = investing_commit_duration_seconds.get_count(engine=engine.name)
+    async with TestingSessionLocal() as session:
+        await create_queues(session, project_amounts, donation_amounts)
+        await engine.launch_investing_proccess(session)
+    assert investing_early_exits_total.get(
+        engine=engine.name, reason=reason
+    ) == early_exits + 1, (
+        'Проход, завершенный без перевода денег, должен учитываться '
+        'в метриках вместе с причиной.'
+    )
+    assert investing_commit_duration_seconds.get_count(
+        engine=engine.name
+    ) == commits, 'Проход без перевода денег не должен выполнять commit.'
+
+
+@pytest.mark.usefixtures('charity_project')
+def test_investing_metrics_exposed(user_client):
+    user_client.post('/donation/', json={'full_amount': 10})
+    response = user_client.get('/metrics')
+    for line in (
+        '# TYPE investing_run_duration_seconds histogram',
+        '# TYPE investing_rows_loaded histogram',
+        '# TYPE investing_rows_closed_total counter',
+        '# TYPE investing_amount_transferred histogram',
+        '# TYPE investing_commit_duration_seconds histogram',
+        '# TYPE investing_early_exits_total counter',
+        'investing_run_duration_seconds_count{engine="',
+    ):
+        assert line in response.text, (
+            f'Метрики `/metrics` должны содержать строку `{line}`.'
+        )
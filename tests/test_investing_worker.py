@@ -0,0 +1,74 @@
+import asyncio
+
+from conftest import TestingSessionLocal
+
+from app.models.charity_project import CharityProject
+from app.models.donation import Donation
+from app.services.investing_worker import InvestingWorker
+from app.services.money_transaction import TransactionInvesting
+from test_investing_engines import (
+    build_expected_state, create_queues, get_invested_state
+)
+
+PROJECT_AMOUNTS = [500, 700]
+DONATION_AMOUNTS = [100] * 10
+NOTIFICATIONS_COUNT = 10
+
+
+async def test_worker_coalesces_notifications():
+    worker = InvestingWorker(
+        TransactionInvesting(), TestingSessionLocal, batch_delay=0.01
+    )
+    await worker.start()
+    async with TestingSessionLocal() as session:
+        await create_queues(session, PROJECT_AMOUNTS, DONATION_AMOUNTS)
+    for _ in range(NOTIFICATIONS_COUNT):
+        worker.notify()
+    await worker.stop()
+    assert worker.passes_count < NOTIFICATIONS_COUNT, (
+        'Фоновый воркер должен объединять уведомления, пришедшие '
+        'за время ожидания, в один проход инвестирования.'
+    )
+    async with TestingSessionLocal() as session:
+        assert await get_invested_state(session, CharityProject) == (
+            build_expected_state(PROJECT_AMOUNTS, DONATION_AMOUNTS)
+        ), (
+            'После остановки фонового воркера все уведомления '
+            'должны быть обработаны.'
+        )
+        assert await get_invested_state(session, Donation) == (
+            build_expected_state(DONATION_AMOUNTS, PROJECT_AMOUNTS)
+        ), (
+            'После остановки фонового воркера все уведомления '
+            'должны быть обработаны.'
+        )
+
+
+class FailingFirstPassMechanism:
+    """Механизм-заглушка, первый проход которого завершается ошибкой."""
+
+    def __init__(self):
+        self.passes_count = 0
+        self.second_pass = asyncio.Event()
+
+    async def launch_investing_with_retry(self, session):
+        self.passes_count += 1
+        if self.passes_count == 1:
+            raise RuntimeError('pass failed')
+        self.second_pass.set()
+
+
+async def test_worker_retries_failed_pass():
+    mechanism = FailingFirstPassMechanism()
+    worker = InvestingWorker(
+        mechanism, TestingSessionLocal, batch_delay=0, retry_delay=0.01
+    )
+    await worker.start()
+    try:
+        await asyncio.wait_for(mechanism.second_pass.wait(), timeout=1)
+    finally:
+        await worker.stop()
+    assert (mechanism.passes_count, worker.notifications_count) == (2, 0), (
+        'Проход, завершившийся ошибкой, должен повторяться '
+        'без нового уведомления.'
+    )
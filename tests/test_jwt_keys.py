@@ -0,0 +1,92 @@
+import jwt
+import pytest
+from cryptography.hazmat.primitives.asymmetric import ed25519, rsa
+from cryptography.hazmat.primitives.serialization import (
+    Encoding, NoEncryption, PrivateFormat
+)
+
+from app.api.endpoints import user as user_endpoints
+from app.core.config import Settings
+from app.core.jwt_keys import load_jwt_keys
+from app.core.user import PrincipalJWTStrategy
+from app.models.user import User
+
+JWKS_URL = '/.well-known/jwks.json'
+PRINCIPAL = User(
+    id=7, email='signed@example.com', hashed_password='',
+    is_active=True, is_superuser=False, is_verified=False
+)
+KEY_FACTORIES = {
+    'RS256': lambda: rsa.generate_private_key(
+        public_exponent=65537, key_size=2048
+    ),
+    'EdDSA': ed25519.Ed25519PrivateKey.generate,
+}
+
+
+def write_private_key(path, algorithm):
+    path.write_bytes(KEY_FACTORIES[algorithm]().private_bytes(
+        Encoding.PEM, PrivateFormat.PKCS8, NoEncryption()
+    ))
+    return str(path)
+
+
+@pytest.fixture(params=list(KEY_FACTORIES))
+def asymmetric_keys(request, tmp_path):
+    return load_jwt_keys(Settings(
+        jwt_algorithm=request.param,
+        jwt_private_key_file=write_private_key(
+            tmp_path / 'private.pem', request.param
+        )
+    ))
+
+
+async def test_token_verified_with_jwks(asymmetric_keys):
+    token = await PrincipalJWTStrategy(asymmetric_keys, 60).write_token(
+        PRINCIPAL
+    )
+    jwk, = asymmetric_keys.get_jwks()['keys']
+    assert 'd' not in jwk, 'JWKS не должен содержать закрытый ключ.'
+    assert jwt.get_unverified_header(token)['kid'] == jwk['kid'], (
+        'Заголовок токена должен содержать идентификатор ключа из JWKS.'
+    )
+    data = jwt.decode(
+        token, jwt.PyJWK(jwk).key, algorithms=[jwk['alg']],
+        audience=['fastapi-users:auth']
+    )
+    assert data['user_id'] == str(PRINCIPAL.id), (
+        'Токен должен проверяться открытым ключом из JWKS.'
+    )
+
+
+def test_wrong_key_type(tmp_path):
+    with pytest.raises(ValueError):
+        load_jwt_keys(Settings(
+            jwt_algorithm='EdDSA',
+            jwt_private_key_file=write_private_key(
+                tmp_path / 'private.pem', 'RS256'
+            )
+        ))
+
+
+@pytest.mark.parametrize('config', [
+    Settings(jwt_algorithm='none'),
+    Settings(jwt_algorithm='RS256'),
+])
+def test_invalid_signing_settings(config):
+    with pytest.raises(ValueError):
+        load_jwt_keys(config)
+
+
+def test_jwks_endpoint(test_client, asymmetric_keys, monkeypatch):
+    assert test_client.get(JWKS_URL).json() == {'keys': []}, (
+        'При подписи HS256 JWKS не должен публиковать ключи.'
+    )
+    monkeypatch.setattr(user_endpoints, 'jwt_signing_keys', asymmetric_keys)
+    response = test_client.get(JWKS_URL)
+    assert response.status_code == 200, (
+        f'GET-запрос к `{JWKS_URL}` должен вернуть статус-код 200.'
+    )
+    assert response.json() == asymmetric_keys.get_jwks(), (
+        f'`{JWKS_URL}` должен отдавать открытые ключи подписи JWT.'
+    )
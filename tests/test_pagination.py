@@ -0,0 +1,130 @@
+from datetime import datetime, timedelta
+
+import pytest
+
+from app.api.pagination import NEXT_CURSOR_HEADER
+
+PAGE_SIZE = 2
+OBJECTS_COUNT = 5
+START_DATE = datetime(2010, 10, 10)
+
+
+@pytest.fixture
+def many_charity_projects(mixer):
+    return [
+        mixer.blend(
+            'app.models.charity_project.CharityProject',
+            name=f'project_{index}',
+            description='Project for pagination test',
+            full_amount=1000,
+            create_date=START_DATE + timedelta(days=index // 2),
+        )
+        for index in range(OBJECTS_COUNT)
+    ]
+
+
+@pytest.fixture
+def many_donations(mixer):
+    return [
+        mixer.blend(
+            'app.models.donation.Donation',
+            user_id=1,
+            full_amount=100,
+            create_date=START_DATE + timedelta(days=index // 2),
+        )
+        for index in range(OBJECTS_COUNT)
+    ]
+
+
+@pytest.fixture
+def many_user_donations(mixer):
+    """Пожертвования пользователя user_client и одно чужое."""
+    mixer.blend(
+        'app.models.donation.Donation',
+        user_id=1,
+        full_amount=100,
+        create_date=START_DATE,
+    )
+    return [
+        mixer.blend(
+            'app.models.donation.Donation',
+            user_id=2,
+            full_amount=100,
+            create_date=START_DATE + timedelta(days=index // 2),
+        )
+        for index in range(OBJECTS_COUNT)
+    ]
+
+
+def collect_pages(client, url):
+    pages = []
+    params = {'limit': PAGE_SIZE}
+    while True:
+        response = client.get(url, params=params)
+        assert response.status_code == 200, (
+            f'GET-запрос страницы к `{url}` должен вернуть статус-код 200.'
+        )
+        pages.append([obj['id'] for obj in response.json()])
+        cursor = response.headers.get(NEXT_CURSOR_HEADER)
+        if cursor is None:
+            return pages
+        params['cursor'] = cursor
+
+
+@pytest.mark.parametrize('client_name, url, objects_fixture', [
+    ('user_client', '/charity_project/', 'many_charity_projects'),
+    ('superuser_client', '/donation/', 'many_donations'),
+])
+def test_keyset_pagination(request, client_name, url, objects_fixture):
+    client = request.getfixturevalue(client_name)
+    objects = request.getfixturevalue(objects_fixture)
+    pages = collect_pages(client, url)
+    assert [len(page) for page in pages] == [2, 2, 1], (
+        f'Список `{url}` должен отдаваться страницами по `limit` объектов, '
+        f'а у последней страницы не должно быть заголовка '
+        f'`{NEXT_CURSOR_HEADER}`.'
+    )
+    assert sum(pages, []) == [obj.id for obj in objects], (
+        f'Страницы `{url}` должны без пропусков и повторов перечислять '
+        'объекты в порядке (create_date, id).'
+    )
+
+
+def test_user_donations_newest_first(user_client, many_user_donations):
+    pages = collect_pages(user_client, '/donation/my')
+    assert [len(page) for page in pages] == [2, 2, 1], (
+        'Список `/donation/my` должен отдаваться страницами '
+        'по `limit` пожертвований.'
+    )
+    assert sum(pages, []) == [
+        donation.id for donation in reversed(many_user_donations)
+    ], (
+        'Страницы `/donation/my` должны без пропусков и повторов '
+        'перечислять только пожертвования пользователя от новых '
+        'к старым.'
+    )
+
+
+@pytest.mark.usefixtures('many_charity_projects')
+def test_pagination_default_limit_returns_all(user_client):
+    response = user_client.get('/charity_project/')
+    assert len(response.json()) == OBJECTS_COUNT, (
+        'Без параметров пагинации небольшой список должен '
+        'возвращаться целиком.'
+    )
+    assert NEXT_CURSOR_HEADER not in response.headers, (
+        'Для единственной страницы не должен передаваться курсор.'
+    )
+
+
+@pytest.mark.parametrize('params, status_code', [
+    ({'cursor': 'not-a-cursor'}, 400),
+    ({'limit': 0}, 422),
+    ({'limit': 100000}, 422),
+])
+def test_pagination_invalid_params(user_client, params, status_code):
+    response = user_client.get('/charity_project/', params=params)
+    assert response.status_code == status_code, (
+        f'GET-запрос к `/charity_project/` с параметрами {params} '
+        f'должен вернуть статус-код {status_code}.'
+    )
@@ -0,0 +1,100 @@
+import asyncio
+import threading
+import time
+
+from app.services.password_hashing import (
+    OPERATION_HASH, OPERATION_VERIFY, PasswordHashingService,
+    password_hash_duration_seconds
+)
+
+REGISTER_URL = '/auth/register'
+LOGIN_URL = '/auth/jwt/login'
+USER_ME_URL = '/users/me'
+EMAIL = 'hasher@example.com'
+PASSWORD = 'correct-horse'
+NEW_PASSWORD = 'battery-staple'
+
+
+def login(client, password):
+    return client.post(
+        LOGIN_URL, data={'username': EMAIL, 'password': password}
+    )
+
+
+def test_register_and_login_hash_in_pool(test_client):
+    hashed_before = password_hash_duration_seconds.get_count(
+        operation=OPERATION_HASH
+    )
+    verified_before = password_hash_duration_seconds.get_count(
+        operation=OPERATION_VERIFY
+    )
+    test_client.post(REGISTER_URL, json={
+        'email': EMAIL, 'password': PASSWORD
+    })
+    assert login(test_client, PASSWORD).status_code == 200, (
+        'Пользователь должен входить с паролем, указанным при регистрации.'
+    )
+    assert login(test_client, NEW_PASSWORD).status_code == 400, (
+        'Вход с неверным паролем должен вернуть статус-код 400.'
+    )
+    assert (
+        password_hash_duration_seconds.get_count(operation=OPERATION_HASH),
+        password_hash_duration_seconds.get_count(operation=OPERATION_VERIFY)
+    ) == (hashed_before + 1, verified_before + 2), (
+        'Хеширование и проверки паролей должны учитываться в метриках.'
+    )
+
+
+def test_password_update_hashed_in_pool(test_client):
+    test_client.post(REGISTER_URL, json={
+        'email': EMAIL, 'password': PASSWORD
+    })
+    token = login(test_client, PASSWORD).json()['access_token']
+    response = test_client.patch(
+        USER_ME_URL, json={'password': NEW_PASSWORD},
+        headers={'Authorization': f'Bearer {token}'}
+    )
+    assert response.status_code == 200, (
+        f'PATCH-запрос к `{USER_ME_URL}` должен вернуть статус-код 200.'
+    )
+    assert (
+        login(test_client, PASSWORD).status_code,
+        login(test_client, NEW_PASSWORD).status_code
+    ) == (400, 200), 'После смены пароля вход возможен только с новым.'
+
+
+async def test_hashing_runs_outside_event_loop_thread():
+    service = PasswordHashingService(workers=1)
+    try:
+        thread_id = await service.run(OPERATION_HASH, threading.get_ident)
+    finally:
+        service.shutdown()
+    assert thread_id != threading.get_ident(), (
+        'Хеширование должно выполняться вне потока event loop.'
+    )
+
+
+async def test_hashing_concurrency_limit():
+    service = PasswordHashingService(workers=4, max_concurrency=2)
+    lock = threading.Lock()
+    running = []
+    peak = []
+
+    def work():
+        with lock:
+            running.append(1)
+            peak.append(len(running))
+        time.sleep(0.02)
+        with lock:
+            running.pop()
+
+    try:
+        await asyncio.gather(*(
+            service.run(OPERATION_HASH, work) for _ in range(8)
+        ))
+    finally:
+        service.shutdown()
+    assert max(peak) == 2, (
+        'Одновременно в пуле должно выполняться не больше '
+        'max_concurrency операций.'
+    )
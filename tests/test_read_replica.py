@@ -0,0 +1,62 @@
+import pytest
+import pytest_asyncio
+from sqlalchemy.ext.asyncio import AsyncSession, create_async_engine
+from sqlalchemy.orm import sessionmaker
+
+from app.core import db
+from app.core.db import Base
+from app.services.recent_writes import RECENT_WRITE_KEY, recent_writes
+
+DONATIONS_URL = '/donation/'
+MY_DONATIONS_URL = '/donation/my'
+USER_ID = 2
+
+
+@pytest_asyncio.fixture
+async def read_replica(tmp_path, monkeypatch):
+    """
+    Пустая реплика: все, что видно через нее, прочитано не из
+    основной базы.
+    """
+    replica_engine = create_async_engine(
+        f'sqlite+aiosqlite:///{tmp_path / "replica.db"}'
+    )
+    async with replica_engine.begin() as connection:
+        await connection.run_sync(Base.metadata.create_all)
+    monkeypatch.setattr(
+        db, 'AsyncReadSessionLocal',
+        sessionmaker(replica_engine, class_=AsyncSession)
+    )
+    await recent_writes.backend.delete(RECENT_WRITE_KEY.format(USER_ID))
+    yield
+    await recent_writes.backend.delete(RECENT_WRITE_KEY.format(USER_ID))
+    await replica_engine.dispose()
+
+
+@pytest.mark.usefixtures('read_replica', 'charity_project')
+def test_lists_are_read_from_replica(superuser_client):
+    assert superuser_client.get('/charity_project/').json() == [], (
+        'Список проектов должен читаться с реплики, если она задана.'
+    )
+    superuser_client.post(DONATIONS_URL, json={'full_amount': 10})
+    assert superuser_client.get(DONATIONS_URL).json() == [], (
+        'Список пожертвований должен читаться с реплики, если она задана.'
+    )
+
+
+@pytest.mark.usefixtures('read_replica')
+async def test_my_donations_read_your_writes(user_client):
+    response = user_client.post(DONATIONS_URL, json={'full_amount': 10})
+    assert response.status_code == 200, (
+        f'POST-запрос к `{DONATIONS_URL}` должен вернуть статус-код 200.'
+    )
+    assert [
+        donation['id'] for donation in user_client.get(MY_DONATIONS_URL).json()
+    ] == [response.json()['id']], (
+        'Сразу после создания пожертвования `/donation/my` должен '
+        'читаться из основной базы и содержать новое пожертвование.'
+    )
+    await recent_writes.backend.delete(RECENT_WRITE_KEY.format(USER_ID))
+    assert user_client.get(MY_DONATIONS_URL).json() == [], (
+        'Без недавних изменений `/donation/my` должен читаться с реплики.'
+    )
@@ -0,0 +1,54 @@
+import json
+from datetime import datetime
+
+import pytest
+from conftest import app
+from fastapi.encoders import jsonable_encoder
+
+from app.models.charity_project import CharityProject
+from app.models.donation import Donation
+from app.schemas.charity_project import CharityProjectDB
+from app.schemas.donation import DonationDB
+from app.services.serialization import dump_rows, schema_fields
+
+CREATE_DATE = datetime(2010, 10, 10, 10, 10, 10, 123456)
+OBJECTS = [
+    pytest.param(CharityProject(
+        id=1, name='project', description='description', full_amount=100,
+        invested_amount=0, fully_invested=False,
+        create_date=CREATE_DATE, close_date=CREATE_DATE,
+    ), CharityProjectDB, id='charity_project'),
+    pytest.param(Donation(
+        id=1, user_id=1, comment=None, full_amount=100,
+        invested_amount=100, fully_invested=True,
+        create_date=CREATE_DATE, close_date=datetime(2011, 11, 11),
+    ), DonationDB, id='donation'),
+]
+
+
+@pytest.mark.parametrize('obj, schema', OBJECTS)
+def test_dump_rows_matches_schema(obj, schema):
+    fields = schema_fields(schema)
+    row = tuple(getattr(obj, field) for field in fields)
+    assert json.loads(dump_rows(fields, [row])) == jsonable_encoder(
+        [schema.from_orm(obj)]
+    ), (
+        'Быстрая сериализация списка должна давать тот же JSON, '
+        'что и сериализация через схему ответа.'
+    )
+
+
+@pytest.mark.parametrize('path, schema', [
+    ('/charity_project/', CharityProjectDB),
+    ('/donation/', DonationDB),
+])
+def test_list_openapi_schema_unchanged(path, schema):
+    response = app.openapi()['paths'][path]['get']['responses']['200']
+    assert response['content']['application/json']['schema'] == {
+        'title': response['content']['application/json']['schema']['title'],
+        'type': 'array',
+        'items': {'$ref': f'#/components/schemas/{schema.__name__}'},
+    }, (
+        f'OpenAPI-схема ответа `GET {path}` должна по-прежнему '
+        f'описывать список `{schema.__name__}`.'
+    )
@@ -0,0 +1,113 @@
+import pytest
+import pytest_asyncio
+from conftest import TestingSessionLocal
+from fastapi_users_db_sqlalchemy import SQLAlchemyUserDatabase
+
+from app.core.config import settings
+from app.core.instrumentation import observe_queries
+from app.core.user import UserManager, get_cached_jwt_strategy
+from app.models.user import User
+from app.schemas.user import UserUpdate
+from app.services.user_cache import user_principal_cache
+
+
+@pytest_asyncio.fixture
+async def session_user():
+    async with TestingSessionLocal() as session:
+        user = User(
+            email='cached@example.com',
+            hashed_password='not-a-hash',
+            is_active=True,
+            is_superuser=False,
+            is_verified=False,
+        )
+        session.add(user)
+        await session.commit()
+        await session.refresh(user)
+    await user_principal_cache.invalidate(user.id)
+    yield user
+    await user_principal_cache.invalidate(user.id)
+
+
+async def read_user(token):
+    async with TestingSessionLocal() as session:
+        user_manager = UserManager(SQLAlchemyUserDatabase(session, User))
+        with observe_queries() as stats:
+            user = await get_cached_jwt_strategy().read_token(
+                token, user_manager
+            )
+    return user, stats.count
+
+
+async def test_user_read_from_cache(session_user):
+    token = await get_cached_jwt_strategy().write_token(session_user)
+    user, queries_count = await read_user(token)
+    assert (user.id, queries_count) == (session_user.id, 1), (
+        'При первом запросе пользователь должен читаться из базы данных.'
+    )
+    user, queries_count = await read_user(token)
+    assert (user.id, user.email, user.is_superuser, queries_count) == (
+        session_user.id, session_user.email, False, 0
+    ), 'Повторный запрос с токеном должен брать пользователя из кэша.'
+
+
+async def test_user_cache_invalidated_on_update(session_user):
+    token = await get_cached_jwt_strategy().write_token(session_user)
+    await read_user(token)
+    async with TestingSessionLocal() as session:
+        user_manager = UserManager(SQLAlchemyUserDatabase(session, User))
+        user = await user_manager.get(session_user.id)
+        await user_manager.update(
+            UserUpdate(is_superuser=True), user, safe=False
+        )
+    user, queries_count = await read_user(token)
+    assert (user.is_superuser, queries_count) == (True, 1), (
+        'Изменение пользователя должно удалять его из кэша.'
+    )
+
+
+async def test_user_from_trusted_claims(session_user, monkeypatch):
+    token = await get_cached_jwt_strategy().write_token(session_user)
+    monkeypatch.setattr(settings, 'jwt_trust_claims', True)
+    user, queries_count = await read_user(token)
+    assert (user.id, user.is_active, queries_count) == (
+        session_user.id, True, 0
+    ), (
+        'С JWT_TRUST_CLAIMS пользователь должен восстанавливаться '
+        'из полей токена без обращения к базе данных.'
+    )
+
+
+async def test_user_cache_invalidated_on_password_reset(
+    session_user, monkeypatch
+):
+    token = await get_cached_jwt_strategy().write_token(session_user)
+    await read_user(token)
+    reset_tokens = []
+
+    async def on_after_forgot_password(self, user, token, request=None):
+        reset_tokens.append(token)
+
+    monkeypatch.setattr(
+        UserManager, 'on_after_forgot_password', on_after_forgot_password
+    )
+    async with TestingSessionLocal() as session:
+        user_manager = UserManager(SQLAlchemyUserDatabase(session, User))
+        user_manager.reset_password_token_secret = settings.secret
+        await user_manager.forgot_password(
+            await user_manager.get(session_user.id)
+        )
+        await user_manager.reset_password(reset_tokens[0], 'new-password')
+    _, queries_count = await read_user(token)
+    assert queries_count == 1, (
+        'Сброс пароля должен удалять пользователя из кэша.'
+    )
+
+
+@pytest.mark.parametrize('token', [None, 'not-a-token'])
+async def test_invalid_token(token):
+    user, queries_count = await read_user(token)
+    assert (user, queries_count) == (None, 0), (
+        'Отсутствующий или поврежденный токен не должен '
+        'аутентифицировать пользователя.'
+    )
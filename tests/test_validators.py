@@ -0,0 +1,61 @@
+from contextlib import contextmanager
+
+import pytest
+from conftest import TestingSessionLocal, engine
+from sqlalchemy import event
+
+from app.api.validators import (
+    check_charity_project_exist, check_charity_project_name_duplicate,
+    check_donation_available_for_user
+)
+from app.models.user import User
+
+TEXT_COLUMNS = ('description', 'comment')
+
+
+@contextmanager
+def capture_statements():
+    statements = []
+
+    def before_cursor_execute(conn, cursor, statement, *args):
+        statements.append(statement)
+
+    event.listen(
+        engine.sync_engine, 'before_cursor_execute', before_cursor_execute
+    )
+    try:
+        yield statements
+    finally:
+        event.remove(
+            engine.sync_engine, 'before_cursor_execute', before_cursor_execute
+        )
+
+
+@pytest.mark.parametrize('check', [
+    lambda project, session: check_charity_project_exist(project.id, session),
+    lambda project, session: check_charity_project_name_duplicate(
+        project.name, session, project.id
+    ),
+])
+async def test_project_validators_skip_text_columns(charity_project, check):
+    async with TestingSessionLocal() as session:
+        with capture_statements() as statements:
+            await check(charity_project, session)
+    assert statements and not any(
+        column in statement
+        for statement in statements
+        for column in TEXT_COLUMNS
+    ), 'Валидаторы не должны читать из базы данных текстовые колонки.'
+
+
+async def test_donation_validator_skips_text_columns(donation):
+    async with TestingSessionLocal() as session:
+        with capture_statements() as statements:
+            await check_donation_available_for_user(
+                donation.id, User(id=donation.user_id), session
+            )
+    assert statements and not any(
+        column in statement
+        for statement in statements
+        for column in TEXT_COLUMNS
+    ), 'Валидаторы не должны читать из базы данных текстовые колонки.'